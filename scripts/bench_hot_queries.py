@@ -0,0 +1,116 @@
+#!/usr/bin/env -S poetry run python
+
+#####################################################################################################
+
+import asyncio
+import re
+import sys
+from collections.abc import Awaitable, Callable
+from logging import INFO, StreamHandler, getLogger
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Final
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from l7x.configs.settings import create_app_settings  # noqa: E402
+from l7x.db import ConversationModel, SessionModel  # noqa: E402
+from l7x.db.base_meta import ormar_change_database  # noqa: E402
+from l7x.db.db_utils import get_db_url_from_app_settings  # noqa: E402
+from l7x.db.prepared_statements import (  # noqa: E402
+    CONVERSATION_HAS_TEXTS,
+    HOT_STATEMENTS,
+    SESSION_STATE,
+    WAITING_CONVERSATION,
+    PreparedStatement,
+)
+from l7x.utils.db_pool_utils import create_database, create_db_pool_config  # noqa: E402
+
+#####################################################################################################
+
+_LOGGER: Final = getLogger(__name__)
+
+_STREAM_HANDLER: Final = StreamHandler()
+_LOGGER.addHandler(_STREAM_HANDLER)
+_LOGGER.setLevel(INFO)
+
+_ITERATIONS: Final = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+# $n parameter with an optional ::type cast of the prepared statement SQL
+_PARAM_PATTERN: Final = re.compile(r'\$(\d+)(?:::([\w\[\]]+))?')
+
+#####################################################################################################
+
+async def _measure(name: str, func: Callable[[], Awaitable[Any]]) -> float:
+    for _ in range(min(_ITERATIONS // 10, 100)):
+        await func()
+    start_ts: Final = perf_counter()
+    for _ in range(_ITERATIONS):
+        await func()
+    mean_us: Final = (perf_counter() - start_ts) / _ITERATIONS * 1_000_000
+    _LOGGER.info(f'{name:<40} {mean_us:10.1f} us/call')
+    return mean_us
+
+#####################################################################################################
+
+def _sqlalchemy_query(statement: PreparedStatement, *args: Any) -> TextClause:
+    """The same SQL as the statement with named parameters, compiled by SQLAlchemy on every call."""
+    def _param(match: re.Match[str]) -> str:
+        param_type = match.group(2)
+        return f'CAST(:p{match.group(1)} AS {param_type})' if param_type else f':p{match.group(1)}'
+
+    return text(_PARAM_PATTERN.sub(_param, statement.sql)).bindparams(
+        **{f'p{index}': arg for index, arg in enumerate(args, start=1)},
+    )
+
+#####################################################################################################
+
+async def _compare(name: str, sqlalchemy_func: Callable[[], Awaitable[Any]], prepared_func: Callable[[], Awaitable[Any]]) -> None:
+    sqlalchemy_us: Final = await _measure(f'{name} (sqlalchemy)', sqlalchemy_func)
+    prepared_us: Final = await _measure(f'{name} (prepared)', prepared_func)
+    _LOGGER.info(f'{name:<40} x{sqlalchemy_us / prepared_us:.2f}\n')
+
+#####################################################################################################
+
+async def _main() -> None:
+    app_settings: Final = create_app_settings(include_db_admin_credentials=True)
+    database: Final = create_database(
+        get_db_url_from_app_settings(app_settings, use_db_admin_credentials=True),
+        create_db_pool_config(app_settings),
+    )
+    ormar_change_database(database)
+
+    async with database:
+        session: Final = await SessionModel.objects.select_related('user_id').order_by('-login_ts').first()
+        conversation: Final = await ConversationModel.objects.order_by('-start_ts').first()
+        _LOGGER.info(f'{_ITERATIONS} calls per query, session {session.primary_uuid}, conversation {conversation.primary_uuid}\n')
+
+        # the identical SQL of every statement runs through databases/SQLAlchemy and through HOT_STATEMENTS
+        session_args: Final = (session.primary_uuid,)
+        waiting_args: Final = (session.primary_uuid, session.user_id.primary_uuid)
+        conversation_args: Final = (conversation.primary_uuid,)
+        await _compare(
+            SESSION_STATE.name,
+            lambda: database.fetch_one(_sqlalchemy_query(SESSION_STATE, *session_args)),
+            lambda: HOT_STATEMENTS.fetchrow(SESSION_STATE, *session_args),
+        )
+        await _compare(
+            WAITING_CONVERSATION.name,
+            lambda: database.fetch_val(_sqlalchemy_query(WAITING_CONVERSATION, *waiting_args)),
+            lambda: HOT_STATEMENTS.fetchval(WAITING_CONVERSATION, *waiting_args),
+        )
+        await _compare(
+            CONVERSATION_HAS_TEXTS.name,
+            lambda: database.fetch_val(_sqlalchemy_query(CONVERSATION_HAS_TEXTS, *conversation_args)),
+            lambda: HOT_STATEMENTS.fetchval(CONVERSATION_HAS_TEXTS, *conversation_args),
+        )
+
+#####################################################################################################
+
+if __name__ == '__main__':
+    asyncio.run(_main())
+
+#####################################################################################################
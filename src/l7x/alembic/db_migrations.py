@@ -10,10 +10,11 @@ from alembic.context import (
     is_offline_mode as _alembic_is_offline_mode,
     run_migrations as _alembic_run_migrations,
 )
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import engine_from_config, pool, text
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import AsyncEngine
 
+from l7x.configs.constants import MIGRATIONS_ADVISORY_LOCK_KEY
 from l7x.db.base_meta import DB_METADATA
 from l7x.types.errors import AppException
 
@@ -37,6 +38,8 @@ def _do_run_migrations(connection: Connection) -> None:
     _alembic_configure(connection=connection, target_metadata=DB_METADATA)
 
     with _alembic_begin_transaction():
+        # concurrent starts wait here, then read the version upgraded by the first one and have nothing to run
+        connection.execute(text('SELECT pg_advisory_xact_lock(:lock_key)'), {'lock_key': MIGRATIONS_ADVISORY_LOCK_KEY})
         _alembic_run_migrations()
 
 #####################################################################################################
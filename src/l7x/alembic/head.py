@@ -0,0 +1,11 @@
+#####################################################################################################
+
+from typing import Final
+
+#####################################################################################################
+
+# The head of l7x.alembic.migrations.MIGRATIONS, known without importing Alembic and the migrations.
+# Set to the revision of every new migration, tests/test_db/test_alembic_head.py checks it.
+DB_HEAD_REVISION: Final = 'd5e3a8b1f264'
+
+#####################################################################################################
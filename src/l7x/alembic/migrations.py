@@ -9,6 +9,15 @@ import l7x.alembic.versions.db_2024_09_09_0734_c38f2590159a_root_user_if_not_exi
 import l7x.alembic.versions.db_2024_09_12_1114_e0fbac170f88_cascade_delete_text_model as _db_e0fbac170f88
 import l7x.alembic.versions.db_2024_09_25_1151_92e150428401_bind_conv_to_two_users as _db_92e150428401
 import l7x.alembic.versions.db_2024_09_27_1208_f28f266ea7b4_text_model_change_type_field as _db_f28f266ea7b4
+import l7x.alembic.versions.db_2026_10_19_0930_b7d41c2e9a53_multi_party_conversations as _db_b7d41c2e9a53
+import l7x.alembic.versions.db_2026_10_19_1015_c3e8a5f1d270_notify_sessions_changes as _db_c3e8a5f1d270
+import l7x.alembic.versions.db_2026_10_19_1100_d9a2c4e6f813_partition_texts_and_audio as _db_d9a2c4e6f813
+import l7x.alembic.versions.db_2026_10_19_1130_e5b7d1f3a924_hot_path_indexes as _db_e5b7d1f3a924
+import l7x.alembic.versions.db_2026_10_19_1200_f1c8e2a4b635_daily_rollups as _db_f1c8e2a4b635
+import l7x.alembic.versions.db_2026_10_19_1230_a3f6c9d2e741_recount_edited_text_rollups as _db_a3f6c9d2e741
+import l7x.alembic.versions.db_2026_10_19_1300_b8e4a1c7f352_startup_runs as _db_b8e4a1c7f352
+import l7x.alembic.versions.db_2026_10_19_1330_c4d2f7a9e153_participants_leave_ts as _db_c4d2f7a9e153
+import l7x.alembic.versions.db_2026_10_19_1400_d5e3a8b1f264_cascade_delete_participants as _db_d5e3a8b1f264
 #####################################################################################################
 
 # TODO: написать тест что миграции в массиве не повторяются
@@ -21,6 +30,15 @@ MIGRATIONS: Final = frozenset((
     _db_e0fbac170f88,
     _db_92e150428401,
     _db_f28f266ea7b4,
+    _db_b7d41c2e9a53,
+    _db_c3e8a5f1d270,
+    _db_d9a2c4e6f813,
+    _db_e5b7d1f3a924,
+    _db_f1c8e2a4b635,
+    _db_a3f6c9d2e741,
+    _db_b8e4a1c7f352,
+    _db_c4d2f7a9e153,
+    _db_d5e3a8b1f264,
 ))
 
 #####################################################################################################
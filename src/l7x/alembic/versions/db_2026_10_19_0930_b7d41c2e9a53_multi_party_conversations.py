@@ -0,0 +1,88 @@
+#####################################################################################################
+"""multi-party conversations
+
+Revision ID: b7d41c2e9a53
+Revises: f28f266ea7b4
+Create Date: 2026-10-19 09:30:12.518304+00:00
+
+"""
+#####################################################################################################
+
+from collections.abc import Sequence
+from typing import Final
+
+from alembic.op import add_column, create_index, create_table, drop_column, drop_index, drop_table, execute, f as _alembic_f
+from sqlalchemy import Column, ForeignKeyConstraint, Integer, PrimaryKeyConstraint, String, Text, text
+
+from l7x.db.db_types import POSTGRESQL_DATETIME, POSTGRESQL_UUID
+
+#####################################################################################################
+
+# revision identifiers, used by Alembic.
+# pylint: disable=invalid-name
+revision: Final[str] = 'b7d41c2e9a53'
+down_revision: Final[str | None] = 'f28f266ea7b4'
+branch_labels: Final[Sequence[str] | None] = None
+depends_on: Final[str | None] = None
+# pylint: enable=invalid-name
+
+#####################################################################################################
+
+def upgrade() -> None:
+    add_column('conversations', Column('max_participants', Integer(), server_default=text('2'), nullable=False))
+    create_table(
+        'conversation_participants',
+        Column('primary_uuid', POSTGRESQL_UUID, server_default=text('gen_random_uuid()'), nullable=False),
+        Column('join_ts', POSTGRESQL_DATETIME(timezone=True), nullable=True),
+        Column('lang', String(length=30), nullable=True),
+        Column('conversation_id', POSTGRESQL_UUID, nullable=False),
+        Column('session_id', POSTGRESQL_UUID, nullable=False),
+        ForeignKeyConstraint(
+            ['conversation_id'], ['conversations.primary_uuid'],
+            name='fk_conversation_participants_conversations_primary_uuid_conversation_id',
+            ondelete='CASCADE',
+        ),
+        ForeignKeyConstraint(
+            ['session_id'], ['sessions.primary_uuid'],
+            name='fk_conversation_participants_sessions_primary_uuid_session_id',
+        ),
+        PrimaryKeyConstraint('primary_uuid', name=_alembic_f('pk__conversation_participants')),
+    )
+    create_index(
+        _alembic_f('ix__conversation_participants__conversation_id'),
+        'conversation_participants',
+        ['conversation_id'],
+    )
+    create_table(
+        'text_translations',
+        Column('primary_uuid', POSTGRESQL_UUID, server_default=text('gen_random_uuid()'), nullable=False),
+        Column('lang_to', String(length=30), nullable=False),
+        Column('translated_text', Text(), nullable=False),
+        Column('text_id', POSTGRESQL_UUID, nullable=False),
+        ForeignKeyConstraint(
+            ['text_id'], ['texts.primary_uuid'],
+            name='fk_text_translations_texts_primary_uuid_text_id',
+            ondelete='CASCADE',
+        ),
+        PrimaryKeyConstraint('primary_uuid', name=_alembic_f('pk__text_translations')),
+    )
+    create_index(_alembic_f('ix__text_translations__text_id'), 'text_translations', ['text_id'])
+
+    # the two sessions of the existing conversations become their participants
+    execute("""
+    INSERT INTO conversation_participants (join_ts, conversation_id, session_id)
+    SELECT start_ts, primary_uuid, first_user_session FROM conversations
+    UNION ALL
+    SELECT start_ts, primary_uuid, second_user_session FROM conversations WHERE second_user_session IS NOT NULL
+    """)
+
+#####################################################################################################
+
+def downgrade() -> None:
+    drop_index(_alembic_f('ix__text_translations__text_id'), table_name='text_translations')
+    drop_table('text_translations')
+    drop_index(_alembic_f('ix__conversation_participants__conversation_id'), table_name='conversation_participants')
+    drop_table('conversation_participants')
+    drop_column('conversations', 'max_participants')
+
+#####################################################################################################
@@ -0,0 +1,65 @@
+#####################################################################################################
+"""notify sessions changes
+
+Revision ID: c3e8a5f1d270
+Revises: b7d41c2e9a53
+Create Date: 2026-10-19 10:15:44.203917+00:00
+
+"""
+#####################################################################################################
+
+from collections.abc import Sequence
+from typing import Final
+
+from alembic.op import execute
+
+#####################################################################################################
+
+# revision identifiers, used by Alembic.
+# pylint: disable=invalid-name
+revision: Final[str] = 'c3e8a5f1d270'
+down_revision: Final[str | None] = 'b7d41c2e9a53'
+branch_labels: Final[Sequence[str] | None] = None
+depends_on: Final[str | None] = None
+# pylint: enable=invalid-name
+
+#####################################################################################################
+
+# the channel and the payload prefixes are listened by l7x.utils.session_cache_utils.SessionInvalidationListener
+def upgrade() -> None:
+    execute("""
+    CREATE FUNCTION notify_session_changed() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('l7x_sessions', 'session:' || OLD.primary_uuid::text);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    execute("""
+    CREATE TRIGGER sessions_notify_changed
+    AFTER UPDATE OF logout_ts, user_id OR DELETE ON sessions
+    FOR EACH ROW EXECUTE FUNCTION notify_session_changed()
+    """)
+    execute("""
+    CREATE FUNCTION notify_user_changed() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('l7x_sessions', 'user:' || OLD.primary_uuid::text);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    execute("""
+    CREATE TRIGGER users_notify_changed
+    AFTER UPDATE OF is_active, is_superuser OR DELETE ON users
+    FOR EACH ROW EXECUTE FUNCTION notify_user_changed()
+    """)
+
+#####################################################################################################
+
+def downgrade() -> None:
+    execute('DROP TRIGGER users_notify_changed ON users')
+    execute('DROP FUNCTION notify_user_changed()')
+    execute('DROP TRIGGER sessions_notify_changed ON sessions')
+    execute('DROP FUNCTION notify_session_changed()')
+
+#####################################################################################################
@@ -0,0 +1,213 @@
+#####################################################################################################
+"""partition texts and audio
+
+Revision ID: d9a2c4e6f813
+Revises: c3e8a5f1d270
+Create Date: 2026-10-19 11:00:27.904113+00:00
+
+"""
+#####################################################################################################
+
+from collections.abc import Sequence
+from typing import Final
+
+from alembic.op import create_foreign_key, execute
+
+#####################################################################################################
+
+# revision identifiers, used by Alembic.
+# pylint: disable=invalid-name
+revision: Final[str] = 'd9a2c4e6f813'
+down_revision: Final[str | None] = 'c3e8a5f1d270'
+branch_labels: Final[Sequence[str] | None] = None
+depends_on: Final[str | None] = None
+# pylint: enable=invalid-name
+
+#####################################################################################################
+
+_PARTITIONS_MONTHS_AHEAD: Final = 3
+
+_TEXTS_COLUMNS: Final = (
+    'primary_uuid, create_ts, edit_ts, audio_id, lang_from, lang_to, '
+    'recognized_text, translated_text, fixed_text, owner_session_uuid, conversation_id'
+)
+_AUDIO_COLUMNS: Final = 'primary_uuid, create_ts, audio_raw'
+
+#####################################################################################################
+
+# monthly (UTC) range partitions named <table>_yYYYYmMM, called by l7x.utils.partition_utils for the future months
+_CREATE_PARTITIONS_FUNCTION: Final = """
+CREATE FUNCTION l7x_create_monthly_partitions(parent_table text, from_ts timestamptz, months_ahead integer)
+RETURNS integer AS $$
+DECLARE
+    month_start timestamp := date_trunc('month', from_ts AT TIME ZONE 'UTC');
+    last_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => months_ahead);
+    partition_name text;
+    created_count integer := 0;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        partition_name := parent_table || to_char(month_start, '"_y"YYYY"m"MM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                parent_table,
+                month_start AT TIME ZONE 'UTC',
+                (month_start + interval '1 month') AT TIME ZONE 'UTC'
+            );
+            created_count := created_count + 1;
+        END IF;
+        month_start := month_start + interval '1 month';
+    END LOOP;
+    RETURN created_count;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+#####################################################################################################
+
+def _create_partitions(table_name: str) -> None:
+    execute(f"""
+    SELECT l7x_create_monthly_partitions(
+        '{table_name}',
+        coalesce((SELECT min(create_ts) FROM {table_name}_unpartitioned), now()),
+        {_PARTITIONS_MONTHS_AHEAD}
+    )
+    """)
+
+#####################################################################################################
+
+def upgrade() -> None:
+    # the partition key is a part of the primary key, so it may not be null
+    execute("""
+    UPDATE texts AS t
+    SET create_ts = coalesce(c.start_ts, now())
+    FROM conversations AS c
+    WHERE t.create_ts IS NULL AND c.primary_uuid = t.conversation_id
+    """)
+    execute("""
+    UPDATE audio AS a
+    SET create_ts = coalesce((SELECT min(t.create_ts) FROM texts AS t WHERE t.audio_id = a.primary_uuid), now())
+    WHERE a.create_ts IS NULL
+    """)
+
+    # a foreign key may reference a partitioned table only by a key with the partition column,
+    # the links to texts and audio are kept by the application, translations are deleted by a trigger
+    execute('ALTER TABLE text_translations DROP CONSTRAINT fk_text_translations_texts_primary_uuid_text_id')
+    execute('ALTER TABLE texts DROP CONSTRAINT fk_texts_audio_primary_uuid_audio_id')
+
+    execute('ALTER TABLE texts RENAME TO texts_unpartitioned')
+    execute('ALTER TABLE texts_unpartitioned RENAME CONSTRAINT pk__texts TO pk__texts_unpartitioned')
+    execute('ALTER TABLE audio RENAME TO audio_unpartitioned')
+    execute('ALTER TABLE audio_unpartitioned RENAME CONSTRAINT pk__audio TO pk__audio_unpartitioned')
+
+    execute("""
+    CREATE TABLE audio (
+        primary_uuid uuid NOT NULL DEFAULT gen_random_uuid(),
+        create_ts timestamp with time zone NOT NULL DEFAULT now(),
+        audio_raw bytea NOT NULL,
+        CONSTRAINT pk__audio PRIMARY KEY (primary_uuid, create_ts)
+    ) PARTITION BY RANGE (create_ts)
+    """)
+    execute("""
+    CREATE TABLE texts (
+        primary_uuid uuid NOT NULL DEFAULT gen_random_uuid(),
+        create_ts timestamp with time zone NOT NULL DEFAULT now(),
+        edit_ts timestamp with time zone,
+        audio_id uuid,
+        lang_from varchar(30) NOT NULL,
+        lang_to varchar(30) NOT NULL,
+        recognized_text text NOT NULL,
+        translated_text text NOT NULL,
+        fixed_text text,
+        owner_session_uuid uuid,
+        conversation_id uuid NOT NULL,
+        CONSTRAINT pk__texts PRIMARY KEY (primary_uuid, create_ts),
+        CONSTRAINT fk_texts_conversations_primary_uuid_conversation_id
+            FOREIGN KEY (conversation_id) REFERENCES conversations (primary_uuid) ON DELETE CASCADE,
+        CONSTRAINT fk_texts_sessions_primary_uuid_owner_session_uuid
+            FOREIGN KEY (owner_session_uuid) REFERENCES sessions (primary_uuid) ON DELETE SET NULL
+    ) PARTITION BY RANGE (create_ts)
+    """)
+
+    execute(_CREATE_PARTITIONS_FUNCTION)
+    _create_partitions('audio')
+    _create_partitions('texts')
+
+    execute(f'INSERT INTO audio ({_AUDIO_COLUMNS}) SELECT {_AUDIO_COLUMNS} FROM audio_unpartitioned')
+    execute(f'INSERT INTO texts ({_TEXTS_COLUMNS}) SELECT {_TEXTS_COLUMNS} FROM texts_unpartitioned')
+    execute('DROP TABLE texts_unpartitioned')
+    execute('DROP TABLE audio_unpartitioned')
+
+    # rows are inserted in create_ts order, a block range index stays tiny and is enough for date ranges
+    execute('CREATE INDEX ix__texts__create_ts ON texts USING brin (create_ts)')
+    execute('CREATE INDEX ix__audio__create_ts ON audio USING brin (create_ts)')
+
+    execute("""
+    CREATE FUNCTION delete_text_translations() RETURNS trigger AS $$
+    BEGIN
+        DELETE FROM text_translations WHERE text_id = OLD.primary_uuid;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    execute("""
+    CREATE TRIGGER texts_delete_translations
+    AFTER DELETE ON texts
+    FOR EACH ROW EXECUTE FUNCTION delete_text_translations()
+    """)
+
+#####################################################################################################
+
+def downgrade() -> None:
+    execute('DROP TRIGGER texts_delete_translations ON texts')
+    execute('DROP FUNCTION delete_text_translations()')
+
+    execute('ALTER TABLE texts RENAME TO texts_partitioned')
+    execute('ALTER TABLE audio RENAME TO audio_partitioned')
+    execute('ALTER TABLE texts_partitioned RENAME CONSTRAINT pk__texts TO pk__texts_partitioned')
+    execute('ALTER TABLE audio_partitioned RENAME CONSTRAINT pk__audio TO pk__audio_partitioned')
+
+    execute("""
+    CREATE TABLE audio (
+        primary_uuid uuid NOT NULL DEFAULT gen_random_uuid(),
+        create_ts timestamp with time zone,
+        audio_raw bytea NOT NULL,
+        CONSTRAINT pk__audio PRIMARY KEY (primary_uuid)
+    )
+    """)
+    execute("""
+    CREATE TABLE texts (
+        primary_uuid uuid NOT NULL DEFAULT gen_random_uuid(),
+        create_ts timestamp with time zone,
+        edit_ts timestamp with time zone,
+        lang_from varchar(30) NOT NULL,
+        lang_to varchar(30) NOT NULL,
+        recognized_text text NOT NULL,
+        translated_text text NOT NULL,
+        fixed_text text,
+        conversation_id uuid NOT NULL,
+        audio_id uuid,
+        owner_session_uuid uuid,
+        CONSTRAINT pk__texts PRIMARY KEY (primary_uuid),
+        CONSTRAINT fk_texts_conversations_primary_uuid_conversation_id
+            FOREIGN KEY (conversation_id) REFERENCES conversations (primary_uuid) ON DELETE CASCADE,
+        CONSTRAINT fk_texts_sessions_primary_uuid_owner_session_uuid
+            FOREIGN KEY (owner_session_uuid) REFERENCES sessions (primary_uuid) ON DELETE SET NULL
+    )
+    """)
+
+    execute(f'INSERT INTO audio ({_AUDIO_COLUMNS}) SELECT {_AUDIO_COLUMNS} FROM audio_partitioned')
+    execute(f'INSERT INTO texts ({_TEXTS_COLUMNS}) SELECT {_TEXTS_COLUMNS} FROM texts_partitioned')
+    execute('DROP TABLE texts_partitioned')
+    execute('DROP TABLE audio_partitioned')
+    execute('DROP FUNCTION l7x_create_monthly_partitions(text, timestamptz, integer)')
+
+    create_foreign_key('fk_texts_audio_primary_uuid_audio_id', 'texts', 'audio', ['audio_id'], ['primary_uuid'])
+    create_foreign_key(
+        'fk_text_translations_texts_primary_uuid_text_id',
+        'text_translations', 'texts', ['text_id'], ['primary_uuid'],
+        ondelete='CASCADE',
+    )
+
+#####################################################################################################
@@ -0,0 +1,98 @@
+#####################################################################################################
+"""hot path indexes
+
+Revision ID: e5b7d1f3a924
+Revises: d9a2c4e6f813
+Create Date: 2026-10-19 11:30:51.377021+00:00
+
+"""
+#####################################################################################################
+
+from collections.abc import Sequence
+from typing import Final
+
+from alembic.op import create_index, drop_index, f as _alembic_f
+from sqlalchemy import text
+
+#####################################################################################################
+
+# revision identifiers, used by Alembic.
+# pylint: disable=invalid-name
+revision: Final[str] = 'e5b7d1f3a924'
+down_revision: Final[str | None] = 'd9a2c4e6f813'
+branch_labels: Final[Sequence[str] | None] = None
+depends_on: Final[str | None] = None
+# pylint: enable=invalid-name
+
+#####################################################################################################
+
+# the queries using each index are checked by tests/test_db/test_query_plans.py
+def upgrade() -> None:
+    # sessions: the user's open sessions, the expiry of the open sessions, deletion of the user's sessions
+    create_index(_alembic_f('ix__sessions__user_id'), 'sessions', ['user_id'])
+    create_index(
+        _alembic_f('ix__sessions__open__user_id'),
+        'sessions',
+        ['user_id'],
+        postgresql_where=text('logout_ts IS NULL'),
+        postgresql_include=['login_ts'],
+    )
+
+    # conversations: the list by start_ts with keyset pagination (the operator session is read by the join),
+    # the waiting conversations, the conversations of a session
+    create_index(
+        _alembic_f('ix__conversations__start_ts__primary_uuid'),
+        'conversations',
+        ['start_ts', 'primary_uuid'],
+        postgresql_include=['first_user_session'],
+    )
+    create_index(
+        _alembic_f('ix__conversations__open__start_ts'),
+        'conversations',
+        ['start_ts'],
+        postgresql_where=text('end_ts IS NULL'),
+    )
+    create_index(_alembic_f('ix__conversations__first_user_session'), 'conversations', ['first_user_session'])
+    create_index(
+        _alembic_f('ix__conversations__second_user_session'),
+        'conversations',
+        ['second_user_session'],
+        postgresql_where=text('second_user_session IS NOT NULL'),
+    )
+    create_index(_alembic_f('ix__conversation_participants__session_id'), 'conversation_participants', ['session_id'])
+
+    # texts (created on every partition): the messages of a conversation in order, the edited texts analytics,
+    # SET NULL of the owner session on a session deletion
+    create_index(_alembic_f('ix__texts__conversation_id__create_ts'), 'texts', ['conversation_id', 'create_ts'])
+    create_index(
+        _alembic_f('ix__texts__edited__create_ts'),
+        'texts',
+        ['create_ts'],
+        postgresql_where=text('edit_ts IS NOT NULL AND audio_id IS NOT NULL'),
+        postgresql_include=['lang_from'],
+    )
+    create_index(
+        _alembic_f('ix__texts__owner_session_uuid'),
+        'texts',
+        ['owner_session_uuid'],
+        postgresql_where=text('owner_session_uuid IS NOT NULL'),
+    )
+
+    create_index(_alembic_f('ix__users__department_id'), 'users', ['department_id'])
+
+#####################################################################################################
+
+def downgrade() -> None:
+    drop_index(_alembic_f('ix__users__department_id'), table_name='users')
+    drop_index(_alembic_f('ix__texts__owner_session_uuid'), table_name='texts')
+    drop_index(_alembic_f('ix__texts__edited__create_ts'), table_name='texts')
+    drop_index(_alembic_f('ix__texts__conversation_id__create_ts'), table_name='texts')
+    drop_index(_alembic_f('ix__conversation_participants__session_id'), table_name='conversation_participants')
+    drop_index(_alembic_f('ix__conversations__second_user_session'), table_name='conversations')
+    drop_index(_alembic_f('ix__conversations__first_user_session'), table_name='conversations')
+    drop_index(_alembic_f('ix__conversations__open__start_ts'), table_name='conversations')
+    drop_index(_alembic_f('ix__conversations__start_ts__primary_uuid'), table_name='conversations')
+    drop_index(_alembic_f('ix__sessions__open__user_id'), table_name='sessions')
+    drop_index(_alembic_f('ix__sessions__user_id'), table_name='sessions')
+
+#####################################################################################################
@@ -0,0 +1,79 @@
+#####################################################################################################
+"""daily rollups
+
+Revision ID: f1c8e2a4b635
+Revises: e5b7d1f3a924
+Create Date: 2026-10-19 12:00:09.612448+00:00
+
+"""
+#####################################################################################################
+
+from collections.abc import Sequence
+from typing import Final
+
+from alembic.op import create_table, drop_table
+from sqlalchemy import Column, Date, Float, Integer, PrimaryKeyConstraint, String, text
+
+from l7x.db.db_types import POSTGRESQL_DATETIME, POSTGRESQL_UUID
+
+#####################################################################################################
+
+# revision identifiers, used by Alembic.
+# pylint: disable=invalid-name
+revision: Final[str] = 'f1c8e2a4b635'
+down_revision: Final[str | None] = 'e5b7d1f3a924'
+branch_labels: Final[Sequence[str] | None] = None
+depends_on: Final[str | None] = None
+# pylint: enable=invalid-name
+
+#####################################################################################################
+
+def _counter(name: str) -> Column:
+    return Column(name, Integer(), server_default=text('0'), nullable=False)
+
+#####################################################################################################
+
+# filled by l7x.db.rollups.refresh_daily_rollups, a day is a UTC day of the conversation start / text creation
+def upgrade() -> None:
+    create_table(
+        'daily_conversation_rollups',
+        Column('day', Date(), nullable=False),
+        Column('department_id', POSTGRESQL_UUID, nullable=False),
+        _counter('conversations'),
+        _counter('closed_conversations'),
+        Column('duration_sec', Float(), server_default=text('0'), nullable=False),
+        _counter('nps_answers'),
+        _counter('nps_sum'),
+        _counter('translation_answers'),
+        _counter('translation_sum'),
+        _counter('usability_answers'),
+        _counter('usability_sum'),
+        PrimaryKeyConstraint('day', 'department_id', name='pk__daily_conversation_rollups'),
+    )
+    create_table(
+        'daily_text_rollups',
+        Column('day', Date(), nullable=False),
+        Column('department_id', POSTGRESQL_UUID, nullable=False),
+        Column('lang_from', String(length=30), nullable=False),
+        Column('lang_to', String(length=30), nullable=False),
+        _counter('texts'),
+        _counter('audio_texts'),
+        _counter('edited_texts'),
+        _counter('edited_audio_texts'),
+        PrimaryKeyConstraint('day', 'department_id', 'lang_from', 'lang_to', name='pk__daily_text_rollups'),
+    )
+    create_table(
+        'rollup_watermarks',
+        Column('name', String(length=50), nullable=False),
+        Column('watermark', POSTGRESQL_DATETIME(timezone=True), nullable=False),
+        PrimaryKeyConstraint('name', name='pk__rollup_watermarks'),
+    )
+
+#####################################################################################################
+
+def downgrade() -> None:
+    drop_table('rollup_watermarks')
+    drop_table('daily_text_rollups')
+    drop_table('daily_conversation_rollups')
+
+#####################################################################################################
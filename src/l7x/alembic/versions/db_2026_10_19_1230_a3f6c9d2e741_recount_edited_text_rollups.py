@@ -0,0 +1,38 @@
+#####################################################################################################
+"""recount edited text rollups
+
+Revision ID: a3f6c9d2e741
+Revises: f1c8e2a4b635
+Create Date: 2026-10-19 12:30:27.164385+00:00
+
+"""
+#####################################################################################################
+
+from collections.abc import Sequence
+from typing import Final
+
+from alembic.op import execute
+
+#####################################################################################################
+
+# revision identifiers, used by Alembic.
+# pylint: disable=invalid-name
+revision: Final[str] = 'a3f6c9d2e741'
+down_revision: Final[str | None] = 'f1c8e2a4b635'
+branch_labels: Final[Sequence[str] | None] = None
+depends_on: Final[str | None] = None
+# pylint: enable=invalid-name
+
+#####################################################################################################
+
+# the edited texts are counted only when the fix differs from the recognized text,
+# without the watermark the next refresh recomputes all days
+def upgrade() -> None:
+    execute('DELETE FROM rollup_watermarks')
+
+#####################################################################################################
+
+def downgrade() -> None:
+    execute('DELETE FROM rollup_watermarks')
+
+#####################################################################################################
@@ -0,0 +1,46 @@
+#####################################################################################################
+"""startup runs
+
+Revision ID: b8e4a1c7f352
+Revises: a3f6c9d2e741
+Create Date: 2026-10-19 13:00:41.508173+00:00
+
+"""
+#####################################################################################################
+
+from collections.abc import Sequence
+from typing import Final
+
+from alembic.op import create_table, drop_table
+from sqlalchemy import Column, PrimaryKeyConstraint, String
+
+from l7x.db.db_types import POSTGRESQL_DATETIME
+
+#####################################################################################################
+
+# revision identifiers, used by Alembic.
+# pylint: disable=invalid-name
+revision: Final[str] = 'b8e4a1c7f352'
+down_revision: Final[str | None] = 'a3f6c9d2e741'
+branch_labels: Final[Sequence[str] | None] = None
+depends_on: Final[str | None] = None
+# pylint: enable=invalid-name
+
+#####################################################################################################
+
+# the last run of every startup task, see l7x.utils.startup_utils.run_startup_task
+def upgrade() -> None:
+    create_table(
+        'startup_runs',
+        Column('name', String(length=100), nullable=False),
+        Column('run_key', String(length=200), nullable=False),
+        Column('run_ts', POSTGRESQL_DATETIME(timezone=True), nullable=False),
+        PrimaryKeyConstraint('name', name='pk__startup_runs'),
+    )
+
+#####################################################################################################
+
+def downgrade() -> None:
+    drop_table('startup_runs')
+
+#####################################################################################################
@@ -0,0 +1,40 @@
+#####################################################################################################
+"""participants leave ts
+
+Revision ID: c4d2f7a9e153
+Revises: b8e4a1c7f352
+Create Date: 2026-10-19 13:30:18.204516+00:00
+
+"""
+#####################################################################################################
+
+from collections.abc import Sequence
+from typing import Final
+
+from alembic.op import add_column, drop_column
+from sqlalchemy import Column
+
+from l7x.db.db_types import POSTGRESQL_DATETIME
+
+#####################################################################################################
+
+# revision identifiers, used by Alembic.
+# pylint: disable=invalid-name
+revision: Final[str] = 'c4d2f7a9e153'
+down_revision: Final[str | None] = 'b8e4a1c7f352'
+branch_labels: Final[Sequence[str] | None] = None
+depends_on: Final[str | None] = None
+# pylint: enable=invalid-name
+
+#####################################################################################################
+
+# the participants of the expired sessions leave the conversation, see l7x.sessions_check_worker
+def upgrade() -> None:
+    add_column('conversation_participants', Column('leave_ts', POSTGRESQL_DATETIME(timezone=True), nullable=True))
+
+#####################################################################################################
+
+def downgrade() -> None:
+    drop_column('conversation_participants', 'leave_ts')
+
+#####################################################################################################
@@ -0,0 +1,50 @@
+#####################################################################################################
+"""cascade delete participants
+
+Revision ID: d5e3a8b1f264
+Revises: c4d2f7a9e153
+Create Date: 2026-10-19 14:00:27.613094+00:00
+
+"""
+#####################################################################################################
+
+from collections.abc import Sequence
+from typing import Final
+
+from alembic import op
+
+#####################################################################################################
+
+# revision identifiers, used by Alembic.
+# pylint: disable=invalid-name
+revision: Final[str] = 'd5e3a8b1f264'
+down_revision: Final[str | None] = 'c4d2f7a9e153'
+branch_labels: Final[Sequence[str] | None] = None
+depends_on: Final[str | None] = None
+# pylint: enable=invalid-name
+
+_FK_NAME: Final = 'fk_conversation_participants_sessions_primary_uuid_session_id'
+
+#####################################################################################################
+
+def upgrade() -> None:
+    op.drop_constraint(_FK_NAME, 'conversation_participants', type_='foreignkey')
+    op.create_foreign_key(_FK_NAME, 'conversation_participants', 'sessions', ['session_id'], ['primary_uuid'], ondelete='CASCADE')
+    # the cascade deletes find the participants by ix__conversation_participants__session_id of e5b7d1f3a924
+    # the participants of the sessions closed before the participants could leave are not counted in the capacity
+    op.execute("""
+    UPDATE conversation_participants AS p
+    SET leave_ts = s.logout_ts
+    FROM sessions AS s
+    WHERE s.primary_uuid = p.session_id
+        AND s.logout_ts IS NOT NULL
+        AND p.leave_ts IS NULL
+    """)
+
+#####################################################################################################
+
+def downgrade() -> None:
+    op.drop_constraint(_FK_NAME, 'conversation_participants', type_='foreignkey')
+    op.create_foreign_key(_FK_NAME, 'conversation_participants', 'sessions', ['session_id'], ['primary_uuid'])
+
+#####################################################################################################
@@ -12,17 +12,28 @@ from l7x.commands.metrics_context_creator import MetricCmdManager
 from l7x.configs.settings import AppSettings
 from l7x.db import ConversationModel
 from l7x.db.base_meta import ormar_change_database
+from l7x.db.prepared_statements import HOT_STATEMENTS
 from l7x.db.db_utils import get_db_url_from_app_settings
 from l7x.middleware import AdminMiddleware, AuthMiddleware
+from l7x.services.autodetect_lang_service import LocalAutodetectLanguageService, PrivateAutodetectLanguageService
 from l7x.services.langs_service import PrivateLangsService
 from l7x.services.recognize_langs_service import PrivateRecognizerLangsService
 from l7x.services.recognize_service import PrivateRecognizeService
+from l7x.services.segmented_translation_service import SegmentedTranslationService
+from l7x.services.translation_memory_service import TranslationMemoryService
 from l7x.services.translation_service import PrivateTranslationService
 from l7x.utils.aiohttp_utils import create_aiohttp_client
+from l7x.utils.backend_pool_utils import create_backend_pools
+from l7x.utils.db_pool_utils import DbPoolMonitor, create_database, create_db_pool_config
+from l7x.utils.edit_distance_utils import EditDistanceCalculator
 
 from l7x.utils.fastapi_utils import AppFastAPI
 from l7x.utils.loop_utils import AfterAllStartedFunc
+from l7x.utils.read_replica_utils import ReadReplica, RoutingDatabase
+from l7x.utils.scheduler_utils import OutboundScheduler
+from l7x.utils.session_cache_utils import SessionCache, SessionInvalidationListener
 from l7x.utils.storage_utils import ConversationStorageHelper
+from l7x.utils.write_behind_utils import WriteBehindBuffer
 
 
 #####################################################################################################
@@ -53,23 +64,88 @@ class App(AppFastAPI):
 
         super().__init__(logger, app_settings, on_startup=[on_startup])
 
-        self._database: Final = Database(get_db_url_from_app_settings(app_settings, use_db_admin_credentials=True))
+        db_pool_config: Final = create_db_pool_config(
+            app_settings,
+            # the sessions notifications listener keeps its own connection
+            reserved_connections=1 if app_settings.session_cache_ttl_sec > 0 and app_settings.session_cache_max_entries > 0 else 0,
+        )
+        self._db_pool_monitor: Final = DbPoolMonitor(db_pool_config, logger)
+        self._database: Final = create_database(
+            get_db_url_from_app_settings(app_settings, use_db_admin_credentials=True),
+            db_pool_config,
+            database_class=RoutingDatabase,
+            pool_monitor=self._db_pool_monitor,
+        )
+        self._read_replica: Final = ReadReplica(
+            create_database(
+                get_db_url_from_app_settings(app_settings, use_db_admin_credentials=True, use_read_replica=True),
+                db_pool_config,
+            ),
+            logger,
+        ) if app_settings.db_replica_host else None
         ormar_change_database(self._database)
         self.upgrade_lifespan()
 
         self._aiohttp_client: Final = create_aiohttp_client()
+        backend_pools: Final = create_backend_pools(app_settings, logger)
 
         _nicegui_app.password_hasher = self._password_hasher
         _nicegui_app.logger = self.logger
         _nicegui_app.database = self._database
-        _nicegui_app.languages_service = PrivateLangsService(app_settings, self._aiohttp_client, logger)
-        _nicegui_app.translation_service = PrivateTranslationService(app_settings, self._aiohttp_client, logger)
-        _nicegui_app.recognize_service = PrivateRecognizeService(app_settings, self._aiohttp_client, logger)
-        _nicegui_app.rec_languages_service = PrivateRecognizerLangsService(app_settings, self._aiohttp_client, logger)
+        _nicegui_app.db_pool_monitor = self._db_pool_monitor
+        _nicegui_app.read_replica = self._read_replica
+        _nicegui_app.backend_pools = backend_pools
+        _nicegui_app.languages_service = PrivateLangsService(app_settings, self._aiohttp_client, logger, backend_pools.translate)
+        _nicegui_app.autodetect_language_service = LocalAutodetectLanguageService(
+            app_settings,
+            self._aiohttp_client,
+            logger,
+            _nicegui_app.languages_service,
+            PrivateAutodetectLanguageService(app_settings, self._aiohttp_client, logger, backend_pools.detect_language),
+        )
+        self._translation_memory: Final = TranslationMemoryService(
+            self._aiohttp_client,
+            logger,
+            PrivateTranslationService(app_settings, self._aiohttp_client, logger, backend_pools.translate),
+            app_settings.translation_memory_max_entries,
+        )
+        _nicegui_app.translation_service = SegmentedTranslationService(
+            self._aiohttp_client,
+            logger,
+            self._translation_memory,
+            app_settings.translate_max_parallel_segments,
+            app_settings.translate_segment_min_chars,
+        )
+        _nicegui_app.outbound_scheduler = OutboundScheduler(
+            concurrency=app_settings.outbound_concurrency,
+            background_concurrency=app_settings.background_translate_concurrency,
+            max_delay_sec=app_settings.background_translate_max_delay_sec,
+        )
+        _nicegui_app.recognize_service = PrivateRecognizeService(
+            app_settings, self._aiohttp_client, logger, backend_pools.speech_to_text,
+        )
+        _nicegui_app.rec_languages_service = PrivateRecognizerLangsService(
+            app_settings, self._aiohttp_client, logger, backend_pools.speech_to_text,
+        )
         _nicegui_app.add_static_files(url_path='/static', local_directory='./static')
         _nicegui_app.app_settings = app_settings
         _nicegui_app.metrics_cmd_manager = metrics_cmd_manager
         _nicegui_app.conversations_storage = ConversationStorageHelper(_nicegui_app)
+        _nicegui_app.session_cache = SessionCache(
+            ttl_sec=app_settings.session_cache_ttl_sec,
+            max_entries=app_settings.session_cache_max_entries,
+        )
+        self._session_invalidation_listener: Final = SessionInvalidationListener(
+            get_db_url_from_app_settings(app_settings, use_db_admin_credentials=True).replace('+asyncpg', '', 1),
+            _nicegui_app.session_cache,
+            logger,
+        )
+        _nicegui_app.write_behind = WriteBehindBuffer(
+            logger,
+            max_rows=app_settings.write_behind_max_rows,
+            flush_interval_sec=app_settings.write_behind_flush_interval_sec,
+        )
+        _nicegui_app.edit_distance_calculator = EditDistanceCalculator(app_settings.edit_distance_workers)
         # _nicegui_app.on_startup(partial(close_conv_on_startup, self._database))
 
         _nicegui_app.add_middleware(AdminMiddleware)
@@ -81,10 +157,30 @@ class App(AppFastAPI):
         @asynccontextmanager
         async def lifespan_wrapper(app):
             await self._database.connect()
-            await ConversationModel.close_all_unclosed()
-            async with original_lifespan_context(app):
-                yield
-            await self._database.disconnect()
+            await HOT_STATEMENTS.prepare_all()
+            if self._read_replica is not None:
+                await self._read_replica.connect()
+            # the conversations of the previous run are closed by the main process on every start, see run_startup_tasks
+            await self._translation_memory.load_from_db()
+            # the first clients are served from the persisted languages snapshot, not from the backend,
+            # the languages lists are refreshed in background
+            _nicegui_app.languages_service.start()
+            _nicegui_app.rec_languages_service.start()
+            self._session_invalidation_listener.start()
+            _nicegui_app.write_behind.start()
+            try:
+                async with original_lifespan_context(app):
+                    yield
+            finally:
+                # the buffered writes are flushed while the database is still connected
+                await _nicegui_app.write_behind.stop()
+                await self._session_invalidation_listener.stop()
+                await _nicegui_app.rec_languages_service.stop()
+                await _nicegui_app.languages_service.stop()
+                _nicegui_app.edit_distance_calculator.shutdown()
+                if self._read_replica is not None:
+                    await self._read_replica.disconnect()
+                await self._database.disconnect()
 
         self.router.lifespan_context = lifespan_wrapper
 
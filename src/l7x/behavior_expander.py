@@ -7,20 +7,31 @@ from typing import Final
 from aiohttp import ClientSession
 
 from l7x.configs.settings import AppSettings
-from l7x.services.autodetect_lang_service import AutodetectLanguageService, PrivateAutodetectLanguageService
+from l7x.services.autodetect_lang_service import (
+    AutodetectLanguageService,
+    LocalAutodetectLanguageService,
+    PrivateAutodetectLanguageService,
+)
 from l7x.services.base import BaseServiceDecl
 from l7x.services.langs_service import LangsService, PrivateLangsService
 from l7x.services.translation_service import PrivateTranslationService, TranslationService
+from l7x.utils.backend_pool_utils import create_backend_pools
 
 #####################################################################################################
 
 def private_service_creator(app_settings: AppSettings, aiohttp_client: ClientSession, logger: Logger) -> Iterable[BaseServiceDecl]:
-    private_langs_service: Final = PrivateLangsService(app_settings, aiohttp_client, logger)
-    private_autodetect_language_service: Final = PrivateAutodetectLanguageService(app_settings, aiohttp_client, logger)
-    private_translation_service: Final = PrivateTranslationService(app_settings, aiohttp_client, logger)
+    backend_pools: Final = create_backend_pools(app_settings, logger)
+    private_langs_service: Final = PrivateLangsService(app_settings, aiohttp_client, logger, backend_pools.translate)
+    private_autodetect_language_service: Final = PrivateAutodetectLanguageService(
+        app_settings, aiohttp_client, logger, backend_pools.detect_language,
+    )
+    local_autodetect_language_service: Final = LocalAutodetectLanguageService(
+        app_settings, aiohttp_client, logger, private_langs_service, private_autodetect_language_service,
+    )
+    private_translation_service: Final = PrivateTranslationService(app_settings, aiohttp_client, logger, backend_pools.translate)
     return (
         (LangsService, private_langs_service),
-        (AutodetectLanguageService, private_autodetect_language_service),
+        (AutodetectLanguageService, local_autodetect_language_service),
         (TranslationService, private_translation_service),
     )
 
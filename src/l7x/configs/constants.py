@@ -9,6 +9,30 @@ TRANSLATE_API_LANGS_CACHE_EXPIRE_WHEN_LIST_EMPTY_SEC: Final[float] = 5.0
 
 #####################################################################################################
 
+# replication lag tolerated by the read-only paths, staler replica is not used
+ADMIN_REPORT_MAX_STALENESS_SEC: Final[float] = 5.0
+EXPORT_MAX_STALENESS_SEC: Final[float] = 30.0
+
+#####################################################################################################
+
+# the connections of the database budget kept outside the web workers: the pool of the session-check worker
+# and the one connection of the main process startup (version check, migrations, startup tasks run one by one)
+SESSIONS_CHECK_WORKER_CONNECTIONS: Final = 1
+STARTUP_CONNECTIONS: Final = 1
+# the smallest share of a web worker: one pooled connection and the sessions notifications listener connection
+WEB_WORKER_MIN_CONNECTIONS: Final = 2
+
+#####################################################################################################
+
+# keys of the postgres advisory locks, unique for the whole database
+SESSIONS_EXPIRY_ADVISORY_LOCK_KEY: Final = 7_300_001
+PARTITIONS_ADVISORY_LOCK_KEY: Final = 7_300_002
+ROLLUPS_ADVISORY_LOCK_KEY: Final = 7_300_003
+STARTUP_TASKS_ADVISORY_LOCK_KEY: Final = 7_300_004
+MIGRATIONS_ADVISORY_LOCK_KEY: Final = 7_300_005
+
+#####################################################################################################
+
 DEFAULT_ROOT_USER_PASSWORD: Final = "root"
 DEFAULT_ROOT_USER_LOGIN: Final = "root"
 
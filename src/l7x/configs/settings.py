@@ -12,6 +12,7 @@ from urllib.parse import urlparse
 from environs import Env
 from pydantic.dataclasses import dataclass
 
+from l7x.configs.constants import SESSIONS_CHECK_WORKER_CONNECTIONS, STARTUP_CONNECTIONS, WEB_WORKER_MIN_CONNECTIONS
 from l7x.types.language import LKey
 from l7x.utils.config_utils import get_app_build_info
 from l7x.utils.orjson_utils import orjson_dumps_to_str_pretty
@@ -34,6 +35,19 @@ def _resolve_path(path: str) -> Path | None:
 
 #####################################################################################################
 
+def _parse_urls(urls: str) -> tuple[str, ...]:
+    """Comma separated list of urls, empty items are skipped."""
+    return tuple(urlparse(url.strip()).geturl() for url in urls.split(',') if url.strip())
+
+#####################################################################################################
+
+def _default_worker_count(db_connection_budget: int) -> int:
+    """Two web workers per CPU plus one, but not more than the database connection budget has connections for."""
+    workers_budget: Final = db_connection_budget - SESSIONS_CHECK_WORKER_CONNECTIONS - STARTUP_CONNECTIONS
+    return max(min((cpu_count() * 2) + 1, workers_budget // WEB_WORKER_MIN_CONNECTIONS), 1)
+
+#####################################################################################################
+
 _AppSettingsExt = TypeVar('_AppSettingsExt', bound='AppSettings')
 
 @dataclass(frozen=True, kw_only=True)
@@ -45,6 +59,8 @@ class AppSettings:  # pylint: disable=too-many-instance-attributes
     service_branch: str
     service_commit_hash: str
     service_build_timestamp: str
+    # the hosts of one deployment share it, the deployment startup tasks are run once for it
+    deployment_id: str
 
     is_dev_mode: bool
 
@@ -75,13 +91,49 @@ class AppSettings:  # pylint: disable=too-many-instance-attributes
     db_admin_user: str
     db_admin_pass: str
 
-    translate_api_url: str
+    db_replica_host: str
+    db_replica_port: int
+
+    db_connection_budget: int
+    db_pool_min_size: int
+    db_pool_acquire_timeout_sec: float
+    db_pool_max_idle_sec: float
+    db_statement_timeout_sec: float
+
+    translate_api_urls: tuple[str, ...]
+    translate_api_translate_urls: tuple[str, ...]
+    translate_api_speech_to_text_urls: tuple[str, ...]
+    translate_api_detect_language_urls: tuple[str, ...]
+    translate_api_max_fails: int
+    translate_api_eject_sec: int
     translate_api_langs_cache_expire_sec: int
+    data_dir: Path
+    langs_catalog_dir: Path
+
+    translation_memory_max_entries: int
+    translate_max_parallel_segments: int
+    translate_segment_min_chars: int
+    outbound_concurrency: int
+    background_translate_concurrency: int
+    background_translate_max_delay_sec: float
+    lang_id_min_confidence: float
+    lang_id_train_samples_per_lang: int
+    conversation_max_participants: int
 
     max_upload_file_size_in_byte: int
 
     check_sessions_interval_sec: int
+    session_max_age_sec: int
+    db_partitions_months_ahead: int
+    rollups_refresh_interval_sec: int
+    write_behind_max_rows: int
+    write_behind_flush_interval_sec: float
+    edit_distance_workers: int
+    session_cache_ttl_sec: float
+    session_cache_max_entries: int
+    is_init_db_import_enabled: bool
     init_db_json_path: Path | None
+    init_db_overwrite_user_access: bool
 
     storage_secret: str
 
@@ -119,6 +171,7 @@ class AppSettings:  # pylint: disable=too-many-instance-attributes
         obj_for_output = {
             'SERVICE_NAME': self.service_name,
             'SERVICE_VERSION': self.service_version,
+            'DEPLOYMENT_ID': self.deployment_id,
 
             'SERVER_PORT': self.port,
             'WORKER_COUNT': self.worker_count,
@@ -128,12 +181,49 @@ class AppSettings:  # pylint: disable=too-many-instance-attributes
             'DB_USER': self.db_user,
             'DB_HOST': self.db_host,
             'DB_PORT': self.db_port,
-
-            'TRANSLATE_API_URL': self.translate_api_url,
+            'DB_REPLICA_HOST': self.db_replica_host,
+            'DB_REPLICA_PORT': self.db_replica_port,
+            'DB_CONNECTION_BUDGET': self.db_connection_budget,
+            'DB_POOL_MIN_SIZE': self.db_pool_min_size,
+            'DB_POOL_ACQUIRE_TIMEOUT_SEC': self.db_pool_acquire_timeout_sec,
+            'DB_POOL_MAX_IDLE_SEC': self.db_pool_max_idle_sec,
+            'DB_STATEMENT_TIMEOUT_SEC': self.db_statement_timeout_sec,
+
+            'TRANSLATE_API_URL': self.translate_api_urls,
+            'TRANSLATE_API_TRANSLATE_URL': self.translate_api_translate_urls,
+            'TRANSLATE_API_SPEECH_TO_TEXT_URL': self.translate_api_speech_to_text_urls,
+            'TRANSLATE_API_DETECT_LANGUAGE_URL': self.translate_api_detect_language_urls,
+            'TRANSLATE_API_MAX_FAILS': self.translate_api_max_fails,
+            'TRANSLATE_API_EJECT_SEC': self.translate_api_eject_sec,
             'TRANSLATE_API_LANGS_CACHE_EXPIRE_SEC': self.translate_api_langs_cache_expire_sec,
+            'DATA_DIR': self.data_dir,
+            'LANGS_CATALOG_DIR': self.langs_catalog_dir,
+
+            'TRANSLATION_MEMORY_MAX_ENTRIES': self.translation_memory_max_entries,
+            'TRANSLATE_MAX_PARALLEL_SEGMENTS': self.translate_max_parallel_segments,
+            'TRANSLATE_SEGMENT_MIN_CHARS': self.translate_segment_min_chars,
+            'OUTBOUND_CONCURRENCY': self.outbound_concurrency,
+            'BACKGROUND_TRANSLATE_CONCURRENCY': self.background_translate_concurrency,
+            'BACKGROUND_TRANSLATE_MAX_DELAY_SEC': self.background_translate_max_delay_sec,
+            'LANG_ID_MIN_CONFIDENCE': self.lang_id_min_confidence,
+            'LANG_ID_TRAIN_SAMPLES_PER_LANG': self.lang_id_train_samples_per_lang,
+            'CONVERSATION_MAX_PARTICIPANTS': self.conversation_max_participants,
 
             'MAX_UPLOAD_FILE_SIZE_IN_BYTE': self.max_upload_file_size_in_byte,
 
+            'CHECK_SESSIONS_INTERVAL_SEC': self.check_sessions_interval_sec,
+            'SESSION_MAX_AGE_SEC': self.session_max_age_sec,
+            'DB_PARTITIONS_MONTHS_AHEAD': self.db_partitions_months_ahead,
+            'ROLLUPS_REFRESH_INTERVAL_SEC': self.rollups_refresh_interval_sec,
+            'WRITE_BEHIND_MAX_ROWS': self.write_behind_max_rows,
+            'WRITE_BEHIND_FLUSH_INTERVAL_SEC': self.write_behind_flush_interval_sec,
+            'EDIT_DISTANCE_WORKERS': self.edit_distance_workers,
+            'SESSION_CACHE_TTL_SEC': self.session_cache_ttl_sec,
+            'SESSION_CACHE_MAX_ENTRIES': self.session_cache_max_entries,
+            'INIT_DB_IMPORT_ENABLED': self.is_init_db_import_enabled,
+            'INIT_DB_JSON_PATH': self.init_db_json_path,
+            'INIT_DB_OVERWRITE_USER_ACCESS': self.init_db_overwrite_user_access,
+
             'COMPUTE_METRICS_DEVICE': self.compute_metrics_device,
             'COMPUTE_METRICS_TIMEOUT_SEC': self.compute_metrics_timeout_sec,
             'METRICS_CACHE_PATH': self.metrics_cache_path,
@@ -199,7 +289,7 @@ def _create_app_settings() -> _AppSettingsProtocol:
     dev_translate_api_url = None
 
     def _app_settings(include_db_admin_credentials: bool = False, *, logger: Logger | None = None) -> AppSettings:
-        translate_api_url = urlparse(getenv('L7X_TRANSLATE_API_URL', '')).geturl()
+        translate_api_url = getenv('L7X_TRANSLATE_API_URL', '')
 
         nonlocal dev_translate_api_url  # noqa: WPS420
         if dev_translate_api_url is None:
@@ -213,7 +303,7 @@ def _create_app_settings() -> _AppSettingsProtocol:
         if is_dev_mode and run_translation_server:
             translate_api_url = dev_translate_api_url
         else:
-            translate_api_url = urlparse(env.str('L7X_TRANSLATE_API_URL', '')).geturl()
+            translate_api_url = env.str('L7X_TRANSLATE_API_URL', '')
 
         metrics_cache_path: Final = _resolve_path(env.str('L7X_METRICS_CACHE_PATH', ''))
         if metrics_cache_path is not None:
@@ -222,6 +312,14 @@ def _create_app_settings() -> _AppSettingsProtocol:
 
         app_build_info: Final = get_app_build_info()
 
+        port: Final = env.int('L7X_SERVER_PORT', 8080)  # noqa: WPS432
+        # connections of all web workers of the host, the pool of every worker gets its share
+        db_connection_budget: Final = env.int('L7X_DB_CONNECTION_BUDGET', 80)
+        # files of the app kept between its starts, private to the user of the app
+        data_dir: Final = _resolve_path(env.str('L7X_DATA_DIR', '')) or Path(getenv('XDG_CACHE_HOME') or Path.home() / '.cache', 'l7x')
+        # shared by the workers of one server, so the languages are fetched once per host
+        langs_catalog_dir: Final = _resolve_path(env.str('L7X_LANGS_CATALOG_DIR', '')) or data_dir / f'langs_{port}'
+
         db_admin_pass = ''
         db_admin_user = ''
         if include_db_admin_credentials:
@@ -244,11 +342,13 @@ def _create_app_settings() -> _AppSettingsProtocol:
             service_branch=app_build_info.app_branch,
             service_commit_hash=app_build_info.app_commit_hash,
             service_build_timestamp=app_build_info.app_build_timestamp,
+            # empty: every start of the main process is a new deployment
+            deployment_id=env.str('L7X_DEPLOYMENT_ID', '').strip(),
 
             is_dev_mode=is_dev_mode,
 
-            port=env.int('L7X_SERVER_PORT', 8080),  # noqa: WPS432
-            worker_count=env.int('L7X_WORKER_COUNT', (cpu_count() * 2) + 1),
+            port=port,
+            worker_count=env.int('L7X_WORKER_COUNT', _default_worker_count(db_connection_budget)),
             server_url=urlparse(env.str('L7X_SERVER_EXTERNAL_URL')).geturl(),
 
             is_elastic_apm_server_enabled=env.bool('L7X_ELASTIC_APM_SERVER_ENABLED', False),  # noqa: WPS425
@@ -273,13 +373,54 @@ def _create_app_settings() -> _AppSettingsProtocol:
             db_admin_pass=db_admin_pass,
             db_admin_user=db_admin_user,
 
-            translate_api_url=translate_api_url,
+            # empty host disables the read replica
+            db_replica_host=env.str('L7X_DB_REPLICA_HOST', '').strip(),
+            db_replica_port=env.int('L7X_DB_REPLICA_PORT', 5432),  # noqa: WPS432
+
+            db_connection_budget=db_connection_budget,
+            db_pool_min_size=env.int('L7X_DB_POOL_MIN_SIZE', 1),
+            db_pool_acquire_timeout_sec=env.float('L7X_DB_POOL_ACQUIRE_TIMEOUT_SEC', 10.0),
+            db_pool_max_idle_sec=env.float('L7X_DB_POOL_MAX_IDLE_SEC', 300.0),
+            db_statement_timeout_sec=env.float('L7X_DB_STATEMENT_TIMEOUT_SEC', 30.0),
+
+            translate_api_urls=_parse_urls(translate_api_url),
+            translate_api_translate_urls=_parse_urls(env.str('L7X_TRANSLATE_API_TRANSLATE_URL', '')),
+            translate_api_speech_to_text_urls=_parse_urls(env.str('L7X_TRANSLATE_API_SPEECH_TO_TEXT_URL', '')),
+            translate_api_detect_language_urls=_parse_urls(env.str('L7X_TRANSLATE_API_DETECT_LANGUAGE_URL', '')),
+            translate_api_max_fails=env.int('L7X_TRANSLATE_API_MAX_FAILS', 3),
+            translate_api_eject_sec=env.int('L7X_TRANSLATE_API_EJECT_SEC', 30),
             translate_api_langs_cache_expire_sec=env.int('L7X_TRANSLATE_API_LANGS_CACHE_EXPIRE_SEC', 60 * 60),
+            data_dir=data_dir,
+            langs_catalog_dir=langs_catalog_dir,
+
+            translation_memory_max_entries=env.int('L7X_TRANSLATION_MEMORY_MAX_ENTRIES', 100000),  # noqa: WPS432
+            translate_max_parallel_segments=env.int('L7X_TRANSLATE_MAX_PARALLEL_SEGMENTS', 4),
+            # shorter utterances are translated as a whole, with the context of all their sentences
+            translate_segment_min_chars=env.int('L7X_TRANSLATE_SEGMENT_MIN_CHARS', 300),
+            # backend requests of one worker in flight, the waiting ones are started by priority
+            outbound_concurrency=env.int('L7X_OUTBOUND_CONCURRENCY', 8),
+            background_translate_concurrency=env.int('L7X_BACKGROUND_TRANSLATE_CONCURRENCY', 2),
+            background_translate_max_delay_sec=env.float('L7X_BACKGROUND_TRANSLATE_MAX_DELAY_SEC', 5.0),
+            lang_id_min_confidence=env.float('L7X_LANG_ID_MIN_CONFIDENCE', 0.95),
+            lang_id_train_samples_per_lang=env.int('L7X_LANG_ID_TRAIN_SAMPLES_PER_LANG', 2000),  # noqa: WPS432
+            conversation_max_participants=max(env.int('L7X_CONVERSATION_MAX_PARTICIPANTS', 2), 2),
 
             max_upload_file_size_in_byte=env.int('L7X_MAX_UPLOAD_FILE_SIZE_IN_BYTE', 50 * 1024 * 1024),  # noqa: WPS432
 
             check_sessions_interval_sec=env.int('L7X_CHECK_SESSIONS_INTERVAL_SEC', 60),
-            init_db_json_path=None,  # _resolve_path(env.str('L7X_INIT_DB_JSON_PATH', '')),
+            session_max_age_sec=env.int('L7X_SESSION_MAX_AGE_SEC', 0),
+            db_partitions_months_ahead=max(env.int('L7X_DB_PARTITIONS_MONTHS_AHEAD', 3), 1),
+            rollups_refresh_interval_sec=env.int('L7X_ROLLUPS_REFRESH_INTERVAL_SEC', 5 * 60),
+            # a flush interval of 0 writes the participant languages at once, max_rows only triggers an early flush
+            write_behind_max_rows=env.int('L7X_WRITE_BEHIND_MAX_ROWS', 500),  # noqa: WPS432
+            write_behind_flush_interval_sec=env.float('L7X_WRITE_BEHIND_FLUSH_INTERVAL_SEC', 1.0),
+            edit_distance_workers=max(env.int('L7X_EDIT_DISTANCE_WORKERS', 2), 1),
+            session_cache_ttl_sec=env.float('L7X_SESSION_CACHE_TTL_SEC', 30.0),
+            session_cache_max_entries=env.int('L7X_SESSION_CACHE_MAX_ENTRIES', 10000),  # noqa: WPS432
+            # the import of departments and users is opt-in, the existing users keep their password and is_active
+            is_init_db_import_enabled=env.bool('L7X_INIT_DB_IMPORT_ENABLED', False),  # noqa: WPS425
+            init_db_json_path=_resolve_path(env.str('L7X_INIT_DB_JSON_PATH', '')),
+            init_db_overwrite_user_access=env.bool('L7X_INIT_DB_OVERWRITE_USER_ACCESS', False),  # noqa: WPS425
 
             storage_secret=env.str('L7X_STORAGE_SECRET', ''),
 
@@ -6,5 +6,7 @@ from l7x.db.session_model import SessionModel as SessionModel  # isort:skip  # n
 from l7x.db.conversation_model import ConversationModel as ConversationModel  # isort:skip  # noqa: F401, WPS113
 from l7x.db.text_model import TextModel as TextModel  # isort:skip  # noqa: F401, WPS113
 from l7x.db.audio_model import AudioModel as AudioModel  # isort:skip  # noqa: F401, WPS113
+from l7x.db.conversation_participant_model import ConversationParticipantModel as ConversationParticipantModel  # isort:skip  # noqa: F401, WPS113
+from l7x.db.text_translation_model import TextTranslationModel as TextTranslationModel  # isort:skip  # noqa: F401, WPS113
 
 # pylint: enable=useless-import-alias, unused-import
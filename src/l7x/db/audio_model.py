@@ -16,7 +16,8 @@ class AudioModel(Model):
     #####################################################################################################
 
     primary_uuid: UUID = DbUUID(primary_key=True, server_default=text('gen_random_uuid()'))
-    create_ts: datetime = DbDateTime(default=now_utc)
+    # partition key, range partitioned by month (see l7x.utils.partition_utils)
+    create_ts: datetime = DbDateTime(default=now_utc, nullable=False)
     audio_raw: bytes = LargeBinary(max_length=100*1024*1024, nullable=False)
 
     #####################################################################################################
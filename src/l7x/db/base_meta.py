@@ -98,6 +98,11 @@ def ormar_change_database(database: Database) -> None:
 
 #####################################################################################################
 
+def get_database() -> Database:
+    return _BASE_ORMAR_CONFIG.database
+
+#####################################################################################################
+
 def create_transaction() -> Transaction:
     return _BASE_ORMAR_CONFIG.database.transaction()
 
@@ -0,0 +1,87 @@
+#####################################################################################################
+
+from collections.abc import Mapping, Sequence
+from typing import Any, Final
+from uuid import UUID
+
+from databases import Database
+
+#####################################################################################################
+
+# Provisioning of departments and users: the rows are streamed by COPY into a temporary staging table
+# and merged by one INSERT ... ON CONFLICT, the unchanged rows are not updated.
+
+DEPARTMENT_COLUMNS: Final = ('primary_uuid', 'name', 'address', 'timezone')
+USER_COLUMNS: Final = (
+    'primary_uuid', 'login', 'full_name', 'password', 'ip_v4', 'is_active', 'is_superuser', 'create_at', 'department_id',
+)
+
+# the creation time of an existing user is kept, the password and is_active only when asked
+_USER_UPDATED_COLUMNS: Final = tuple(column for column in USER_COLUMNS if column not in {'primary_uuid', 'create_at'})
+_USER_PROFILE_COLUMNS: Final = tuple(column for column in _USER_UPDATED_COLUMNS if column not in {'password', 'is_active'})
+_DEPARTMENT_UPDATED_COLUMNS: Final = DEPARTMENT_COLUMNS[1:]
+
+_USER_PASSWORDS_QUERY: Final = 'SELECT primary_uuid, password FROM users WHERE primary_uuid = ANY($1::uuid[])'
+
+#####################################################################################################
+
+def _merge_sql(table: str, staging_table: str, columns: Sequence[str], updated_columns: Sequence[str]) -> str:
+    column_list: Final = ', '.join(columns)
+    updated_list: Final = ', '.join(updated_columns)
+    return f'''
+        INSERT INTO {table} ({column_list})
+        SELECT {column_list} FROM {staging_table}
+        ON CONFLICT (primary_uuid) DO UPDATE
+        SET ({updated_list}) = ROW({', '.join(f'excluded.{column}' for column in updated_columns)})
+        WHERE ({', '.join(f'{table}.{column}' for column in updated_columns)})
+            IS DISTINCT FROM ({', '.join(f'excluded.{column}' for column in updated_columns)})
+    '''
+
+#####################################################################################################
+
+async def fetch_user_passwords(database: Database, user_uuids: Sequence[UUID]) -> Mapping[UUID, str]:
+    """Password hashes of the existing users, to rehash only the changed passwords."""
+    async with database.connection() as connection:
+        rows: Final = await connection.raw_connection.fetch(_USER_PASSWORDS_QUERY, list(user_uuids))
+    return {row['primary_uuid']: row['password'] for row in rows}
+
+#####################################################################################################
+
+async def _copy_and_merge(
+    raw_connection: Any,
+    table: str,
+    columns: Sequence[str],
+    updated_columns: Sequence[str],
+    records: Sequence[tuple[Any, ...]],
+) -> str:
+    staging_table: Final = f'{table}_import'
+    await raw_connection.execute(f'CREATE TEMP TABLE {staging_table} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP')
+    await raw_connection.copy_records_to_table(staging_table, records=records, columns=list(columns))
+    return await raw_connection.execute(_merge_sql(table, staging_table, columns, updated_columns))
+
+#####################################################################################################
+
+async def import_departments_and_users(
+    database: Database,
+    *,
+    departments: Sequence[tuple[Any, ...]],
+    users: Sequence[tuple[Any, ...]],
+    overwrite_user_access: bool = False,
+) -> tuple[str, str]:
+    """
+    Merge the rows (in DEPARTMENT_COLUMNS / USER_COLUMNS order) in one transaction, returns the statuses.
+
+    The password and is_active of the existing users are kept unless overwrite_user_access.
+    """
+    user_updated_columns: Final = _USER_UPDATED_COLUMNS if overwrite_user_access else _USER_PROFILE_COLUMNS
+    async with database.connection() as connection, connection.transaction():
+        raw_connection: Final = connection.raw_connection
+        departments_status: Final = await _copy_and_merge(
+            raw_connection, 'departments', DEPARTMENT_COLUMNS, _DEPARTMENT_UPDATED_COLUMNS, departments,
+        ) if departments else 'INSERT 0 0'
+        users_status: Final = await _copy_and_merge(
+            raw_connection, 'users', USER_COLUMNS, user_updated_columns, users,
+        ) if users else 'INSERT 0 0'
+    return departments_status, users_status
+
+#####################################################################################################
@@ -1,9 +1,11 @@
 #####################################################################################################
 
+from collections.abc import Sequence
 from datetime import datetime
+from typing import Final
 from uuid import UUID
 
-from ormar import JSON, ForeignKey, Model
+from ormar import JSON, ForeignKey, Integer, Model
 from pydantic import Json
 from sqlalchemy import text
 
@@ -22,6 +24,7 @@ class ConversationModel(Model):
     end_ts: datetime = DbDateTime(nullable=True)
     selected_lang: str = DbString(max_length=30, nullable=True)  # Todo Это ненужное поле
     questionare: Json = JSON(nullable=True)
+    max_participants: int = Integer(default=2, server_default=text('2'), nullable=False)
     first_user_session: SessionModel = ForeignKey(
         SessionModel,
         nullable=False,
@@ -40,9 +43,19 @@ class ConversationModel(Model):
     )
 
     @classmethod
-    async def close_all_unclosed(cls) -> None:
-        """Closes all conversations that are not closed."""
-        d = True
-        await cls.objects.filter(end_ts__isnull=True).update(end_ts=now_utc())
-        print("All unclosed conversations were closed")
+    async def close_all_unclosed(cls) -> Sequence[UUID]:
+        """Closes all conversations that are not closed by one UPDATE, returns uuids of the closed ones."""
+        conversations: Final = cls.ormar_config.table
+        closed_rows: Final = await cls.ormar_config.database.fetch_all(
+            conversations.update().where(
+                conversations.c.end_ts.is_(None),
+            ).values(
+                end_ts=now_utc(),
+            ).returning(
+                conversations.c.primary_uuid,
+            ),
+        )
+        return tuple(row['primary_uuid'] for row in closed_rows)
+
+
 #####################################################################################################
@@ -0,0 +1,44 @@
+#####################################################################################################
+
+from datetime import datetime
+from uuid import UUID
+
+from ormar import ForeignKey, Model, ReferentialAction
+from sqlalchemy import text
+
+from l7x.db import SessionModel
+from l7x.db.base_meta import create_ormar_config
+from l7x.db.conversation_model import ConversationModel
+from l7x.db.db_types import DbDateTime, DbString, DbUUID
+from l7x.utils.datetime_utils import now_utc
+
+#####################################################################################################
+
+class ConversationParticipantModel(Model):
+    #####################################################################################################
+
+    primary_uuid: UUID = DbUUID(primary_key=True, server_default=text('gen_random_uuid()'))
+    join_ts: datetime = DbDateTime(default=now_utc)
+    # set when the session of the participant is expired
+    leave_ts: datetime = DbDateTime(nullable=True)
+    lang: str = DbString(max_length=30, nullable=True)
+    conversation_id: ConversationModel = ForeignKey(
+        ConversationModel,
+        nullable=False,
+        related_name='participants',
+        ondelete=ReferentialAction.CASCADE,
+    )
+    session_id: SessionModel = ForeignKey(
+        SessionModel,
+        nullable=False,
+        related_name='conversation_participations',
+        ondelete=ReferentialAction.CASCADE,
+    )
+
+    #####################################################################################################
+
+    ormar_config = create_ormar_config(  # type: ignore[pydantic-field]
+        tablename='conversation_participants',
+    )
+
+#####################################################################################################
@@ -1,7 +1,11 @@
 #####################################################################################################
 
+from collections.abc import Awaitable, Callable
+from dataclasses import replace
 from datetime import datetime
+from functools import partial
 from logging import Logger
+from pathlib import Path
 from typing import Final, cast
 from uuid import UUID
 
@@ -10,85 +14,162 @@ from databases import Database
 from orjson import loads as orjson_loads
 from ormar.queryset import FieldAccessor
 
-from l7x.configs.constants import DEFAULT_ROOT_USER_LOGIN, DEFAULT_ROOT_USER_PASSWORD
+from l7x.configs.constants import DEFAULT_ROOT_USER_LOGIN, DEFAULT_ROOT_USER_PASSWORD, STARTUP_CONNECTIONS
 from l7x.configs.settings import AppSettings
-from l7x.db import DepartmentModel, UserModel
+from l7x.db import ConversationModel, UserModel
 from l7x.db.base_meta import create_none_database, ormar_change_database
-from l7x.utils.pwd_utils import create_password_hasher
+from l7x.db.bulk_import import fetch_user_passwords, import_departments_and_users
+from l7x.utils.datetime_utils import now_utc
+from l7x.utils.db_pool_utils import create_database, create_db_pool_config
+from l7x.utils.partition_utils import check_partitions_coverage, create_future_partitions
+from l7x.utils.pwd_utils import create_password_hasher, create_password_hasher_parameters, hash_changed_passwords
+from l7x.utils.startup_utils import file_run_key, run_startup_task
 
 #####################################################################################################
 
-def get_db_url_from_app_settings(app_settings: AppSettings, use_db_admin_credentials: bool = False) -> str:
+def get_db_url_from_app_settings(
+    app_settings: AppSettings,
+    use_db_admin_credentials: bool = False,
+    use_read_replica: bool = False,
+) -> str:
     db_user = app_settings.db_admin_user if use_db_admin_credentials else app_settings.db_user
     db_pass = app_settings.db_admin_pass if use_db_admin_credentials else app_settings.db_pass
+    db_host = app_settings.db_replica_host if use_read_replica else app_settings.db_host
+    db_port = app_settings.db_replica_port if use_read_replica else app_settings.db_port
 
     return (
         f'postgresql+asyncpg://{db_user}:{db_pass}@'
-        + f'{app_settings.db_host}:{app_settings.db_port}/{app_settings.db_name}'
+        + f'{db_host}:{db_port}/{app_settings.db_name}'
     )
 
 #####################################################################################################
 
-async def update_db_data(app_settings: AppSettings, logger: Logger) -> None:
-    db_data_file: Final = app_settings.init_db_json_path
+async def _import_db_data(database: Database, app_settings: AppSettings, logger: Logger, db_data_file: Path) -> None:
+    logger.info(f'File {db_data_file.absolute()} with database data found. Starting data insertion process.')
 
-    if db_data_file is None:
-        return
+    with open(db_data_file, 'rb') as json_file:
+        db_data = orjson_loads(json_file.read())
+        departments = db_data.get('departments') or {}
+        users = db_data.get('users') or {}
+
+    overwrite_user_access: Final = app_settings.init_db_overwrite_user_access
+    user_items: Final = [(UUID(uuid), user) for uuid, user in users.items()]
+    current_hashes: Final = await fetch_user_passwords(database, [uuid for uuid, _ in user_items])
+    # the existing passwords are kept, so only the new users are hashed; when they are overwritten,
+    # every existing user costs an argon2 verify (the hash cannot be compared otherwise) and only
+    # the changed passwords are hashed again. The hashes are computed in parallel processes.
+    hashed_items: Final = [
+        (uuid, user) for uuid, user in user_items if overwrite_user_access or uuid not in current_hashes
+    ]
+    new_hashes: Final = dict(zip(
+        [uuid for uuid, _ in hashed_items],
+        await hash_changed_passwords(
+            create_password_hasher_parameters(app_settings, logger),
+            [(user['password'], current_hashes.get(uuid)) for uuid, user in hashed_items],
+        ),
+        strict=True,
+    ))
+    create_at: Final = now_utc()
+
+    departments_status, users_status = await import_departments_and_users(
+        database,
+        departments=[
+            (UUID(uuid), department['name'], department['address'], department.get('timezone'))
+            for uuid, department in departments.items()
+        ],
+        users=[
+            (
+                uuid,
+                user['login'],
+                user['full_name'],
+                new_hashes.get(uuid) or current_hashes[uuid],
+                user.get('ip_v4'),
+                user.get('is_active', True),
+                user.get('is_superuser', False),
+                create_at,
+                UUID(user['department_id']),
+            )
+            for uuid, user in user_items
+        ],
+        overwrite_user_access=overwrite_user_access,
+    )
+    logger.info(
+        f'Data insertion process completed successfully. Departments: {departments_status}, '
+        + f'users: {users_status}, hashed passwords: {sum(new_hash is not None for new_hash in new_hashes.values())}.',
+    )
 
-    if not db_data_file.exists():
-        return
+#####################################################################################################
 
-    logger.info(f'File {db_data_file.absolute()} with database data found. Starting data insertion process.')
+def get_fa(model_field: str | int | bool | UUID | datetime | None) -> FieldAccessor:
+    return cast(FieldAccessor, model_field)
 
-    database: Final = Database(get_db_url_from_app_settings(app_settings, use_db_admin_credentials=True))
-    ormar_change_database(database)
+#####################################################################################################
 
+async def _check_default_superuser(app_settings: AppSettings, logger: Logger) -> None:
+    user: Final = await UserModel.objects.get_or_none(is_superuser=True, login=DEFAULT_ROOT_USER_LOGIN)
+    if user is None:
+        return
     try:
-        await database.connect()
-        with open(db_data_file, 'rb') as json_file:
-            db_data = orjson_loads(json_file.read())
-            departments = db_data.get('departments')
-            users = db_data.get('users')
-
-        async with database.transaction():
-            if departments:
-                for uuid, department in departments.items():
-                    await DepartmentModel(primary_uuid=uuid, **department).upsert(__force_save__=True)
-            if users:
-                password_hasher = create_password_hasher(app_settings, logger)
-                for uuid, user in users.items():
-                    user['password'] = password_hasher.hash(user['password'])
-                    await UserModel(primary_uuid=uuid, **user).upsert(__force_save__=True)
-            logger.info('Data insertion process completed successfully.')
-    except Exception as e:
-        logger.error(f'Error occurred during data insertion process. Data not added to the database. Error: {e}')
-    finally:
-        ormar_change_database(create_none_database())
-        await database.disconnect()
+        create_password_hasher(app_settings, logger).verify(user.password, DEFAULT_ROOT_USER_PASSWORD)
+    except VerifyMismatchError:
+        pass
+    else:
+        logger.warning('For security purposes, please change the default password of the default root user!')
 
 #####################################################################################################
 
-def get_fa(model_field: str | int | bool | UUID | datetime | None) -> FieldAccessor:
-    return cast(FieldAccessor, model_field)
+async def _close_unclosed_conversations(logger: Logger) -> None:
+    closed_conversations: Final = await ConversationModel.close_all_unclosed()
+    logger.info(f'{len(closed_conversations)} unclosed conversations were closed')
+
+#####################################################################################################
+
+async def _create_future_partitions(database: Database, app_settings: AppSettings, logger: Logger) -> None:
+    created_partitions: Final = await create_future_partitions(database, app_settings.db_partitions_months_ahead)
+    if created_partitions:
+        logger.info(f'{created_partitions} partitions were created')
+    await check_partitions_coverage(database, logger, now_utc())
 
 #####################################################################################################
 
-async def check_default_superuser(app_settings: AppSettings, logger: Logger) -> None:
-    database: Final = Database(get_db_url_from_app_settings(app_settings, use_db_admin_credentials=True))
+async def run_startup_tasks(app_settings: AppSettings, logger: Logger, deployment_id: str, start_id: str) -> None:
+    """
+    The database tasks of the start, serialized over the processes and hosts (see run_startup_task).
+
+    The partitions are created on every start (start_id), before the workers are started.
+    The conversations left open and the superuser are checked once per deployment: a restart of one host
+    does not close the live conversations of the other hosts (without L7X_DEPLOYMENT_ID every start
+    is a deployment, as for a single host). The opt-in data file import is run again only when
+    the file content or the overwrite setting is changed.
+    """
+    # the tasks are run one by one in this task, one connection of the budget is enough
+    database: Final = create_database(
+        get_db_url_from_app_settings(app_settings, use_db_admin_credentials=True),
+        replace(create_db_pool_config(app_settings), min_size=1, max_size=STARTUP_CONNECTIONS),
+    )
     ormar_change_database(database)
-    password_hasher = create_password_hasher(app_settings, logger)
+    db_data_file: Final = app_settings.init_db_json_path
+    tasks: Final[list[tuple[str, str, Callable[[], Awaitable[None]]]]] = [
+        ('create_future_partitions', start_id, partial(_create_future_partitions, database, app_settings, logger)),
+        ('close_unclosed_conversations', deployment_id, partial(_close_unclosed_conversations, logger)),
+        ('check_default_superuser', deployment_id, partial(_check_default_superuser, app_settings, logger)),
+    ]
+    if not app_settings.is_init_db_import_enabled:
+        if db_data_file is not None:
+            logger.info(f'File {db_data_file} is not imported, set L7X_INIT_DB_IMPORT_ENABLED to import it')
+    elif db_data_file is not None and db_data_file.exists():
+        tasks.append((
+            'import_db_data',
+            f'{file_run_key(db_data_file)}:{int(app_settings.init_db_overwrite_user_access)}',
+            partial(_import_db_data, database, app_settings, logger, db_data_file),
+        ))
     try:
         await database.connect()
-        user = await UserModel.objects.get_or_none(is_superuser=True, login=DEFAULT_ROOT_USER_LOGIN)
-        if user is None:
-            return
-        user_pw_hash = user.password
-        try:
-            password_hasher.verify(user_pw_hash, DEFAULT_ROOT_USER_PASSWORD)
-        except VerifyMismatchError:
-            pass
-        else:
-            logger.warning('For security purposes, please change the default password of the default root user!')
+        for name, run_key, task in tasks:
+            try:
+                await run_startup_task(database, logger, name=name, run_key=run_key, task=task)
+            except Exception as e:
+                logger.error(f'Startup task "{name}" failed, it is run again on the next start. Error: {e!r}')
     finally:
         ormar_change_database(create_none_database())
         await database.disconnect()
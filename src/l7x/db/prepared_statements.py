@@ -0,0 +1,217 @@
+#####################################################################################################
+
+from collections import Counter
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Final
+
+from databases import Database
+
+from l7x.db.base_meta import get_database
+
+#####################################################################################################
+
+@dataclass(frozen=True, slots=True)
+class PreparedStatement:
+    name: str
+    sql: str
+
+#####################################################################################################
+
+class PreparedStatementRegistry:
+    """
+    Named statements of the hot path, written once as SQL text with $n parameters.
+
+    They are sent by the asyncpg connection directly: nothing is compiled by ormar/SQLAlchemy per call,
+    and asyncpg prepares every statement once per connection (its statement cache is keyed by the SQL text),
+    so later calls on the connection skip parsing and planning on Postgres.
+    """
+
+    #####################################################################################################
+
+    def __init__(self, /) -> None:
+        self._statements: Final[dict[str, PreparedStatement]] = {}
+        self._calls: Final[Counter[str]] = Counter()
+
+    #####################################################################################################
+
+    def register(self, name: str, sql: str) -> PreparedStatement:
+        sql = ' '.join(sql.split())
+        registered: Final = self._statements.get(name)
+        if registered is not None and registered.sql != sql:
+            raise ValueError(f'Statement "{name}" is already registered with other SQL')
+        statement: Final = PreparedStatement(name=name, sql=sql)
+        self._statements[name] = statement
+        return statement
+
+    #####################################################################################################
+
+    def __iter__(self, /) -> Iterator[PreparedStatement]:
+        return iter(tuple(self._statements.values()))
+
+    #####################################################################################################
+
+    async def fetch(self, statement: PreparedStatement, *args: Any, database: Database | None = None) -> Sequence[Any]:
+        self._calls[statement.name] += 1
+        async with (database or get_database()).connection() as connection:
+            return await connection.raw_connection.fetch(statement.sql, *args)
+
+    #####################################################################################################
+
+    async def fetchrow(self, statement: PreparedStatement, *args: Any, database: Database | None = None) -> Any:
+        self._calls[statement.name] += 1
+        async with (database or get_database()).connection() as connection:
+            return await connection.raw_connection.fetchrow(statement.sql, *args)
+
+    #####################################################################################################
+
+    async def fetchval(self, statement: PreparedStatement, *args: Any, database: Database | None = None) -> Any:
+        self._calls[statement.name] += 1
+        async with (database or get_database()).connection() as connection:
+            return await connection.raw_connection.fetchval(statement.sql, *args)
+
+    #####################################################################################################
+
+    async def execute(self, statement: PreparedStatement, *args: Any, database: Database | None = None) -> str:
+        self._calls[statement.name] += 1
+        async with (database or get_database()).connection() as connection:
+            return await connection.raw_connection.execute(statement.sql, *args)
+
+    #####################################################################################################
+
+    async def prepare_all(self, database: Database | None = None) -> None:
+        """Check the SQL of all statements against the current schema, an invalid statement fails at startup."""
+        async with (database or get_database()).connection() as connection:
+            for statement in self:
+                await connection.raw_connection.prepare(statement.sql)
+
+    #####################################################################################################
+
+    def stats(self, /) -> Mapping[str, Any]:
+        return dict(self._calls)
+
+#####################################################################################################
+
+HOT_STATEMENTS: Final = PreparedStatementRegistry()
+
+#####################################################################################################
+
+SESSION_STATE: Final = HOT_STATEMENTS.register('session_state', '''
+    SELECT s.primary_uuid AS session_uuid,
+           u.primary_uuid AS user_uuid,
+           s.logout_ts IS NOT NULL AS is_closed,
+           u.is_active AS is_user_active,
+           u.is_superuser AS is_superuser
+    FROM sessions AS s
+    JOIN users AS u ON u.primary_uuid = s.user_id
+    WHERE s.primary_uuid = $1
+''')
+
+# the newest not full conversation which the session does not take part in yet,
+# conversations started by the same session of the same user are skipped
+WAITING_CONVERSATION: Final = HOT_STATEMENTS.register('waiting_conversation', '''
+    SELECT c.primary_uuid
+    FROM conversations AS c
+    JOIN sessions AS s ON s.primary_uuid = c.first_user_session
+    LEFT JOIN conversation_participants AS p ON p.conversation_id = c.primary_uuid
+    WHERE c.end_ts IS NULL
+      AND (c.second_user_session IS NULL OR c.max_participants > 2)
+      AND NOT (c.first_user_session = $1 AND s.user_id = $2)
+    GROUP BY c.primary_uuid
+    HAVING count(p.primary_uuid) FILTER (WHERE p.leave_ts IS NULL) < c.max_participants
+       AND NOT coalesce(bool_or(p.session_id = $1), false)
+    ORDER BY c.start_ts DESC
+    LIMIT 1
+''')
+
+# the joins of a conversation are serialized by the lock of its row, returns its capacity while it is open
+LOCK_OPEN_CONVERSATION: Final = HOT_STATEMENTS.register('lock_open_conversation', '''
+    SELECT max_participants FROM conversations WHERE primary_uuid = $1 AND end_ts IS NULL FOR UPDATE
+''')
+
+# run after LOCK_OPEN_CONVERSATION in its transaction: the statement sees the participants committed before the lock,
+# the session joins only when the conversation is not full ($3 is its capacity); returns whether it has joined
+JOIN_CONVERSATION: Final = HOT_STATEMENTS.register('join_conversation', '''
+    WITH joined AS (
+        INSERT INTO conversation_participants (join_ts, conversation_id, session_id)
+        SELECT now(), $1, $2
+        WHERE (
+            SELECT count(*) FROM conversation_participants WHERE conversation_id = $1 AND leave_ts IS NULL
+        ) < $3
+          AND NOT EXISTS (SELECT 1 FROM conversation_participants WHERE conversation_id = $1 AND session_id = $2)
+        RETURNING conversation_id
+    ), second_session AS (
+        UPDATE conversations AS c
+        SET second_user_session = $2
+        FROM joined AS j
+        WHERE c.primary_uuid = j.conversation_id AND c.second_user_session IS NULL
+    )
+    SELECT EXISTS (SELECT 1 FROM joined)
+''')
+
+# the participants of the closed sessions ($1) leave, a conversation is closed when its first session has left
+# or when less than two participants stay (the CTE rows are not seen by the statement, so $1 is excluded again)
+CLOSE_SESSIONS_CONVERSATIONS: Final = HOT_STATEMENTS.register('close_sessions_conversations', '''
+    WITH left_participants AS (
+        UPDATE conversation_participants
+        SET leave_ts = now()
+        WHERE session_id = ANY($1::uuid[]) AND leave_ts IS NULL
+        RETURNING conversation_id
+    )
+    UPDATE conversations AS c
+    SET end_ts = now()
+    WHERE c.end_ts IS NULL
+      AND (
+          c.first_user_session = ANY($1::uuid[])
+          OR (
+              c.primary_uuid IN (SELECT conversation_id FROM left_participants)
+              AND (
+                  SELECT count(*)
+                  FROM conversation_participants AS p
+                  WHERE p.conversation_id = c.primary_uuid
+                    AND p.leave_ts IS NULL
+                    AND p.session_id <> ALL($1::uuid[])
+              ) < 2
+          )
+      )
+    RETURNING c.primary_uuid
+''')
+
+CONVERSATION_HAS_TEXTS: Final = HOT_STATEMENTS.register('conversation_has_texts', '''
+    SELECT EXISTS (SELECT 1 FROM texts WHERE conversation_id = $1)
+''')
+
+INSERT_TEXT: Final = HOT_STATEMENTS.register('insert_text', '''
+    INSERT INTO texts (
+        create_ts, audio_id, lang_from, lang_to, recognized_text, translated_text, owner_session_uuid, conversation_id
+    )
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+    RETURNING primary_uuid
+''')
+
+UPDATE_TEXT_FIX: Final = HOT_STATEMENTS.register('update_text_fix', '''
+    UPDATE texts
+    SET fixed_text = $2, translated_text = $3, edit_ts = $4
+    WHERE primary_uuid = $1
+''')
+
+# the translations of an edited text ($1) for the listener languages ($2) are replaced by $3
+UPDATE_TEXT_TRANSLATIONS: Final = HOT_STATEMENTS.register('update_text_translations', '''
+    UPDATE text_translations AS t
+    SET translated_text = v.translated_text
+    FROM unnest($2::varchar[], $3::text[]) AS v (lang_to, translated_text)
+    WHERE t.text_id = $1 AND t.lang_to = v.lang_to
+''')
+
+#####################################################################################################
+
+# multi-row writes of l7x.utils.write_behind_utils.WriteBehindBuffer, every parameter is an array of a column
+
+UPDATE_PARTICIPANT_LANGS_BATCH: Final = HOT_STATEMENTS.register('update_participant_langs_batch', '''
+    UPDATE conversation_participants AS p
+    SET lang = v.lang
+    FROM unnest($1::uuid[], $2::uuid[], $3::varchar[]) AS v (conversation_id, session_id, lang)
+    WHERE p.conversation_id = v.conversation_id AND p.session_id = v.session_id
+''')
+
+#####################################################################################################
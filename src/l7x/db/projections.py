@@ -0,0 +1,383 @@
+#####################################################################################################
+
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from typing import Any, Final, NamedTuple, TypeVar
+from uuid import UUID
+
+from databases import Database
+from sqlalchemy import and_, case, func, literal, or_, select
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from l7x.db.audio_model import AudioModel
+from l7x.db.conversation_model import ConversationModel
+from l7x.db.department_model import DepartmentModel
+from l7x.db.prepared_statements import CONVERSATION_HAS_TEXTS, HOT_STATEMENTS
+from l7x.db.session_model import SessionModel
+from l7x.db.text_model import TextModel
+from l7x.db.user_model import UserModel
+
+#####################################################################################################
+
+# Read-only projections: raw parameterized SQL on the shared database returning typed tuples
+# with only the needed columns, no ormar models are built. Writes and admin CRUD stay on ormar.
+
+_Record = TypeVar('_Record', bound=tuple[Any, ...])
+
+_CONVERSATIONS: Final = ConversationModel.ormar_config.table
+_SESSIONS: Final = SessionModel.ormar_config.table
+_USERS: Final = UserModel.ormar_config.table
+_DEPARTMENTS: Final = DepartmentModel.ormar_config.table
+_TEXTS: Final = TextModel.ormar_config.table
+_AUDIO: Final = AudioModel.ormar_config.table
+
+# conversations with their operator (user of the first session) and department
+_CONVERSATIONS_WITH_OPERATOR: Final = _CONVERSATIONS.join(
+    _SESSIONS, _SESSIONS.c.primary_uuid == _CONVERSATIONS.c.first_user_session,
+).join(
+    _USERS, _USERS.c.primary_uuid == _SESSIONS.c.user_id,
+).join(
+    _DEPARTMENTS, _DEPARTMENTS.c.primary_uuid == _USERS.c.department_id,
+)
+
+# TextType of a text, the texts.type column is dropped: the feedback is saved without an owner session,
+# the operator owns the first session, every joined participant (conversation_participants) is a client
+_TEXT_TYPE: Final = case(
+    (_TEXTS.c.owner_session_uuid.is_(None), literal('feedback')),
+    (_TEXTS.c.owner_session_uuid == _CONVERSATIONS.c.first_user_session, literal('operator')),
+    else_=literal('client'),
+)
+
+#####################################################################################################
+
+class ConversationListRecord(NamedTuple):
+    primary_uuid: UUID
+    start_ts: datetime
+    end_ts: datetime | None
+    selected_lang: str | None
+    questionare: Mapping[str, Any] | None
+    user_full_name: str
+    user_login: str
+    department_name: str
+
+#####################################################################################################
+
+class EditedTextRecord(NamedTuple):
+    primary_uuid: UUID
+    create_ts: datetime
+    recognized_text: str
+    fixed_text: str | None
+    lang_from: str
+    audio_id: UUID
+
+#####################################################################################################
+
+class ConversationTextRecord(NamedTuple):
+    primary_uuid: UUID
+    conversation_id: UUID
+    audio_id: UUID | None
+    # operator, client or feedback, see TextType
+    type: str
+    create_ts: datetime
+    recognized_text: str
+    translated_text: str
+    lang_from: str
+    lang_to: str
+    edit_ts: datetime | None
+    fixed_text: str | None
+    audio_raw: bytes | None
+
+#####################################################################################################
+
+def _database() -> Database:
+    return ConversationModel.ormar_config.database
+
+#####################################################################################################
+
+async def _fetch_records(query: Select, record_cls: type[_Record]) -> list[_Record]:
+    rows: Final = await _database().fetch_all(query)
+    fields: Final = record_cls._fields  # type: ignore[attr-defined]
+    return [record_cls(*(row[field] for field in fields)) for row in rows]
+
+#####################################################################################################
+
+def _keyset_where(
+    sort_column: ColumnElement,
+    uuid_column: ColumnElement,
+    after: tuple[datetime, str] | None,
+    descending: bool,
+) -> list[ColumnElement]:
+    if after is None:
+        return []
+    after_ts, after_uuid = after
+    if descending:
+        return [or_(sort_column < after_ts, and_(sort_column == after_ts, uuid_column < after_uuid))]
+    return [or_(sort_column > after_ts, and_(sort_column == after_ts, uuid_column > after_uuid))]
+
+#####################################################################################################
+
+def _conversations_where(
+    start_date: datetime,
+    end_date: datetime,
+    users: Sequence[UUID],
+    departments: Sequence[UUID],
+) -> list[ColumnElement]:
+    where: Final[list[ColumnElement]] = [
+        _CONVERSATIONS.c.start_ts >= start_date,
+        _CONVERSATIONS.c.start_ts <= end_date,
+    ]
+    if users:
+        where.append(_SESSIONS.c.user_id.in_(users))
+    if departments:
+        where.append(_USERS.c.department_id.in_(departments))
+    return where
+
+#####################################################################################################
+
+def _conversation_list_query(
+    *,
+    start_date: datetime,
+    end_date: datetime,
+    users: Sequence[UUID] = (),
+    departments: Sequence[UUID] = (),
+    after: tuple[datetime, str] | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+    descending: bool = True,
+) -> Select:
+    order_by: Final = (
+        (_CONVERSATIONS.c.start_ts.desc(), _CONVERSATIONS.c.primary_uuid.desc()) if descending
+        else (_CONVERSATIONS.c.start_ts, _CONVERSATIONS.c.primary_uuid)
+    )
+    return select(
+        _CONVERSATIONS.c.primary_uuid,
+        _CONVERSATIONS.c.start_ts,
+        _CONVERSATIONS.c.end_ts,
+        _CONVERSATIONS.c.selected_lang,
+        _CONVERSATIONS.c.questionare,
+        _USERS.c.full_name.label('user_full_name'),
+        _USERS.c.login.label('user_login'),
+        _DEPARTMENTS.c.name.label('department_name'),
+    ).select_from(
+        _CONVERSATIONS_WITH_OPERATOR,
+    ).where(
+        *_conversations_where(start_date, end_date, users, departments),
+        *_keyset_where(_CONVERSATIONS.c.start_ts, _CONVERSATIONS.c.primary_uuid, after, descending),
+    ).order_by(*order_by).offset(offset).limit(limit)
+
+#####################################################################################################
+
+async def fetch_conversation_list(
+    *,
+    start_date: datetime,
+    end_date: datetime,
+    users: Sequence[UUID] = (),
+    departments: Sequence[UUID] = (),
+    after: tuple[datetime, str] | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+    descending: bool = True,
+) -> list[ConversationListRecord]:
+    query: Final = _conversation_list_query(
+        start_date=start_date,
+        end_date=end_date,
+        users=users,
+        departments=departments,
+        after=after,
+        offset=offset,
+        limit=limit,
+        descending=descending,
+    )
+    return await _fetch_records(query, ConversationListRecord)
+
+#####################################################################################################
+
+async def count_conversations(
+    *,
+    start_date: datetime,
+    end_date: datetime,
+    users: Sequence[UUID] = (),
+    departments: Sequence[UUID] = (),
+) -> int:
+    query: Final = select(func.count()).select_from(
+        _CONVERSATIONS_WITH_OPERATOR,
+    ).where(
+        *_conversations_where(start_date, end_date, users, departments),
+    )
+    return int(await _database().fetch_val(query))
+
+#####################################################################################################
+
+async def fetch_conversation_uuids(
+    *,
+    start_date: datetime,
+    end_date: datetime,
+    users: Sequence[UUID] = (),
+    departments: Sequence[UUID] = (),
+) -> list[UUID]:
+    query: Final = select(_CONVERSATIONS.c.primary_uuid).select_from(
+        _CONVERSATIONS_WITH_OPERATOR,
+    ).where(
+        *_conversations_where(start_date, end_date, users, departments),
+    ).order_by(_CONVERSATIONS.c.start_ts)
+    return [row['primary_uuid'] for row in await _database().fetch_all(query)]
+
+#####################################################################################################
+
+def _edited_texts_where(start_date: datetime, end_date: datetime, languages: Sequence[str]) -> list[ColumnElement]:
+    where: Final[list[ColumnElement]] = [
+        _TEXTS.c.create_ts >= start_date,
+        _TEXTS.c.create_ts <= end_date,
+        _TEXTS.c.audio_id.isnot(None),
+        _TEXTS.c.edit_ts.isnot(None),
+        # a saved fix without changes is not a recognition error
+        _TEXTS.c.fixed_text.is_distinct_from(_TEXTS.c.recognized_text),
+    ]
+    if languages:
+        where.append(_TEXTS.c.lang_from.in_(languages))
+    return where
+
+#####################################################################################################
+
+def _edited_texts_query(
+    *,
+    start_date: datetime,
+    end_date: datetime,
+    languages: Sequence[str] = (),
+    after: tuple[datetime, str] | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+    descending: bool = True,
+) -> Select:
+    order_by: Final = (
+        (_TEXTS.c.create_ts.desc(), _TEXTS.c.primary_uuid.desc()) if descending
+        else (_TEXTS.c.create_ts, _TEXTS.c.primary_uuid)
+    )
+    return select(
+        _TEXTS.c.primary_uuid,
+        _TEXTS.c.create_ts,
+        _TEXTS.c.recognized_text,
+        _TEXTS.c.fixed_text,
+        _TEXTS.c.lang_from,
+        _TEXTS.c.audio_id,
+    ).where(
+        *_edited_texts_where(start_date, end_date, languages),
+        *_keyset_where(_TEXTS.c.create_ts, _TEXTS.c.primary_uuid, after, descending),
+    ).order_by(*order_by).offset(offset).limit(limit)
+
+#####################################################################################################
+
+async def fetch_edited_texts(
+    *,
+    start_date: datetime,
+    end_date: datetime,
+    languages: Sequence[str] = (),
+    after: tuple[datetime, str] | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+    descending: bool = True,
+) -> list[EditedTextRecord]:
+    query: Final = _edited_texts_query(
+        start_date=start_date,
+        end_date=end_date,
+        languages=languages,
+        after=after,
+        offset=offset,
+        limit=limit,
+        descending=descending,
+    )
+    return await _fetch_records(query, EditedTextRecord)
+
+#####################################################################################################
+
+async def count_edited_texts(*, start_date: datetime, end_date: datetime, languages: Sequence[str] = ()) -> int:
+    query: Final = select(func.count()).select_from(_TEXTS).where(
+        *_edited_texts_where(start_date, end_date, languages),
+    )
+    return int(await _database().fetch_val(query))
+
+#####################################################################################################
+
+async def fetch_edited_text_uuids(*, start_date: datetime, end_date: datetime, languages: Sequence[str] = ()) -> list[UUID]:
+    query: Final = select(_TEXTS.c.primary_uuid).where(
+        *_edited_texts_where(start_date, end_date, languages),
+    ).order_by(_TEXTS.c.create_ts)
+    return [row['primary_uuid'] for row in await _database().fetch_all(query)]
+
+#####################################################################################################
+
+async def fetch_conversations_by_uuids(conversation_uuids: Sequence[UUID | str]) -> list[ConversationListRecord]:
+    if not conversation_uuids:
+        return []
+    query: Final = select(
+        _CONVERSATIONS.c.primary_uuid,
+        _CONVERSATIONS.c.start_ts,
+        _CONVERSATIONS.c.end_ts,
+        _CONVERSATIONS.c.selected_lang,
+        _CONVERSATIONS.c.questionare,
+        _USERS.c.full_name.label('user_full_name'),
+        _USERS.c.login.label('user_login'),
+        _DEPARTMENTS.c.name.label('department_name'),
+    ).select_from(
+        _CONVERSATIONS_WITH_OPERATOR,
+    ).where(
+        _CONVERSATIONS.c.primary_uuid.in_(conversation_uuids),
+    ).order_by(_CONVERSATIONS.c.start_ts)
+    return await _fetch_records(query, ConversationListRecord)
+
+#####################################################################################################
+
+def _conversation_texts_query(*, with_audio: bool) -> Select:
+    return select(
+        _TEXTS.c.primary_uuid,
+        _TEXTS.c.conversation_id,
+        _TEXTS.c.audio_id,
+        _TEXT_TYPE.label('type'),
+        _TEXTS.c.create_ts,
+        _TEXTS.c.recognized_text,
+        _TEXTS.c.translated_text,
+        _TEXTS.c.lang_from,
+        _TEXTS.c.lang_to,
+        _TEXTS.c.edit_ts,
+        _TEXTS.c.fixed_text,
+        (_AUDIO.c.audio_raw if with_audio else literal(None)).label('audio_raw'),
+    ).select_from(
+        _TEXTS.join(
+            _CONVERSATIONS, _CONVERSATIONS.c.primary_uuid == _TEXTS.c.conversation_id,
+        ).outerjoin(
+            _AUDIO, _AUDIO.c.primary_uuid == _TEXTS.c.audio_id,
+        ),
+    )
+
+#####################################################################################################
+
+async def fetch_conversations_texts(
+    conversation_uuids: Sequence[UUID | str],
+    *,
+    with_audio: bool,
+) -> list[ConversationTextRecord]:
+    """Texts of the conversations ordered by conversation and create_ts, audio is read only when with_audio."""
+    if not conversation_uuids:
+        return []
+    query: Final = _conversation_texts_query(with_audio=with_audio).where(
+        _TEXTS.c.conversation_id.in_(conversation_uuids),
+    ).order_by(_TEXTS.c.conversation_id, _TEXTS.c.create_ts)
+    return await _fetch_records(query, ConversationTextRecord)
+
+#####################################################################################################
+
+async def fetch_texts_by_uuids(text_uuids: Sequence[UUID | str], *, with_audio: bool) -> list[ConversationTextRecord]:
+    if not text_uuids:
+        return []
+    query: Final = _conversation_texts_query(with_audio=with_audio).where(
+        _TEXTS.c.primary_uuid.in_(text_uuids),
+    ).order_by(_TEXTS.c.create_ts)
+    return await _fetch_records(query, ConversationTextRecord)
+
+#####################################################################################################
+
+async def has_conversation_texts(conversation_uuid: UUID | str) -> bool:
+    return bool(await HOT_STATEMENTS.fetchval(CONVERSATION_HAS_TEXTS, UUID(str(conversation_uuid))))
+
+#####################################################################################################
@@ -0,0 +1,340 @@
+#####################################################################################################
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from time import monotonic
+from typing import Final, NamedTuple
+from uuid import UUID
+
+from databases import Database
+from sqlalchemy import text
+
+from l7x.configs.constants import ROLLUPS_ADVISORY_LOCK_KEY
+from l7x.db.base_meta import get_database
+from l7x.utils.datetime_utils import UTC_ZONE
+
+#####################################################################################################
+
+# Daily rollups of the admin statistics, refreshed from the watermark by the sessions check worker.
+# Conversations are closed and their texts are edited at most a day after the start (sessions expire
+# on the day change), so every refresh recomputes the days from the watermark minus that lag.
+# The days are recomputed by batches of _REFRESH_BATCH_DAYS, each batch in its own transaction moving the watermark,
+# so the first refresh or an old invalidation is not one statement over all the history.
+
+_DAILY_WATERMARK: Final = 'daily'
+_LATE_CHANGES_LAG: Final = timedelta(days=1)
+_REFRESH_BATCH_DAYS: Final = 31
+# the rest of the history is refreshed by the next runs, the worker loop is not held by a long backfill
+_MAX_REFRESH_BATCHES: Final = 12
+
+# the row is locked until the refresh commits: a concurrent invalidate_rollups waits and lowers the new watermark,
+# an invalidation committed before is read here
+_GET_WATERMARK_QUERY: Final = text("""
+SELECT watermark FROM rollup_watermarks WHERE name = :name FOR UPDATE
+""")
+
+_SET_WATERMARK_QUERY: Final = text("""
+INSERT INTO rollup_watermarks (name, watermark) VALUES (:name, :watermark)
+ON CONFLICT (name) DO UPDATE SET watermark = excluded.watermark
+""")
+
+_LOWER_WATERMARK_QUERY: Final = text("""
+UPDATE rollup_watermarks SET watermark = least(watermark, :watermark)
+""")
+
+_FIRST_DAY_QUERY: Final = text("""
+SELECT (min(start_ts) AT TIME ZONE 'UTC')::date FROM conversations
+""")
+
+_DELETE_CONVERSATION_ROLLUPS_QUERY: Final = text("""
+DELETE FROM daily_conversation_rollups WHERE day >= :from_day AND day < :to_day
+""")
+
+_DELETE_TEXT_ROLLUPS_QUERY: Final = text("""
+DELETE FROM daily_text_rollups WHERE day >= :from_day AND day < :to_day
+""")
+
+# the questionnaire is saved as a json object or as a json string with the object, answers are digits
+_INSERT_CONVERSATION_ROLLUPS_QUERY: Final = text("""
+WITH answered AS (
+    SELECT
+        c.start_ts,
+        c.end_ts,
+        u.department_id,
+        CASE json_typeof(c.questionare)
+            WHEN 'string' THEN (c.questionare #>> '{}')::json
+            ELSE c.questionare
+        END AS answers
+    FROM conversations AS c
+    JOIN sessions AS s ON s.primary_uuid = c.first_user_session
+    JOIN users AS u ON u.primary_uuid = s.user_id
+    WHERE c.start_ts >= :from_ts AND c.start_ts < :to_ts
+), scored AS (
+    SELECT
+        start_ts,
+        end_ts,
+        department_id,
+        CASE WHEN answers ->> 'recommends' ~ '^[0-9]+$' THEN (answers ->> 'recommends')::integer END AS nps,
+        CASE WHEN answers ->> 'translation_quality' ~ '^[0-9]+$' THEN (answers ->> 'translation_quality')::integer END
+            AS translation,
+        CASE WHEN answers ->> 'difficulty_of_use' ~ '^[0-9]+$' THEN (answers ->> 'difficulty_of_use')::integer END
+            AS usability
+    FROM answered
+)
+INSERT INTO daily_conversation_rollups (
+    day, department_id, conversations, closed_conversations, duration_sec,
+    nps_answers, nps_sum, translation_answers, translation_sum, usability_answers, usability_sum
+)
+SELECT
+    (start_ts AT TIME ZONE 'UTC')::date,
+    department_id,
+    count(*),
+    count(end_ts),
+    coalesce(sum(extract(EPOCH FROM end_ts - start_ts)), 0),
+    count(nps),
+    coalesce(sum(nps), 0),
+    count(translation),
+    coalesce(sum(translation), 0),
+    count(usability),
+    coalesce(sum(usability), 0)
+FROM scored
+GROUP BY 1, 2
+""")
+
+_INSERT_TEXT_ROLLUPS_QUERY: Final = text("""
+INSERT INTO daily_text_rollups (
+    day, department_id, lang_from, lang_to, texts, audio_texts, edited_texts, edited_audio_texts
+)
+SELECT
+    (t.create_ts AT TIME ZONE 'UTC')::date,
+    u.department_id,
+    t.lang_from,
+    t.lang_to,
+    count(*),
+    count(t.audio_id),
+    count(*) FILTER (WHERE t.edit_ts IS NOT NULL AND t.fixed_text IS DISTINCT FROM t.recognized_text),
+    count(*) FILTER (
+        WHERE t.edit_ts IS NOT NULL AND t.fixed_text IS DISTINCT FROM t.recognized_text AND t.audio_id IS NOT NULL
+    )
+FROM texts AS t
+JOIN conversations AS c ON c.primary_uuid = t.conversation_id
+JOIN sessions AS s ON s.primary_uuid = c.first_user_session
+JOIN users AS u ON u.primary_uuid = s.user_id
+WHERE t.create_ts >= :from_ts AND t.create_ts < :to_ts
+GROUP BY 1, 2, 3, 4
+""")
+
+_CONVERSATION_TOTALS_QUERY: Final = text("""
+SELECT
+    coalesce(sum(conversations), 0) AS conversations,
+    coalesce(sum(closed_conversations), 0) AS closed_conversations,
+    coalesce(sum(duration_sec), 0) AS duration_sec,
+    coalesce(sum(nps_answers), 0) AS nps_answers,
+    coalesce(sum(nps_sum), 0) AS nps_sum,
+    coalesce(sum(translation_answers), 0) AS translation_answers,
+    coalesce(sum(translation_sum), 0) AS translation_sum,
+    coalesce(sum(usability_answers), 0) AS usability_answers,
+    coalesce(sum(usability_sum), 0) AS usability_sum
+FROM daily_conversation_rollups
+WHERE day BETWEEN :start_day AND :end_day
+    AND (cardinality(CAST(:departments AS uuid[])) = 0 OR department_id = ANY(CAST(:departments AS uuid[])))
+""")
+
+_TEXT_TOTALS_QUERY: Final = text("""
+SELECT
+    coalesce(sum(texts), 0) AS texts,
+    coalesce(sum(audio_texts), 0) AS audio_texts,
+    coalesce(sum(edited_texts), 0) AS edited_texts,
+    coalesce(sum(edited_audio_texts), 0) AS edited_audio_texts
+FROM daily_text_rollups
+WHERE day BETWEEN :start_day AND :end_day
+    AND (cardinality(CAST(:languages AS varchar[])) = 0 OR lang_from = ANY(CAST(:languages AS varchar[])))
+""")
+
+_TEXT_GROUPS_QUERY: Final = text("""
+SELECT
+    d.name AS department_name,
+    r.lang_from,
+    sum(r.audio_texts) AS audio_texts,
+    sum(r.edited_audio_texts) AS edited_audio_texts
+FROM daily_text_rollups AS r
+JOIN departments AS d ON d.primary_uuid = r.department_id
+WHERE r.day BETWEEN :start_day AND :end_day
+    AND (cardinality(CAST(:languages AS varchar[])) = 0 OR r.lang_from = ANY(CAST(:languages AS varchar[])))
+GROUP BY d.name, r.lang_from
+HAVING sum(r.edited_audio_texts) > 0
+ORDER BY sum(r.edited_audio_texts) DESC, d.name, r.lang_from
+""")
+
+#####################################################################################################
+
+@dataclass(frozen=True, kw_only=True)
+class RollupsRefreshStats:
+    from_day: date
+    # the first day not refreshed yet, the current day is refreshed when to_day is after it
+    to_day: date
+    batches: int
+    conversation_buckets: int
+    text_buckets: int
+    duration_sec: float
+
+#####################################################################################################
+
+class ConversationTotals(NamedTuple):
+    conversations: int
+    closed_conversations: int
+    duration_sec: float
+    nps_answers: int
+    nps_sum: int
+    translation_answers: int
+    translation_sum: int
+    usability_answers: int
+    usability_sum: int
+
+#####################################################################################################
+
+class TextTotals(NamedTuple):
+    texts: int
+    audio_texts: int
+    edited_texts: int
+    edited_audio_texts: int
+
+#####################################################################################################
+
+class TextGroupTotals(NamedTuple):
+    department_name: str
+    lang_from: str
+    audio_texts: int
+    edited_audio_texts: int
+
+#####################################################################################################
+
+def _day_start(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=UTC_ZONE)
+
+#####################################################################################################
+
+@dataclass(frozen=True, kw_only=True)
+class _RefreshedBatch:
+    from_day: date
+    to_day: date
+    is_last: bool
+    conversation_buckets: int
+    text_buckets: int
+
+#####################################################################################################
+
+async def _refresh_batch(database: Database) -> _RefreshedBatch | None:
+    """Recompute at most _REFRESH_BATCH_DAYS days from the watermark, None when another worker holds the lock."""
+    async with database.transaction():
+        is_lock_acquired: Final = await database.fetch_val(
+            'SELECT pg_try_advisory_xact_lock(:lock_key)',
+            values={'lock_key': ROLLUPS_ADVISORY_LOCK_KEY},
+        )
+        if not is_lock_acquired:
+            return None
+
+        # the transaction time, rows committed later have a later timestamp or are covered by the lag
+        refresh_ts: Final = await database.fetch_val('SELECT now()')
+        watermark: Final = await database.fetch_val(_GET_WATERMARK_QUERY, values={'name': _DAILY_WATERMARK})
+        from_day: Final = (
+            (watermark - _LATE_CHANGES_LAG).date() if watermark is not None
+            else await database.fetch_val(_FIRST_DAY_QUERY) or refresh_ts.date()
+        )
+        end_day: Final = refresh_ts.date() + timedelta(days=1)
+        to_day: Final = min(from_day + timedelta(days=_REFRESH_BATCH_DAYS), end_day)
+        is_last: Final = to_day >= end_day
+        days_values: Final = {'from_day': from_day, 'to_day': to_day}
+        ts_values: Final = {'from_ts': _day_start(from_day), 'to_ts': _day_start(to_day)}
+
+        await database.execute(_DELETE_CONVERSATION_ROLLUPS_QUERY, values=days_values)
+        await database.execute(_INSERT_CONVERSATION_ROLLUPS_QUERY, values=ts_values)
+        await database.execute(_DELETE_TEXT_ROLLUPS_QUERY, values=days_values)
+        await database.execute(_INSERT_TEXT_ROLLUPS_QUERY, values=ts_values)
+        # an earlier batch moves the watermark so that the next batch starts at its to_day
+        new_watermark: Final = refresh_ts if is_last else _day_start(to_day) + _LATE_CHANGES_LAG
+        await database.execute(_SET_WATERMARK_QUERY, values={'name': _DAILY_WATERMARK, 'watermark': new_watermark})
+
+        conversation_buckets: Final = await database.fetch_val(
+            'SELECT count(*) FROM daily_conversation_rollups WHERE day >= :from_day AND day < :to_day',
+            values=days_values,
+        )
+        text_buckets: Final = await database.fetch_val(
+            'SELECT count(*) FROM daily_text_rollups WHERE day >= :from_day AND day < :to_day',
+            values=days_values,
+        )
+
+    return _RefreshedBatch(
+        from_day=from_day,
+        to_day=to_day,
+        is_last=is_last,
+        conversation_buckets=conversation_buckets,
+        text_buckets=text_buckets,
+    )
+
+#####################################################################################################
+
+async def refresh_daily_rollups(database: Database) -> RollupsRefreshStats | None:
+    """Recompute the day buckets changed since the watermark by batches, None when another worker holds the lock."""
+    start_ts: Final = monotonic()
+    batches: Final[list[_RefreshedBatch]] = []
+    while len(batches) < _MAX_REFRESH_BATCHES:
+        batch = await _refresh_batch(database)
+        if batch is None:
+            break
+        batches.append(batch)
+        if batch.is_last:
+            break
+    if not batches:
+        return None
+
+    return RollupsRefreshStats(
+        from_day=batches[0].from_day,
+        to_day=batches[-1].to_day,
+        batches=len(batches),
+        conversation_buckets=sum(batch.conversation_buckets for batch in batches),
+        text_buckets=sum(batch.text_buckets for batch in batches),
+        duration_sec=monotonic() - start_ts,
+    )
+
+#####################################################################################################
+
+async def invalidate_rollups(since: datetime) -> None:
+    """Recompute the days from since on the next refresh, for the changes older than the refresh lag."""
+    await get_database().execute(_LOWER_WATERMARK_QUERY, values={'watermark': since})
+
+#####################################################################################################
+
+async def fetch_conversation_totals(
+    *,
+    start_day: date,
+    end_day: date,
+    departments: Sequence[UUID] = (),
+) -> ConversationTotals:
+    row: Final = await get_database().fetch_one(
+        _CONVERSATION_TOTALS_QUERY,
+        values={'start_day': start_day, 'end_day': end_day, 'departments': list(departments)},
+    )
+    return ConversationTotals(*(row[field] for field in ConversationTotals._fields))
+
+#####################################################################################################
+
+async def fetch_text_totals(*, start_day: date, end_day: date, languages: Sequence[str] = ()) -> TextTotals:
+    row: Final = await get_database().fetch_one(
+        _TEXT_TOTALS_QUERY,
+        values={'start_day': start_day, 'end_day': end_day, 'languages': list(languages)},
+    )
+    return TextTotals(*(row[field] for field in TextTotals._fields))
+
+#####################################################################################################
+
+async def fetch_text_groups(*, start_day: date, end_day: date, languages: Sequence[str] = ()) -> list[TextGroupTotals]:
+    """Recognition errors by department and source language, the groups without errors are skipped."""
+    rows: Final = await get_database().fetch_all(
+        _TEXT_GROUPS_QUERY,
+        values={'start_day': start_day, 'end_day': end_day, 'languages': list(languages)},
+    )
+    return [TextGroupTotals(*(row[field] for field in TextGroupTotals._fields)) for row in rows]
+
+#####################################################################################################
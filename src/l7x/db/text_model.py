@@ -25,7 +25,8 @@ class TextModel(Model):
     #####################################################################################################
 
     primary_uuid: UUID = DbUUID(primary_key=True, server_default=text('gen_random_uuid()'))
-    create_ts: datetime = DbDateTime(default=now_utc)
+    # partition key, range partitioned by month (see l7x.utils.partition_utils)
+    create_ts: datetime = DbDateTime(default=now_utc, nullable=False)
     edit_ts: datetime = DbDateTime(nullable=True)
     audio_id: AudioModel | None = ForeignKey(AudioModel, nullable=True, related_name='audio')  # TODO Сделать One-to-one
     lang_from: str = DbString(max_length=30)
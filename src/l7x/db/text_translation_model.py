@@ -0,0 +1,35 @@
+#####################################################################################################
+
+from uuid import UUID
+
+from ormar import ForeignKey, Model, ReferentialAction, Text
+from sqlalchemy import text
+
+from l7x.db.base_meta import create_ormar_config
+from l7x.db.db_types import DbString, DbUUID
+from l7x.db.text_model import TextModel
+
+#####################################################################################################
+
+class TextTranslationModel(Model):
+    """Translation of a broadcast message to one of the listeners languages."""
+
+    #####################################################################################################
+
+    primary_uuid: UUID = DbUUID(primary_key=True, server_default=text('gen_random_uuid()'))
+    lang_to: str = DbString(max_length=30)
+    translated_text: str = Text()
+    text_id: TextModel = ForeignKey(
+        TextModel,
+        nullable=False,
+        related_name='translations',
+        ondelete=ReferentialAction.CASCADE,
+    )
+
+    #####################################################################################################
+
+    ormar_config = create_ormar_config(  # type: ignore[pydantic-field]
+        tablename='text_translations',
+    )
+
+#####################################################################################################
@@ -10,25 +10,28 @@ from l7x.db import SessionModel
 from l7x.types.language import LKey
 from l7x.types.localization import TKey
 from l7x.utils.conversation_utils import (
+    ConversationsPageSource,
     clear_filter_conversations,
     download_all_conversations,
-    get_all_conversations,
     get_all_departments_for_select,
     get_all_users_for_select,
+    update_conversation_stats,
     update_filtered_conversations,
     del_conversation,
 )
 from l7x.utils.datetime_utils import datetime_to_q_date, datetime_to_q_date_props
 from l7x.utils.departments_utils import create_department, del_department, edit_department, get_all_departments
 from l7x.utils.fastapi_utils import AppFastAPI
+from l7x.utils.keyset_pagination_utils import KeysetTable, keyset_columns
 from l7x.utils.lang_utils import create_lang_list
 
 from l7x.utils.nicegui_utils import TableColumn
 from l7x.utils.transcribe_analytics_utils import (
+    EditedTextsPageSource,
     clear_filter_audio_analysis,
     download_all_audio_cases,
-    get_edited_texts,
     update_filtered_audio_analysis,
+    update_text_stats,
 )
 from l7x.utils.ui_elements import calendar_element
 from l7x.utils.users_utils import create_user, del_user, edit_user, get_all_users
@@ -133,12 +136,23 @@ def _transcribe_analytic_cols(logger: Logger, lang: LKey) -> list[TableColumn]:
         {'name': 'create_date', 'label': TKey.A_CREATION_DATE(logger, lang), 'field': 'create_date', 'align': 'center', 'sortable': True},
         {'name': 'transcribe_text', 'label': TKey.A_RECOGNIZED_TEXT(logger, lang), 'field': 'transcribe_text', 'align': 'center', 'sortable': True},
         {'name': 'edited_text', 'label': TKey.A_EDITED_TEXT(logger, lang), 'field': 'edited_text', 'align': 'center', 'sortable': True},
+        {'name': 'edit_distance', 'label': TKey.A_EDIT_DISTANCE(logger, lang), 'field': 'edit_distance', 'align': 'center'},
         {'name': 'language', 'label': TKey.A_LANGUAGE(logger, lang), 'field': 'language', 'align': 'center', 'sortable': True},
         {'name': 'audio_url', 'label': TKey.A_AUDIO(logger, lang), 'field': 'audio_url', 'align': 'center', 'sortable': True},
     ]
 
 #####################################################################################################
 
+def _transcribe_groups_cols(logger: Logger, lang: LKey) -> list[TableColumn]:
+    return [
+        {'name': 'department', 'label': TKey.A_DEPARTMENT(logger, lang), 'field': 'department', 'align': 'center', 'sortable': True},
+        {'name': 'language', 'label': TKey.A_LANGUAGE(logger, lang), 'field': 'language', 'align': 'center', 'sortable': True},
+        {'name': 'recognized_texts', 'label': TKey.A_RECOGNIZED_TEXT(logger, lang), 'field': 'recognized_texts', 'align': 'center', 'sortable': True},
+        {'name': 'edited_texts', 'label': TKey.A_EDITED_TEXT(logger, lang), 'field': 'edited_texts', 'align': 'center'},
+    ]
+
+#####################################################################################################
+
 async def _admin_page(request: Request) -> None:
     app: Final = request.app
     default_lang: Final = LKey(app.app_settings.default_language_locale)
@@ -303,7 +317,8 @@ async def _admin_page(request: Request) -> None:
                                     end_date_str=end_calendar.value,
                                     departments=department_selector.value,
                                     users=user_selector.value,
-                                    conv_table=conversation_table,
+                                    conv_table=conversation_view,
+                                    stats_label=conversation_stats,
                                 ),
                             )
                             ui.button(
@@ -311,21 +326,22 @@ async def _admin_page(request: Request) -> None:
                                 on_click=lambda _: clear_filter_conversations(
                                     start_date=datetime_to_q_date(start_date_replaced),
                                     end_date=datetime_to_q_date(end_date_replaced),
-                                    conv_table=conversation_table,
+                                    conv_table=conversation_view,
                                     start_date_calendar=start_calendar,
                                     end_date_calendar=end_calendar,
                                     departments_input=department_selector,
                                     users_input=user_selector,
+                                    stats_label=conversation_stats,
                                 )
                             )
+                    conversation_stats = ui.label().classes('admin-stats')
                     with ui.scroll_area().classes('w-full h-full border'):
                         with ui.table(
-                            columns=_conv_cols(app.logger, default_lang, app.app_settings.enable_questionnaire),
-                            rows=await get_all_conversations(
-                                start_date=start_date.replace(hour=0, minute=0, second=0, tzinfo=timezone.utc),
-                                end_date=current_date.replace(hour=23, minute=59, second=59, tzinfo=timezone.utc),
+                            columns=keyset_columns(
+                                _conv_cols(app.logger, default_lang, app.app_settings.enable_questionnaire),
+                                'start_ts',
                             ),
-                            pagination=ROWS_PER_PAGE,
+                            rows=[],
                         ).classes('w-full') as conversation_table:
                             conversation_table.add_slot(
                                 'header',
@@ -359,10 +375,16 @@ async def _admin_page(request: Request) -> None:
                                     </q-tr>
                             ''')
                             conversation_table.on('download', js_handler='downloadConvData')
-                            conversation_table.on('delete', lambda e: del_conversation(e, conversation_table))
+                            conversation_table.on('delete', lambda e: del_conversation(e, conversation_view))
+                        conversation_view = KeysetTable(conversation_table, sort_by='start_ts', rows_per_page=ROWS_PER_PAGE)
+                        await conversation_view.set_source(ConversationsPageSource(
+                            start_date=start_date_replaced,
+                            end_date=end_date_replaced,
+                        ))
+                        await update_conversation_stats(conversation_stats, conversation_view.source)
                     ui.button(
                         text=TKey.A_DOWNLOAD_ALL(app.logger, default_lang),
-                        on_click=lambda _: download_all_conversations(conversation_table, start_calendar, end_calendar),
+                        on_click=lambda _: download_all_conversations(conversation_view, start_calendar, end_calendar),
                     )
 
                 # =================================================== TRANSCRIBE ANALYSIS
@@ -396,7 +418,9 @@ async def _admin_page(request: Request) -> None:
                                     start_date_str=aa_start_calendar.value,
                                     end_date_str=aa_end_calendar.value,
                                     languages=aa_lang_selector.value,
-                                    audio_analysis_table=audio_analysis_table,
+                                    audio_analysis_table=audio_analysis_view,
+                                    stats_label=audio_analysis_stats,
+                                    groups_table=audio_analysis_groups,
                                 ),
                             )
                             ui.button(
@@ -404,20 +428,24 @@ async def _admin_page(request: Request) -> None:
                                 on_click=lambda _: clear_filter_audio_analysis(
                                     start_date=datetime_to_q_date(start_date_replaced),
                                     end_date=datetime_to_q_date(end_date_replaced),
-                                    audio_analysis_table=audio_analysis_table,
+                                    audio_analysis_table=audio_analysis_view,
                                     start_date_calendar=aa_start_calendar,
                                     end_date_calendar=aa_end_calendar,
                                     language_input=aa_lang_selector,
+                                    stats_label=audio_analysis_stats,
+                                    groups_table=audio_analysis_groups,
                                 )
                             )
+                    audio_analysis_stats = ui.label().classes('admin-stats')
+                    audio_analysis_groups = ui.table(
+                        columns=_transcribe_groups_cols(app.logger, default_lang),
+                        rows=[],
+                        row_key='key',
+                    ).props('dense flat hide-pagination :rows-per-page-options="[0]"').classes('w-full admin-stats')
                     with ui.scroll_area().classes('w-full h-full border'):
                         with ui.table(
-                            columns=_transcribe_analytic_cols(app.logger, default_lang),
-                            rows=await get_edited_texts(
-                                start_date=start_date.replace(hour=0, minute=0, second=0, tzinfo=timezone.utc),
-                                end_date=current_date.replace(hour=23, minute=59, second=59, tzinfo=timezone.utc),
-                            ),
-                            pagination=ROWS_PER_PAGE,
+                            columns=keyset_columns(_transcribe_analytic_cols(app.logger, default_lang), 'create_date'),
+                            rows=[],
                         ).classes('w-full wrap-table') as audio_analysis_table:
                             audio_analysis_table.add_slot(
                                 'header',
@@ -449,9 +477,15 @@ async def _admin_page(request: Request) -> None:
                                     </q-tr>
                             ''')
                             audio_analysis_table.on('download', js_handler='downloadConvData')
+                        audio_analysis_view = KeysetTable(audio_analysis_table, sort_by='create_date', rows_per_page=ROWS_PER_PAGE)
+                        await audio_analysis_view.set_source(EditedTextsPageSource(
+                            start_date=start_date_replaced,
+                            end_date=end_date_replaced,
+                        ))
+                        await update_text_stats(audio_analysis_stats, audio_analysis_view.source, audio_analysis_groups)
                     ui.button(
                         text=TKey.A_DOWNLOAD_ALL(app.logger, default_lang),
-                        on_click=lambda _: download_all_audio_cases(audio_analysis_table, start_calendar, end_calendar),
+                        on_click=lambda _: download_all_audio_cases(audio_analysis_view, start_calendar, end_calendar),
                     )
 
 
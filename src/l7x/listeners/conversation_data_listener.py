@@ -2,32 +2,41 @@
 import csv
 import io
 import zipfile
+from collections import defaultdict
 from collections.abc import Sequence
 from datetime import datetime
 from typing import Final
+from uuid import UUID
 
 import openpyxl
 from openpyxl.styles import Alignment, Border, PatternFill, Side
 from starlette.requests import Request
 from starlette.responses import StreamingResponse
 
+from l7x.configs.constants import EXPORT_MAX_STALENESS_SEC
 from l7x.configs.settings import AppSettings
-from l7x.db import ConversationModel
+from l7x.db.projections import (
+    ConversationListRecord,
+    ConversationTextRecord,
+    fetch_conversations_by_uuids,
+    fetch_conversations_texts,
+)
 from l7x.utils.datetime_utils import format_datetime_to_iso
 from l7x.utils.db_utils import check_session_with_request, check_superuser_state
 from l7x.utils.fastapi_utils import AppFastAPI
+from l7x.utils.read_replica_utils import replica_reads
 from l7x.types.localization import TKey
 from l7x.utils.lang_utils import localize as _
 
 #####################################################################################################
 
-def _get_common_values(conversation: ConversationModel, app_settings: AppSettings):
+def _get_common_values(conversation: ConversationListRecord, app_settings: AppSettings):
     values = [
         str(conversation.primary_uuid),
         format_datetime_to_iso(conversation.start_ts),
         format_datetime_to_iso(conversation.end_ts) if conversation.end_ts is not None else '',
-        conversation.session_id.user_id.department_id.name,
-        conversation.session_id.user_id.full_name,
+        conversation.department_name,
+        conversation.user_full_name,
         conversation.selected_lang,
     ]
     if app_settings.enable_questionnaire:
@@ -65,10 +74,15 @@ def _get_headers(app_settings: AppSettings) -> Sequence[str]:
 #####################################################################################################
 
 async def prepare_conversation_rows(
-    conversations: Sequence[ConversationModel],
+    conversations: Sequence[ConversationListRecord],
+    texts: Sequence[ConversationTextRecord],
     is_download_audio: bool,
     app_settings: AppSettings,
 ):
+    conversation_texts: Final[dict[UUID, list[ConversationTextRecord]]] = defaultdict(list)
+    for text in texts:
+        conversation_texts[text.conversation_id].append(text)
+
     conversation_rows = []
     audio_for_zip = []
 
@@ -83,13 +97,12 @@ async def prepare_conversation_rows(
         )
 
         conversation_rows.append(conv_record)
-        for text in conversation.texts:
-            audio_obj = text.audio_id
+        for text in conversation_texts[conversation.primary_uuid]:
             text_data_record = common_values.copy()
             text_data_record.extend(
                 (
                     str(text.primary_uuid),
-                    str(audio_obj.primary_uuid) if audio_obj is not None else '-',
+                    str(text.audio_id) if text.audio_id is not None else '-',
                     text.type,
                     format_datetime_to_iso(text.create_ts),
                     text.recognized_text,
@@ -101,9 +114,9 @@ async def prepare_conversation_rows(
                 )
             )
             conversation_rows.append(text_data_record)
-            audio_path = f'wav/{conversation.primary_uuid}/{audio_obj.primary_uuid}.wav' if audio_obj is not None else None
-            if audio_path is not None and is_download_audio:
-                audio_for_zip.append((audio_path, io.BytesIO(text.audio_id.audio_raw)))
+            audio_path = f'wav/{conversation.primary_uuid}/{text.audio_id}.wav' if text.audio_id is not None else None
+            if audio_path is not None and is_download_audio and text.audio_raw is not None:
+                audio_for_zip.append((audio_path, io.BytesIO(text.audio_raw)))
 
     return conversation_rows, audio_for_zip
 
@@ -138,18 +151,15 @@ async def _conversation_data_page(request: Request) -> StreamingResponse:
     else:
         primary_uuid_list = []
 
-    conversations: Sequence[ConversationModel] = await ConversationModel.objects.select_related(
-        'session_id__user_id__department_id',
-    ).prefetch_related(
-        'texts__audio_id',
-    ).order_by(
-        ['start_ts', 'texts__create_ts'],
-    ).filter(
-        primary_uuid__in=primary_uuid_list
-    ).all()
+    async with replica_reads(EXPORT_MAX_STALENESS_SEC):
+        conversations = await fetch_conversations_by_uuids(primary_uuid_list)
+        texts = await fetch_conversations_texts(
+            [conversation.primary_uuid for conversation in conversations],
+            with_audio=is_download_audio,
+        )
 
     if conversations:
-        conversation_rows, audio_for_zip = await prepare_conversation_rows(conversations, is_download_audio, app_settings)
+        conversation_rows, audio_for_zip = await prepare_conversation_rows(conversations, texts, is_download_audio, app_settings)
         report_buffer = io.BytesIO()
         if file_extension == 'xlsx':
             work_book = openpyxl.Workbook()
@@ -11,7 +11,7 @@ from l7x.configs.settings import AppSettings
 from l7x.db import ConversationModel, SessionModel
 from l7x.types.language import LKey
 from l7x.types.localization import TKey
-from l7x.utils.datetime_utils import now_utc
+from l7x.utils.db_utils import close_sessions
 from l7x.utils.fastapi_utils import AppFastAPI
 from l7x.utils.nicegui_utils import GuiProcessor, prepare_session_storage
 from l7x.utils.pages import (
@@ -55,8 +55,7 @@ async def _check_active_session(session: SessionModel):
 #####################################################################################################
 
 async def close_not_active_sessions(sessions: list[SessionModel], pop_up: Dialog = None) -> None:
-    for session in sessions:
-        await session.update(logout_ts=now_utc())
+    await close_sessions(session.primary_uuid for session in sessions)
     if pop_up is not None:
         pop_up.close()
 
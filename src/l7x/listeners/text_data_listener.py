@@ -11,14 +11,16 @@ from openpyxl.styles import Alignment, Border, PatternFill, Side
 from starlette.requests import Request
 from starlette.responses import StreamingResponse
 
-from l7x.db import TextModel
+from l7x.configs.constants import EXPORT_MAX_STALENESS_SEC
+from l7x.db.projections import ConversationTextRecord, fetch_texts_by_uuids
 from l7x.utils.datetime_utils import format_datetime_to_iso
 from l7x.utils.db_utils import check_session_with_request, check_superuser_state
 from l7x.utils.fastapi_utils import AppFastAPI
+from l7x.utils.read_replica_utils import replica_reads
 
 #####################################################################################################
 
-async def prepare_conversation_rows(texts: Sequence[TextModel]):
+async def prepare_conversation_rows(texts: Sequence[ConversationTextRecord]):
     text_rows = []
     audio_for_zip = []
 
@@ -27,19 +29,18 @@ async def prepare_conversation_rows(texts: Sequence[TextModel]):
     ]
     text_rows.append(headers)
     for text in texts:
-        audio_obj = text.audio_id
         text_data_record = [
             str(text.primary_uuid),
-            str(audio_obj.primary_uuid),
+            str(text.audio_id),
             format_datetime_to_iso(text.create_ts),
             text.lang_from,
             text.recognized_text,
             text.fixed_text,
         ]
         text_rows.append(text_data_record)
-        audio_path = f'wav/{audio_obj.primary_uuid}.wav' if audio_obj is not None else None
-        if audio_path is not None:
-            audio_for_zip.append((audio_path, io.BytesIO(text.audio_id.audio_raw)))
+        audio_path = f'wav/{text.audio_id}.wav' if text.audio_id is not None else None
+        if audio_path is not None and text.audio_raw is not None:
+            audio_for_zip.append((audio_path, io.BytesIO(text.audio_raw)))
 
     return text_rows, audio_for_zip
 
@@ -74,13 +75,8 @@ async def _texts_data_page(request: Request) -> StreamingResponse:
     else:
         primary_uuid_list = []
 
-    texts: Sequence[TextModel] = await TextModel.objects.select_related(
-        'audio_id',
-    ).order_by(
-        ['create_ts'],
-    ).filter(
-        primary_uuid__in=primary_uuid_list,
-    ).all()
+    async with replica_reads(EXPORT_MAX_STALENESS_SEC):
+        texts = await fetch_texts_by_uuids(primary_uuid_list, with_audio=True)
 
     if texts:
         text_rows, audio_for_zip = await prepare_conversation_rows(texts)
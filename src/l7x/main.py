@@ -14,6 +14,7 @@ from ssl import OPENSSL_VERSION
 from sys import exit as _sys_exit, modules
 from time import sleep
 from typing import Any, Final
+from uuid import uuid4
 
 from cpuinfo import get_cpu_info
 from hypercorn.config import Config as _HypercornConfig, Sockets
@@ -27,11 +28,11 @@ from l7x.commands.metrics_context_creator import (
     creator_local_tokens_cmd_context,
 )
 from l7x.configs.settings import AppSettings, create_app_settings
-from l7x.db.db_utils import check_default_superuser
+from l7x.db.db_utils import run_startup_tasks
 from l7x.sessions_check_worker import SessionWorkerParams, run_session_check_worker
 from l7x.types.errors import ShutdownException
-from l7x.utils.alembic_utils import upgrade_db_to_head
 from l7x.utils.cmd_manager_utils import CmdManagerImpl
+from l7x.utils.db_version_utils import upgrade_db_to_head_if_needed
 from l7x.utils.loop_utils import (
     AbstractEventLoop,
     AfterAllStartedFunc,
@@ -117,15 +118,15 @@ async def _run_worker_processes(
         )
         descriptions.append(web_work_desc)
 
-    # session_checker_work_desc = WorkerDescription(
-    #     func=run_session_check_worker,
-    #     name='session checker_worker',
-    #     func_params=SessionWorkerParams(
-    #         app_settings=app_settings,
-    #     ),
-    #     worker_type=WorkerType.PROCESS,
-    # )
-    # descriptions.append(session_checker_work_desc)
+    session_checker_work_desc = WorkerDescription(
+        func=run_session_check_worker,
+        name='session_checker_worker',
+        func_params=SessionWorkerParams(
+            app_settings=app_settings,
+        ),
+        worker_type=WorkerType.PROCESS,
+    )
+    descriptions.append(session_checker_work_desc)
 
     def _func_after_all_started(local_logger: Logger) -> None:
         if func_after_all_started is not None:
@@ -306,9 +307,10 @@ def run(
             signal(SIGINT, shutdown)
             signal(SIGTERM, shutdown)
 
-            upgrade_db_to_head(create_app_settings(include_db_admin_credentials=True))
-            asyncio.run(check_default_superuser(app_settings, logger))
-            # asyncio.run(update_db_data(app_settings, logger))
+            upgrade_db_to_head_if_needed(create_app_settings(include_db_admin_credentials=True), logger)
+            # the partitions are checked on every start, the deployment tasks are run once per deployment
+            start_id = uuid4().hex
+            asyncio.run(run_startup_tasks(app_settings, logger, app_settings.deployment_id or start_id, start_id))
 
             process = ctx.Process(
                 target=_run_server_main_process,
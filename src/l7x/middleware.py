@@ -7,7 +7,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
 
-from l7x.db import SessionModel
+from l7x.utils.db_utils import get_session_state
 
 #####################################################################################################
 
@@ -30,9 +30,9 @@ class AuthMiddleware(BaseHTTPMiddleware, _MiddlewareClass):
                 else:
                     RedirectResponse(self.login_page)
 
-            session = await SessionModel.objects.get_or_none(primary_uuid=session_uuid)
-            if session is not None:
-                if session.logout_ts is None:
+            session_state = await get_session_state(session_uuid)
+            if session_state is not None:
+                if not session_state.is_closed:
                     if request.url.path == self.gui_page or request.url.path == self.admin_page:
                         return await call_next(request)
                     else:
@@ -60,12 +60,12 @@ class AdminMiddleware(BaseHTTPMiddleware, _MiddlewareClass):
             session_uuid = request.cookies.get('session_uuid')
             if session_uuid is None:
                 return self.error_response
-            session = await SessionModel.objects.select_related('user_id').get_or_none(primary_uuid=session_uuid)
-            if session is not None:
-                if session.logout_ts is not None:
+            session_state = await get_session_state(session_uuid)
+            if session_state is not None:
+                if session_state.is_closed:
                     self.error_response.delete_cookie('session_uuid')
                     return self.error_response
-                if not session.user_id.is_superuser:
+                if not session_state.is_superuser:
                     raise self.exception
 
         return await call_next(request)
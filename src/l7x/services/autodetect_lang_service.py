@@ -1,16 +1,20 @@
 #####################################################################################################
 
 from abc import ABC, abstractmethod
+from asyncio import Lock
 from http import HTTPStatus
 from logging import Logger
 from typing import Final
-from urllib.parse import urljoin
 
 from aiohttp import ClientSession
 
 from l7x.configs.settings import AppSettings
+from l7x.db import TextModel
 from l7x.services.base import BaseService
+from l7x.services.langs_service import LangsService
 from l7x.services.translation_service import JsonPayload
+from l7x.utils.backend_pool_utils import BackendPool
+from l7x.utils.lang_id_utils import NgramLangIdentifier
 from l7x.utils.mapping_utils import find_value_by_keys_sequence
 from l7x.utils.orjson_utils import orjson_loads
 
@@ -34,9 +38,9 @@ class AutodetectLanguageService(BaseService, ABC):
 class PrivateAutodetectLanguageService(AutodetectLanguageService):
     #####################################################################################################
 
-    def __init__(self, app_settings: AppSettings, aiohttp_client: ClientSession, logger: Logger) -> None:
+    def __init__(self, app_settings: AppSettings, aiohttp_client: ClientSession, logger: Logger, backend_pool: BackendPool) -> None:
         super().__init__(aiohttp_client, logger)
-        self._url: Final = urljoin(app_settings.translate_api_url, 'api/detect-language')
+        self._backend_pool: Final = backend_pool
 
     #####################################################################################################
 
@@ -45,12 +49,101 @@ class PrivateAutodetectLanguageService(AutodetectLanguageService):
             'q': text,
         }
 
-        detected_lang_resp: Final = await self._aiohttp_client.post(url=self._url, data=JsonPayload(query))
-        if detected_lang_resp.status != HTTPStatus.OK:
-            self._logger.warning(f'Return invalid status for api/detect-language [{detected_lang_resp.status}]')
-            return ''
+        async with self._backend_pool.acquire() as backend:
+            detected_lang_resp: Final = await self._aiohttp_client.post(url=backend.url('api/detect-language'), data=JsonPayload(query))
+            backend.track_status(detected_lang_resp.status)
+            if detected_lang_resp.status != HTTPStatus.OK:
+                self._logger.warning(f'Return invalid status for api/detect-language [{detected_lang_resp.status}]')
+                return ''
 
-        detected_lang_json: Final = await detected_lang_resp.json(loads=orjson_loads)
+            detected_lang_json: Final = await detected_lang_resp.json(loads=orjson_loads)
         return find_value_by_keys_sequence(detected_lang_json, 'result', 0, 0, 'language_code', default='', logger=self._logger)
 
 #####################################################################################################
+
+class LocalAutodetectLanguageService(AutodetectLanguageService):
+    """
+    In-process n-gram language identification among the languages of the langs service.
+
+    The model is trained on the recognized texts of the database, texts identified with low confidence
+    are sent to the remote service and its answers are learned.
+    """
+
+    #####################################################################################################
+
+    def __init__(
+        self,
+        app_settings: AppSettings,
+        aiohttp_client: ClientSession,
+        logger: Logger,
+        langs_service: LangsService,
+        remote_service: AutodetectLanguageService,
+    ) -> None:
+        super().__init__(aiohttp_client, logger)
+        self._langs_service: Final = langs_service
+        self._remote_service: Final = remote_service
+        self._min_confidence: Final = app_settings.lang_id_min_confidence
+        self._train_samples_per_lang: Final = app_settings.lang_id_train_samples_per_lang
+        self._identifier: Final = NgramLangIdentifier()
+        self._load_lock: Final = Lock()
+        self._is_loaded = False
+        self._local_answers = 0
+        self._remote_answers = 0
+
+    #####################################################################################################
+
+    async def detect_language(self, *, text: str) -> str:
+        if not self._is_loaded:
+            await self.load_from_db()
+
+        langs: Final = await self._langs_service.get_lang_options()
+        guess: Final = self._identifier.identify(text, langs)
+        if guess is not None and guess.confidence >= self._min_confidence:
+            self._local_answers += 1
+            return guess.lang
+
+        self._remote_answers += 1
+        detected_lang: Final = await self._remote_service.detect_language(text=text)
+        # the remote answers are not verified: only the offered langs are learned and the counts are pruned
+        if detected_lang in langs:
+            self._identifier.add_sample(lang=detected_lang, text=text)
+        return detected_lang
+
+    #####################################################################################################
+
+    async def load_from_db(self, /) -> None:
+        async with self._load_lock:
+            if self._is_loaded:
+                return
+            if self._train_samples_per_lang <= 0:
+                self._is_loaded = True
+                return
+
+            langs: Final = await self._langs_service.get_lang_options()
+            for lang in langs:
+                texts = await TextModel.objects.filter(
+                    lang_from=lang,
+                ).order_by(
+                    '-create_ts',
+                ).limit(
+                    self._train_samples_per_lang,
+                ).values_list(
+                    fields=['recognized_text'],
+                    flatten=True,
+                )
+                for text in texts:
+                    self._identifier.add_sample(lang=lang, text=text)
+
+            self._identifier.build()
+            # the langs are not known until the langs service answers, so try again with the next text
+            self._is_loaded = bool(langs)
+            self._logger.info(f'Language identifier trained for {len(self._identifier.langs)} languages')
+
+    #####################################################################################################
+
+    @property
+    def local_answers_rate(self, /) -> float:
+        answers: Final = self._local_answers + self._remote_answers
+        return self._local_answers / answers if answers else 0.0
+
+#####################################################################################################
@@ -4,24 +4,22 @@ from abc import ABC, abstractmethod
 from collections.abc import Mapping, Sequence
 from http import HTTPStatus
 from logging import Logger
-from time import time
-from types import MappingProxyType
 from typing import Final
-from urllib.parse import urljoin
 
 from aiohttp import ClientSession
 
-from l7x.configs.constants import TRANSLATE_API_LANGS_CACHE_EXPIRE_WHEN_LIST_EMPTY_SEC
 from l7x.configs.settings import AppSettings
 from l7x.services.base import BaseService
-from l7x.types.lang_services import EMPTY_LANGS, LangInfo, LanguageDetail
+from l7x.types.lang_services import LangInfo, LanguageDetail
+from l7x.utils.backend_pool_utils import BackendPool
+from l7x.utils.lang_catalog_utils import LangCatalog
 from l7x.utils.orjson_utils import orjson_loads
 
 #####################################################################################################
 
 class InvalidRequestError(Exception):
     def __init__(self, status: int) -> None:
-        super().__init__()
+        super().__init__(status)
         self.status: Final = status
 
 #####################################################################################################
@@ -30,34 +28,36 @@ class RecognizerLangsService(BaseService, ABC):
     #####################################################################################################
 
     def __init__(self, app_settings: AppSettings, aiohttp_client: ClientSession, logger: Logger) -> None:
-        self._translate_api_langs_cache_expire_sec: Final = app_settings.translate_api_langs_cache_expire_sec
         self._aiohttp_client: Final = aiohttp_client
         self._logger: Final = logger
-        self._langs_options: Mapping[str, LanguageDetail] = EMPTY_LANGS
-        self._next_update_ts = -1.0
+        self._catalog: Final = LangCatalog(
+            'recognizer_langs',
+            self._get_languages,
+            expire_sec=app_settings.translate_api_langs_cache_expire_sec,
+            shared_dir=app_settings.langs_catalog_dir,
+            logger=logger,
+        )
+
+    #####################################################################################################
+
+    @property
+    def catalog_version(self, /) -> int:
+        return self._catalog.version
+
+    #####################################################################################################
+
+    def start(self, /) -> None:
+        self._catalog.start()
+
+    #####################################################################################################
+
+    async def stop(self, /) -> None:
+        await self._catalog.stop()
 
     #####################################################################################################
 
     async def get_recognizer_lang_options(self, /) -> Mapping[str, LanguageDetail]:
-        cur_ts = time()
-        if self._next_update_ts <= cur_ts:
-            self._next_update_ts = cur_ts + float(self._translate_api_langs_cache_expire_sec)
-
-            try:
-                langs_options = await self._get_languages()
-            except InvalidRequestError as exc:
-                self._logger.warning(f'Return invalid status for get-languages: {exc.status}')
-                self._langs_options = EMPTY_LANGS
-                self._next_update_ts = cur_ts + min(self._translate_api_langs_cache_expire_sec, 10)
-                return self._langs_options
-
-            if not langs_options:
-                self._langs_options = EMPTY_LANGS
-                self._next_update_ts = cur_ts + TRANSLATE_API_LANGS_CACHE_EXPIRE_WHEN_LIST_EMPTY_SEC
-            else:
-                self._langs_options = MappingProxyType(langs_options)
-
-        return self._langs_options
+        return await self._catalog.get_langs()
 
     #####################################################################################################
 
@@ -70,9 +70,9 @@ class RecognizerLangsService(BaseService, ABC):
 class PrivateRecognizerLangsService(RecognizerLangsService):
     #####################################################################################################
 
-    def __init__(self, app_settings: AppSettings, aiohttp_client: ClientSession, logger: Logger) -> None:
+    def __init__(self, app_settings: AppSettings, aiohttp_client: ClientSession, logger: Logger, backend_pool: BackendPool) -> None:
         super().__init__(app_settings, aiohttp_client, logger)
-        self._url: Final = urljoin(app_settings.translate_api_url, 'api/get-speech-to-text-languages')
+        self._backend_pool: Final = backend_pool
 
     #####################################################################################################
 
@@ -86,12 +86,14 @@ class PrivateRecognizerLangsService(RecognizerLangsService):
                 {'codeName': 'Russian', 'code_alpha_1': 'ru', 'rtl': False}
             ]
         else:
-            get_languages_resp = await self._aiohttp_client.get(self._url)
+            async with self._backend_pool.acquire() as backend:
+                get_languages_resp = await self._aiohttp_client.get(backend.url('api/get-speech-to-text-languages'))
+                backend.track_status(get_languages_resp.status)
 
-            if get_languages_resp.status != HTTPStatus.OK:
-                raise InvalidRequestError(status=get_languages_resp.status)
+                if get_languages_resp.status != HTTPStatus.OK:
+                    raise InvalidRequestError(status=get_languages_resp.status)
 
-            languages: Sequence[LangInfo] = await get_languages_resp.json(loads=orjson_loads)
+                languages: Sequence[LangInfo] = await get_languages_resp.json(loads=orjson_loads)
 
         if not languages:
             return {}
@@ -4,12 +4,12 @@ from abc import abstractmethod
 from http import HTTPStatus
 from logging import Logger
 from typing import Any, Final
-from urllib.parse import urljoin
 
 from aiohttp import BytesPayload, ClientSession, FormData
 
 from l7x.configs.settings import AppSettings
 from l7x.services.base import BaseService
+from l7x.utils.backend_pool_utils import BackendPool
 from l7x.utils.orjson_utils import orjson_dumps
 
 #####################################################################################################
@@ -40,9 +40,9 @@ class RecognizeService(BaseService):
 class PrivateRecognizeService(RecognizeService):
     #####################################################################################################
 
-    def __init__(self, app_settings: AppSettings, aiohttp_client: ClientSession, logger: Logger) -> None:
+    def __init__(self, app_settings: AppSettings, aiohttp_client: ClientSession, logger: Logger, backend_pool: BackendPool) -> None:
         super().__init__(aiohttp_client, logger)
-        self._url: Final = urljoin(app_settings.translate_api_url, 'api/speech-to-text')
+        self._backend_pool: Final = backend_pool
 
     #####################################################################################################
 
@@ -53,17 +53,19 @@ class PrivateRecognizeService(RecognizeService):
         data.add_field('file', wav, filename=file_name, content_type=mime_type)
         data.add_field('denoise', 'false')
         return f"Placeholder value {random.randint(1, 500)}"
-        # recognize_resp = await self._aiohttp_client.post(
-        #     url=self._url,
-        #     data=data,
-        # )
+        # async with self._backend_pool.acquire() as backend:
+        #     recognize_resp = await self._aiohttp_client.post(
+        #         url=backend.url('api/speech-to-text'),
+        #         data=data,
+        #     )
+        #     backend.track_status(recognize_resp.status)
         #
-        # if recognize_resp.status == HTTPStatus.OK:
-        #     recognize_json = await recognize_resp.json(loads=orjson_loads)
-        #     recognized_text = recognize_json.get('result', '')
-        # else:
-        #     self._logger.warning(f'Return invalid status for api/speech-to-text [{recognize_resp.status}]')
-        #     recognized_text = ''
+        #     if recognize_resp.status == HTTPStatus.OK:
+        #         recognize_json = await recognize_resp.json(loads=orjson_loads)
+        #         recognized_text = recognize_json.get('result', '')
+        #     else:
+        #         self._logger.warning(f'Return invalid status for api/speech-to-text [{recognize_resp.status}]')
+        #         recognized_text = ''
         #
         # return recognized_text
 
@@ -0,0 +1,104 @@
+#####################################################################################################
+
+from asyncio import Semaphore, gather
+from collections.abc import Mapping
+from logging import Logger
+from typing import Final
+
+from aiohttp import ClientSession
+
+from l7x.services.translation_service import TranslationService
+from l7x.utils.segmentation_utils import is_translatable, join_sentences, split_sentences
+
+#####################################################################################################
+
+_RecentKey = tuple[str, str, str]
+
+#####################################################################################################
+
+class SegmentedTranslationService(TranslationService):
+    """
+    Translates a long text (from min_segmented_chars) sentence by sentence with bounded parallelism,
+    a shorter text is translated as a whole with its context.
+
+    Sentence translations of the last results are kept, so retranslation of an edited text
+    sends to the backend only the sentences which were changed.
+    """
+
+    #####################################################################################################
+
+    def __init__(
+        self,
+        aiohttp_client: ClientSession,
+        logger: Logger,
+        translation_service: TranslationService,
+        max_parallel_segments: int,
+        min_segmented_chars: int,
+        max_recent_results: int = 1000,
+    ) -> None:
+        super().__init__(aiohttp_client, logger)
+        self._translation_service: Final = translation_service
+        self._max_parallel_segments: Final = max(max_parallel_segments, 1)
+        self._min_segmented_chars: Final = min_segmented_chars
+        self._max_recent_results: Final = max_recent_results
+        self._recent: Final[dict[_RecentKey, Mapping[str, str]]] = {}
+
+    #####################################################################################################
+
+    async def translate(self, *, text: str, target_lang: str, source_lang: str) -> str:
+        return await self._translate_segments(text=text, target_lang=target_lang, source_lang=source_lang, reuse={})
+
+    #####################################################################################################
+
+    async def retranslate(self, *, text: str, previous_text: str, target_lang: str, source_lang: str) -> str:
+        """Translate edited text, reusing the unchanged sentences of the previous_text translation."""
+        reuse: Final = self._recent.get((source_lang, target_lang, previous_text), {})
+        return await self._translate_segments(text=text, target_lang=target_lang, source_lang=source_lang, reuse=reuse)
+
+    #####################################################################################################
+
+    async def _translate_segments(
+        self,
+        *,
+        text: str,
+        target_lang: str,
+        source_lang: str,
+        reuse: Mapping[str, str],
+    ) -> str:
+        segments: Final = split_sentences(text, self._min_segmented_chars)
+        translated: Final[dict[str, str]] = {
+            sentence: reuse[sentence] for sentence, _ in segments if sentence in reuse
+        }
+        for_translate: Final = tuple({
+            sentence: None for sentence, _ in segments if sentence not in translated and is_translatable(sentence)
+        })
+
+        semaphore: Final = Semaphore(self._max_parallel_segments)
+
+        async def _translate_sentence(sentence: str) -> str:
+            async with semaphore:
+                return await self._translation_service.translate(text=sentence, target_lang=target_lang, source_lang=source_lang)
+
+        if len(for_translate) == 1:
+            translated[for_translate[0]] = await _translate_sentence(for_translate[0])
+        elif for_translate:
+            translated.update(zip(for_translate, await gather(*(_translate_sentence(sentence) for sentence in for_translate))))
+
+        # as for the whole text: a failed sentence (empty translation) fails the translation and is not reused later
+        if not all(translated.get(sentence) for sentence in for_translate):
+            return ''
+        self._remember((source_lang, target_lang, text), translated)
+
+        return join_sentences([translated.get(sentence, sentence) for sentence, _ in segments], segments)
+
+    #####################################################################################################
+
+    def _remember(self, key: _RecentKey, translated: Mapping[str, str]) -> None:
+        if self._max_recent_results <= 0:
+            return
+        self._recent.pop(key, None)
+        self._recent[key] = translated
+        if len(self._recent) > self._max_recent_results:
+            self._recent.pop(next(iter(self._recent)))
+
+#####################################################################################################
@@ -0,0 +1,196 @@
+#####################################################################################################
+
+from collections.abc import Mapping
+from logging import Logger
+from re import compile as _re_compile
+from typing import Any, Final
+
+from aiohttp import ClientSession
+
+from l7x.db import TextModel
+from l7x.services.translation_service import TranslationService
+from l7x.utils.segmentation_utils import split_sentences
+
+#####################################################################################################
+
+_SPACES_PATTERN: Final = _re_compile(r'\s+')
+_EDGE_PUNCTUATION: Final = ' ,;:¡¿"\'«»“”()-—'
+_TERMINAL_MARKS_PATTERN: Final = _re_compile(r'[.!?…]+$')
+
+_REPORT_EVERY_LOOKUPS: Final = 1000
+
+#####################################################################################################
+
+def normalize_segment(text: str) -> str:
+    """
+    Key for fuzzy matches: case, repeated spaces, edge quotes and repeated terminal marks are ignored.
+
+    A question and an exclamation keep their mark, a statement is the same with or without its period.
+    """
+    segment: Final = _SPACES_PATTERN.sub(' ', text).strip(_EDGE_PUNCTUATION)
+    marks_match: Final = _TERMINAL_MARKS_PATTERN.search(segment)
+    marks: Final = marks_match.group() if marks_match is not None else ''
+    body: Final = segment[:len(segment) - len(marks)].strip(_EDGE_PUNCTUATION).casefold()
+    if '?' in marks:
+        return f'{body}?'
+    if '!' in marks:
+        return f'{body}!'
+    return body
+
+#####################################################################################################
+
+_MemoryKey = tuple[str, str, str]
+
+#####################################################################################################
+
+class TranslationMemoryService(TranslationService):
+    """
+    Local (source segment, lang pair) -> translation store in front of the translation backend.
+
+    Warmed up from the operator corrected texts, every new backend translation is added too.
+    """
+
+    #####################################################################################################
+
+    def __init__(
+        self,
+        aiohttp_client: ClientSession,
+        logger: Logger,
+        translation_service: TranslationService,
+        max_entries: int,
+    ) -> None:
+        super().__init__(aiohttp_client, logger)
+        self._translation_service: Final = translation_service
+        self._max_entries: Final = max_entries
+        self._exact: Final[dict[_MemoryKey, str]] = {}
+        self._normalized: Final[dict[_MemoryKey, str]] = {}
+        self._exact_hits = 0
+        self._fuzzy_hits = 0
+        self._misses = 0
+
+    #####################################################################################################
+
+    @property
+    def is_enabled(self, /) -> bool:
+        return self._max_entries > 0
+
+    #####################################################################################################
+
+    def add(self, *, text: str, translated_text: str, source_lang: str, target_lang: str) -> None:
+        if not self.is_enabled or not text.strip() or not translated_text or not source_lang or not target_lang:
+            return
+        self._put(self._exact, (source_lang, target_lang, text), translated_text)
+        self._put(self._normalized, (source_lang, target_lang, normalize_segment(text)), translated_text)
+
+    #####################################################################################################
+
+    def add_segments(self, *, text: str, translated_text: str, source_lang: str, target_lang: str) -> None:
+        """Add the sentence pairs of a whole text, the lookups are made by sentence."""
+        sentences: Final = split_sentences(text)
+        translated_sentences: Final = split_sentences(translated_text)
+        # sentences are aligned only by their count, otherwise only the whole text is known
+        if len(sentences) > 1 and len(sentences) == len(translated_sentences):
+            for (sentence, _), (translated_sentence, _) in zip(sentences, translated_sentences):
+                self.add(text=sentence, translated_text=translated_sentence, source_lang=source_lang, target_lang=target_lang)
+        self.add(text=text, translated_text=translated_text, source_lang=source_lang, target_lang=target_lang)
+
+    #####################################################################################################
+
+    def _put(self, storage: dict[_MemoryKey, str], key: _MemoryKey, translated_text: str) -> None:
+        storage.pop(key, None)
+        storage[key] = translated_text
+        if len(storage) > self._max_entries:
+            # the least recently used entry is the first one, a hit moves the entry to the end
+            storage.pop(next(iter(storage)))
+
+    #####################################################################################################
+
+    @staticmethod
+    def _get(storage: dict[_MemoryKey, str], key: _MemoryKey) -> str | None:
+        translated_text: Final = storage.pop(key, None)
+        if translated_text is not None:
+            storage[key] = translated_text
+        return translated_text
+
+    #####################################################################################################
+
+    def lookup(self, *, text: str, source_lang: str, target_lang: str) -> str | None:
+        if not self.is_enabled or not source_lang:
+            return None
+
+        # both entries of the segment are used, so they are evicted together
+        normalized_translated_text: Final = self._get(self._normalized, (source_lang, target_lang, normalize_segment(text)))
+        translated_text = self._get(self._exact, (source_lang, target_lang, text))
+        if translated_text is not None:
+            self._exact_hits += 1
+        elif normalized_translated_text is not None:
+            translated_text = normalized_translated_text
+            self._fuzzy_hits += 1
+        else:
+            self._misses += 1
+
+        if self.lookups % _REPORT_EVERY_LOOKUPS == 0:
+            self._logger.info(f'Translation memory stats: {self.stats()}')
+
+        return translated_text
+
+    #####################################################################################################
+
+    async def translate(self, *, text: str, target_lang: str, source_lang: str) -> str:
+        translated_text = self.lookup(text=text, source_lang=source_lang, target_lang=target_lang)
+        if translated_text is not None:
+            return translated_text
+
+        translated_text = await self._translation_service.translate(text=text, target_lang=target_lang, source_lang=source_lang)
+        self.add(text=text, translated_text=translated_text, source_lang=source_lang, target_lang=target_lang)
+        return translated_text
+
+    #####################################################################################################
+
+    async def load_from_db(self, /) -> None:
+        """Fill the memory with the latest texts corrected by operators."""
+        if not self.is_enabled:
+            return
+
+        corrected_texts: Final = await TextModel.objects.filter(
+            edit_ts__isnull=False,
+            fixed_text__isnull=False,
+        ).order_by(
+            '-edit_ts',
+        ).limit(
+            self._max_entries,
+        ).values(
+            fields=['lang_from', 'lang_to', 'fixed_text', 'translated_text'],
+        )
+
+        # oldest first, so the most recent corrections win and are evicted last
+        for corrected_text in reversed(corrected_texts):
+            self.add_segments(
+                text=corrected_text['fixed_text'],
+                translated_text=corrected_text['translated_text'],
+                source_lang=corrected_text['lang_from'],
+                target_lang=corrected_text['lang_to'],
+            )
+
+        self._logger.info(f'Translation memory loaded {len(self._exact)} segments')
+
+    #####################################################################################################
+
+    @property
+    def lookups(self, /) -> int:
+        return self._exact_hits + self._fuzzy_hits + self._misses
+
+    #####################################################################################################
+
+    def stats(self, /) -> Mapping[str, Any]:
+        lookups: Final = self.lookups
+        hits: Final = self._exact_hits + self._fuzzy_hits
+        return {
+            'segments': len(self._exact),
+            'lookups': lookups,
+            'exact_hits': self._exact_hits,
+            'fuzzy_hits': self._fuzzy_hits,
+            'hit_rate': hits / lookups if lookups else 0.0,
+        }
+
+#####################################################################################################
@@ -4,12 +4,12 @@ from abc import ABC, abstractmethod
 from http import HTTPStatus
 from logging import Logger
 from typing import Any, Final
-from urllib.parse import urljoin
 
 from aiohttp import BytesPayload, ClientSession
 
 from l7x.configs.settings import AppSettings
 from l7x.services.base import BaseService
+from l7x.utils.backend_pool_utils import BackendPool
 from l7x.utils.orjson_utils import orjson_dumps, orjson_loads
 
 #####################################################################################################
@@ -40,9 +40,9 @@ class TranslationService(BaseService, ABC):
 class PrivateTranslationService(TranslationService):
     #####################################################################################################
 
-    def __init__(self, app_settings: AppSettings, aiohttp_client: ClientSession, logger: Logger) -> None:
+    def __init__(self, app_settings: AppSettings, aiohttp_client: ClientSession, logger: Logger, backend_pool: BackendPool) -> None:
         super().__init__(aiohttp_client, logger)
-        self._url: Final = urljoin(app_settings.translate_api_url, 'api/translate')
+        self._backend_pool: Final = backend_pool
 
     #####################################################################################################
 
@@ -56,20 +56,22 @@ class PrivateTranslationService(TranslationService):
         if source_lang:
             payload['source'] = source_lang
 
-        translate_resp = await self._aiohttp_client.post(
-            url=self._url,
-            data=JsonPayload(payload),
-            timeout=5,
-        )
-
-        if translate_resp.status == HTTPStatus.OK:
-            translate_json = await translate_resp.json(loads=orjson_loads)
-            translated_text = translate_json.get('translatedText', '')
-            # detected_source = translate_json.get('detectedSourceLanguage', '')
-        else:
-            self._logger.warning(f'Return invalid status for api/translate [{translate_resp.status}]')
-            translated_text = ''
-            # detected_source = ''
+        async with self._backend_pool.acquire() as backend:
+            translate_resp = await self._aiohttp_client.post(
+                url=backend.url('api/translate'),
+                data=JsonPayload(payload),
+                timeout=5,
+            )
+            backend.track_status(translate_resp.status)
+
+            if translate_resp.status == HTTPStatus.OK:
+                translate_json = await translate_resp.json(loads=orjson_loads)
+                translated_text = translate_json.get('translatedText', '')
+                # detected_source = translate_json.get('detectedSourceLanguage', '')
+            else:
+                self._logger.warning(f'Return invalid status for api/translate [{translate_resp.status}]')
+                translated_text = ''
+                # detected_source = ''
 
         return translated_text
 
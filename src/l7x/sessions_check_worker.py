@@ -1,54 +1,146 @@
-from dataclasses import dataclass
-from datetime import datetime
+from asyncio import sleep
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+from functools import partial
 from logging import Logger, getLogger
-from time import monotonic, sleep
-from typing import Final
+from time import monotonic
+from typing import Final, TypeVar
 
 from databases import Database
+from sqlalchemy import text
 
+from l7x.configs.constants import SESSIONS_CHECK_WORKER_CONNECTIONS, SESSIONS_EXPIRY_ADVISORY_LOCK_KEY
 from l7x.configs.settings import AppSettings
-from l7x.db import SessionModel
 from l7x.db.base_meta import ormar_change_database
 from l7x.db.db_utils import get_db_url_from_app_settings
+from l7x.db.rollups import refresh_daily_rollups
 from l7x.logger import DEFAULT_LOGGER_NAME
 from l7x.types.errors import AppException, ShutdownException
 from l7x.types.shutdown_event import ShutdownEvent
 from l7x.utils.apm_utils import init_apm_client, init_elastic_log
 from l7x.utils.cmd_manager_utils import WorkerParams
-from l7x.utils.datetime_utils import now_utc, offset_time
+from l7x.utils.db_pool_utils import create_database, create_db_pool_config
 from l7x.utils.loop_utils import EventLoopContext, _create_event_loop, _finalize_event_loop
+from l7x.utils.datetime_utils import now_utc
+from l7x.utils.partition_utils import check_partitions_coverage, create_future_partitions
 from l7x.utils.worker_utils import StartedEvent
 
 #####################################################################################################
 
+_PARTITIONS_CHECK_INTERVAL_SEC: Final = 60 * 60
+
+_T = TypeVar('_T')
+
+#####################################################################################################
+
 @dataclass(frozen=True, kw_only=True)
 class SessionWorkerParams(WorkerParams):
     app_settings: AppSettings
 
 #####################################################################################################
 
-async def check_sessions(logger: Logger):
-    open_sessions = await SessionModel.objects \
-        .select_related('user_id__department_id') \
-        .prefetch_related('conversations') \
-        .filter(logout_ts__isnull=True).all()
-    if open_sessions:
-        for session in open_sessions:
-            timezone = session.user_id.department_id.timezone
-            current_utc_ts = datetime.utcnow()
-            login_ts = offset_time(session.login_ts, timezone)
-            current_ts = offset_time(current_utc_ts, timezone)
-
-            session_uuid = session.primary_uuid
-
-            if login_ts.date() != current_ts.date():
-                session = await session.upsert(logout_ts=now_utc())
-                for conversation in session.conversations:
-                    if conversation.end_ts is None:
-                        await conversation.upsert(end_ts=now_utc())
-                        logger.info(f'Conversation {session_uuid} has been closed.')
-
-                logger.info(f'Session {session_uuid} has been closed.')
+# A session expires when the local day of its department has changed since login or when it is older than max age.
+# Its participations are left, a conversation is closed as by CLOSE_SESSIONS_CONVERSATIONS of l7x.db.prepared_statements:
+# when its first session is expired or when less than two participants stay
+# (the CTEs see the rows before the updates, so the expired sessions are excluded again).
+_EXPIRE_SESSIONS_QUERY: Final = text("""
+WITH expired_sessions AS (
+    UPDATE sessions AS s
+    SET logout_ts = now()
+    FROM users AS u
+    JOIN departments AS d ON d.primary_uuid = u.department_id
+    WHERE s.user_id = u.primary_uuid
+        AND s.logout_ts IS NULL
+        AND (
+            (s.login_ts AT TIME ZONE 'UTC' + d.timezone::interval)::date
+                <> (now() AT TIME ZONE 'UTC' + d.timezone::interval)::date
+            OR (
+                CAST(:max_age_sec AS double precision) > 0
+                AND s.login_ts < now() - make_interval(secs => CAST(:max_age_sec AS double precision))
+            )
+        )
+    RETURNING s.primary_uuid
+), left_participants AS (
+    UPDATE conversation_participants AS p
+    SET leave_ts = now()
+    FROM expired_sessions AS e
+    WHERE p.session_id = e.primary_uuid
+        AND p.leave_ts IS NULL
+    RETURNING p.conversation_id
+), closed_conversations AS (
+    UPDATE conversations AS c
+    SET end_ts = now()
+    WHERE c.end_ts IS NULL
+        AND (
+            c.first_user_session IN (SELECT primary_uuid FROM expired_sessions)
+            OR (
+                c.primary_uuid IN (SELECT conversation_id FROM left_participants)
+                AND (
+                    SELECT count(*)
+                    FROM conversation_participants AS p
+                    WHERE p.conversation_id = c.primary_uuid
+                        AND p.leave_ts IS NULL
+                        AND p.session_id NOT IN (SELECT primary_uuid FROM expired_sessions)
+                ) < 2
+            )
+        )
+    RETURNING c.primary_uuid
+)
+SELECT
+    (SELECT count(*) FROM expired_sessions) AS expired_sessions,
+    (SELECT count(*) FROM left_participants) AS left_participants,
+    (SELECT count(*) FROM closed_conversations) AS closed_conversations
+""")
+
+#####################################################################################################
+
+@dataclass(frozen=True, kw_only=True)
+class SessionsExpiryStats:
+    is_lock_acquired: bool
+    expired_sessions: int = 0
+    left_participants: int = 0
+    closed_conversations: int = 0
+    duration_sec: float = 0.0
+
+#####################################################################################################
+
+async def check_sessions(database: Database, app_settings: AppSettings) -> SessionsExpiryStats:
+    """Expire the sessions by one statement, only one worker of the cluster runs it at a time."""
+    start_ts: Final = monotonic()
+    async with database.transaction():
+        is_lock_acquired: Final = await database.fetch_val(
+            'SELECT pg_try_advisory_xact_lock(:lock_key)',
+            values={'lock_key': SESSIONS_EXPIRY_ADVISORY_LOCK_KEY},
+        )
+        if not is_lock_acquired:
+            return SessionsExpiryStats(is_lock_acquired=False)
+
+        expiry_result: Final = await database.fetch_one(
+            _EXPIRE_SESSIONS_QUERY,
+            values={'max_age_sec': float(app_settings.session_max_age_sec)},
+        )
+
+    return SessionsExpiryStats(
+        is_lock_acquired=True,
+        expired_sessions=expiry_result['expired_sessions'],
+        left_participants=expiry_result['left_participants'],
+        closed_conversations=expiry_result['closed_conversations'],
+        duration_sec=monotonic() - start_ts,
+    )
+
+#####################################################################################################
+
+async def _run_job(logger: Logger, apm_client, name: str, job: Callable[[], Awaitable[_T]]) -> tuple[bool, _T | None]:
+    """Run one job of the worker loop, its error is logged and the loop goes on, returns (is_done, result)."""
+    try:
+        return True, await job()
+    except ShutdownException:
+        raise
+    except Exception as err:  # pylint: disable=broad-exception-caught
+        logger.error(f'{name}: {err}', exc_info=err)
+        if apm_client is not None:
+            apm_client.capture_exception()  # type: ignore[no-untyped-call]
+        return False, None
 
 #####################################################################################################
 
@@ -63,7 +155,10 @@ async def _run_sessions_check(
 ) -> None:
     if loop_name != '':
         logger.info(f'Worker process "{loop_name}" starting...')
-    database: Final = Database(get_db_url_from_app_settings(app_settings, use_db_admin_credentials=True))
+    database: Final = create_database(
+        get_db_url_from_app_settings(app_settings, use_db_admin_credentials=True),
+        replace(create_db_pool_config(app_settings), min_size=1, max_size=SESSIONS_CHECK_WORKER_CONNECTIONS),
+    )
     ormar_change_database(database)
 
     await database.connect()
@@ -73,25 +168,41 @@ async def _run_sessions_check(
     func_after_all_started(logger)
 
     preview_time_check: float = -1.0
+    next_partitions_check: float = -1.0
+    next_rollups_refresh: float = -1.0
 
-    while not shutdown_event.is_set():
-        cur_time = monotonic()
-        if preview_time_check > 0 and preview_time_check + delay_sec > cur_time:
-            sleep(1)
-            continue
-        try:
-            await check_sessions(logger)
+    try:
+        # a failed job is logged and retried with the next check, the worker is stopped only by the shutdown
+        while not shutdown_event.is_set():
+            cur_time = monotonic()
+            if preview_time_check > 0 and preview_time_check + delay_sec > cur_time:
+                await sleep(1)
+                continue
             preview_time_check = cur_time
-        except BaseException as err:  # noqa: WPS424
-            if not isinstance(err, ShutdownException):
-                logger.error(f'session_check: {err}', exc_info=err)
-            if apm_client is not None:
-                apm_client.capture_exception(err)  # type: ignore[no-untyped-call]
-            if not isinstance(err, ShutdownException):
-                raise ShutdownException() from err
-            raise err
-
-    await database.disconnect()
+            _, stats = await _run_job(logger, apm_client, 'session_check', partial(check_sessions, database, app_settings))
+            if stats is not None and stats.is_lock_acquired:
+                logger.info(f'session_check: {stats}')
+            if next_partitions_check <= cur_time:
+                is_done, created_partitions = await _run_job(
+                    logger,
+                    apm_client,
+                    'partitions_check',
+                    partial(create_future_partitions, database, app_settings.db_partitions_months_ahead),
+                )
+                if is_done:
+                    next_partitions_check = cur_time + _PARTITIONS_CHECK_INTERVAL_SEC
+                    if created_partitions:
+                        logger.info(f'partitions_check: {created_partitions} partitions created')
+                # alerted also when the creation fails, the inserts fail after the last partition
+                await _run_job(logger, apm_client, 'partitions_coverage', partial(check_partitions_coverage, database, logger, now_utc()))
+            if next_rollups_refresh <= cur_time:
+                is_done, rollups_stats = await _run_job(logger, apm_client, 'rollups_refresh', partial(refresh_daily_rollups, database))
+                if is_done:
+                    next_rollups_refresh = cur_time + app_settings.rollups_refresh_interval_sec
+                    if rollups_stats is not None:
+                        logger.debug(f'rollups_refresh: {rollups_stats}')
+    finally:
+        await database.disconnect()
 
 #####################################################################################################
 
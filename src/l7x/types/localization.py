@@ -1836,6 +1836,26 @@ _A_EDITED_TEXT_MAP: Final = FrozenDict({
     LKey.ZH: '编辑文本',
 })
 
+_A_EDIT_DISTANCE_MAP: Final = FrozenDict({
+    LKey.AR: 'مسافة التحرير',
+    LKey.AZ: 'Redaktə məsafəsi',
+    LKey.DE: 'Editierdistanz',
+    LKey.EN: 'Edit distance',
+    LKey.ES: 'Distancia de edición',
+    LKey.FR: "Distance d'édition",
+    LKey.HI: 'संपादन दूरी',
+    LKey.HU: 'Szerkesztési távolság',
+    LKey.KO: '편집 거리',
+    LKey.NE: 'सम्पादन दूरी',
+    LKey.PA: 'ਸੰਪਾਦਨ ਦੂਰੀ',
+    LKey.RU: 'Расстояние редактирования',
+    LKey.TG: 'Масофаи таҳрир',
+    LKey.TL: 'Layo ng pag-edit',
+    LKey.UR: 'ترمیمی فاصلہ',
+    LKey.UZ: 'Tahrir masofasi',
+    LKey.ZH: '编辑距离',
+})
+
 _A_AUDIO_MAP: Final = FrozenDict({
     LKey.AR: 'صوتي',
     LKey.AZ: 'Audio',
@@ -3978,6 +3998,7 @@ class TKey(_LocalizedSentence, Enum):
     A_CREATION_DATE = "Date of creation", _A_CREATION_DATE_MAP
     A_RECOGNIZED_TEXT = "Recognized text", _A_RECOGNIZED_TEXT_MAP
     A_EDITED_TEXT = "Edited text", _A_EDITED_TEXT_MAP
+    A_EDIT_DISTANCE = "Edit distance", _A_EDIT_DISTANCE_MAP
     A_AUDIO = "Audio", _A_AUDIO_MAP
     A_EDIT = "Edit", _A_EDIT_MAP
     A_DELETE = "Delete", _A_DELETE_MAP
@@ -0,0 +1,232 @@
+#####################################################################################################
+
+from asyncio import TimeoutError as AsyncTimeoutError
+from collections.abc import AsyncIterator, Mapping, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from http import HTTPStatus
+from logging import Logger
+from random import sample
+from time import monotonic
+from typing import Any, Final
+from urllib.parse import urljoin
+
+from aiohttp import ClientError
+
+from l7x.configs.settings import AppSettings
+from l7x.types.errors import AppException
+
+# the errors of the transport, the other errors raised in a lease (bad input, parsing) do not mean
+# that the backend is unhealthy
+_TRANSPORT_ERRORS: Final = (ClientError, AsyncTimeoutError, OSError)
+
+_REPORT_EVERY_REQUESTS: Final = 1000
+
+#####################################################################################################
+
+class BackendEndpoint:
+    #####################################################################################################
+
+    __slots__ = ('base_url', 'outstanding', 'consecutive_fails', 'ejected_until', 'total_requests', 'total_fails', '_urls')
+
+    #####################################################################################################
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url: Final = base_url
+        self.outstanding = 0
+        self.consecutive_fails = 0
+        self.ejected_until = -1.0
+        self.total_requests = 0
+        self.total_fails = 0
+        self._urls: dict[str, str] = {}
+
+    #####################################################################################################
+
+    def url(self, path: str, /) -> str:
+        ret = self._urls.get(path)
+        if ret is None:
+            ret = urljoin(self.base_url, path)
+            self._urls[path] = ret
+        return ret
+
+    #####################################################################################################
+
+    def is_ejected(self, cur_ts: float, /) -> bool:
+        return self.ejected_until > cur_ts
+
+#####################################################################################################
+
+@dataclass(kw_only=True)
+class BackendLease:
+    endpoint: BackendEndpoint
+    failed: bool = False
+
+    #####################################################################################################
+
+    def url(self, path: str, /) -> str:
+        return self.endpoint.url(path)
+
+    #####################################################################################################
+
+    def track_status(self, status: int, /) -> None:
+        """Only server side errors mean that the backend is unhealthy."""
+        if status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            self.failed = True
+
+#####################################################################################################
+
+class BackendPool:
+    """Power-of-two-choices balancer (by outstanding requests) with passive health tracking."""
+
+    #####################################################################################################
+
+    def __init__(self, name: str, base_urls: Sequence[str], *, max_fails: int, eject_sec: float, logger: Logger) -> None:
+        if not base_urls:
+            # the requests to the pool fail, the rest of the app works
+            logger.error(f'Backend pool "{name}" has no endpoints, set L7X_TRANSLATE_API_URL')
+        self._name: Final = name
+        self._endpoints: Final = tuple(BackendEndpoint(base_url) for base_url in base_urls)
+        self._max_fails: Final = max(max_fails, 1)
+        self._eject_sec: Final = float(eject_sec)
+        self._logger: Final = logger
+        self._requests = 0
+
+    #####################################################################################################
+
+    @property
+    def name(self, /) -> str:
+        return self._name
+
+    #####################################################################################################
+
+    @property
+    def endpoints(self, /) -> Sequence[BackendEndpoint]:
+        return self._endpoints
+
+    #####################################################################################################
+
+    def _choose(self, /) -> BackendEndpoint:
+        endpoints: Final = self._endpoints
+        if not endpoints:
+            raise AppException(f'Backend pool "{self._name}" has no endpoints, set L7X_TRANSLATE_API_URL')
+        if len(endpoints) == 1:
+            return endpoints[0]
+
+        cur_ts: Final = monotonic()
+        healthy: Final = [endpoint for endpoint in endpoints if not endpoint.is_ejected(cur_ts)]
+        if not healthy:
+            # all nodes are ejected: fail open to the node which returns first
+            return min(endpoints, key=lambda endpoint: endpoint.ejected_until)
+        if len(healthy) == 1:
+            return healthy[0]
+
+        first, second = sample(healthy, 2)
+        return first if first.outstanding <= second.outstanding else second
+
+    #####################################################################################################
+
+    def _on_success(self, endpoint: BackendEndpoint, /) -> None:
+        if endpoint.consecutive_fails >= self._max_fails:
+            self._logger.info(f'Backend "{endpoint.base_url}" in pool "{self._name}" is healthy again')
+        endpoint.consecutive_fails = 0
+        endpoint.ejected_until = -1.0
+
+    #####################################################################################################
+
+    def _on_failure(self, endpoint: BackendEndpoint, /) -> None:
+        endpoint.total_fails += 1
+        endpoint.consecutive_fails += 1
+        if endpoint.consecutive_fails >= self._max_fails and len(self._endpoints) > 1:
+            endpoint.ejected_until = monotonic() + self._eject_sec
+            self._logger.warning(
+                f'Backend "{endpoint.base_url}" in pool "{self._name}" ejected for {self._eject_sec} sec '
+                + f'after {endpoint.consecutive_fails} failures, pool stats: {self.stats()}',
+            )
+
+    #####################################################################################################
+
+    @asynccontextmanager
+    async def acquire(self, /) -> AsyncIterator[BackendLease]:
+        endpoint: Final = self._choose()
+        lease: Final = BackendLease(endpoint=endpoint)
+        endpoint.outstanding += 1
+        endpoint.total_requests += 1
+        try:
+            yield lease
+        except _TRANSPORT_ERRORS:
+            self._on_failure(endpoint)
+            raise
+        except Exception:
+            # a 5xx tracked before the error is still a failure of the backend
+            if lease.failed:
+                self._on_failure(endpoint)
+            raise
+        else:
+            if lease.failed:
+                self._on_failure(endpoint)
+            else:
+                self._on_success(endpoint)
+        finally:
+            endpoint.outstanding -= 1
+            self._on_finished()
+
+    #####################################################################################################
+
+    def _on_finished(self, /) -> None:
+        self._requests += 1
+        if self._requests % _REPORT_EVERY_REQUESTS == 0:
+            self._logger.info(f'Backend pool "{self._name}" stats: {self.stats()}')
+
+    #####################################################################################################
+
+    def stats(self, /) -> Mapping[str, Any]:
+        cur_ts: Final = monotonic()
+        return {
+            endpoint.base_url: {
+                'outstanding': endpoint.outstanding,
+                'requests': endpoint.total_requests,
+                'fails': endpoint.total_fails,
+                'ejected': endpoint.is_ejected(cur_ts),
+            }
+            for endpoint in self._endpoints
+        }
+
+#####################################################################################################
+
+@dataclass(frozen=True, kw_only=True)
+class BackendPools:
+    translate: BackendPool
+    speech_to_text: BackendPool
+    detect_language: BackendPool
+
+#####################################################################################################
+
+def create_backend_pools(app_settings: AppSettings, logger: Logger) -> BackendPools:
+    """Pools with the same list of urls share one instance, so outstanding requests are counted once per backend."""
+    pools: Final[dict[tuple[str, ...], BackendPool]] = {}
+
+    def _get_pool(name: str, base_urls: tuple[str, ...]) -> BackendPool:
+        urls: Final = base_urls or app_settings.translate_api_urls
+        pool = pools.get(urls)
+        if pool is None:
+            pool = BackendPool(
+                name,
+                urls,
+                max_fails=app_settings.translate_api_max_fails,
+                eject_sec=app_settings.translate_api_eject_sec,
+                logger=logger,
+            )
+            pools[urls] = pool
+        return pool
+
+    translate: Final = _get_pool('translate', app_settings.translate_api_translate_urls)
+    speech_to_text: Final = _get_pool('speech_to_text', app_settings.translate_api_speech_to_text_urls)
+    detect_language: Final = _get_pool('detect_language', app_settings.translate_api_detect_language_urls)
+
+    return BackendPools(
+        translate=translate,
+        speech_to_text=speech_to_text,
+        detect_language=detect_language,
+    )
+
+#####################################################################################################
@@ -1,70 +1,150 @@
 #####################################################################################################
 from collections.abc import Sequence
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from logging import getLogger
 from typing import Final
+from uuid import UUID as _PYTHON_UUID
 
 from databases import Database
 from nicegui import ui
 from nicegui.elements.date import Date
+from nicegui.elements.label import Label
 from nicegui.elements.select import Select
-from nicegui.elements.table import Table
 from nicegui.events import GenericEventArguments
 from ormar.fields.sqlalchemy_uuid import UUID
 
+from l7x.configs.constants import ADMIN_REPORT_MAX_STALENESS_SEC
 from l7x.db import ConversationModel, DepartmentModel, UserModel
+from l7x.db.base_meta import create_transaction
+from l7x.db.prepared_statements import HOT_STATEMENTS, JOIN_CONVERSATION, LOCK_OPEN_CONVERSATION, WAITING_CONVERSATION
+from l7x.db.projections import ConversationListRecord, count_conversations, fetch_conversation_list, fetch_conversation_uuids
+from l7x.db.rollups import ConversationTotals, fetch_conversation_totals, invalidate_rollups
 from l7x.logger import DEFAULT_LOGGER_NAME
 from l7x.types.localization import TKey
 from l7x.utils.datetime_utils import format_datetime_to_iso, q_date_to_utc_datetime, timedelta_to_str, validate_q_date
+from l7x.utils.keyset_pagination_utils import KeysetPage, KeysetTable, RowKey
 from l7x.utils.orjson_utils import orjson_dumps_to_str
 from l7x.utils.lang_utils import localize as _
+from l7x.utils.read_replica_utils import replica_reads
 
 #####################################################################################################
 
-async def get_all_conversations(
-    start_date: datetime,
-    end_date: datetime,
-    users: Sequence[UUID] | None = None,
-    departments: Sequence[UUID] | None = None,
-):
-    filters = {
-        'start_ts__gte': start_date,
-        'start_ts__lte': end_date,
+# a waiting conversation may be filled by a concurrent join, then the next one is tried
+_JOIN_ATTEMPTS: Final = 3
+
+#####################################################################################################
+
+def _conversation_to_row(conversation: ConversationListRecord) -> dict[str, str]:
+    scores = conversation.questionare if conversation.questionare is not None else {}
+    return {
+        'primary_uuid': str(conversation.primary_uuid),
+        'user_name': conversation.user_full_name,
+        'user_login': conversation.user_login,
+        'department_name': conversation.department_name,
+        'language': conversation.selected_lang,
+        'nps_score': scores.get('recommends', '-'),
+        'translation_score': scores.get('translation_quality', '-'),
+        'usability_score': scores.get('difficulty_of_use', '-'),
+        'start_ts': format_datetime_to_iso(conversation.start_ts),
+        'end_ts': format_datetime_to_iso(conversation.end_ts) if conversation.end_ts is not None else '',
+        'conv_duration': timedelta_to_str(conversation.end_ts - conversation.start_ts) if conversation.end_ts is not None else '',
     }
-    if users:
-        filters['session_id__user_id__primary_uuid__in'] = users
-    if departments:
-        filters['session_id__user_id__department_id__primary_uuid__in'] = departments
-
-    conversations: Final[Sequence[ConversationModel]] = await ConversationModel.objects.select_related(
-        'first_user_session__user_id__department_id',
-    ).select_related(
-        'second_user_session__user_id__department_id',
-    ).filter(
-        **filters
-    ).order_by(
-        ['first_user_session__user_id__department_id', 'first_user_session__user_id', 'start_ts'],
-    ).all()
-
-    rows = []
-    for conversation in conversations:
-        scores = conversation.questionare if conversation.questionare is not None else {}
-        row = {
-            'primary_uuid': str(conversation.primary_uuid),
-            # 'session_id': str(conversation.session_id.primary_uuid),
-            'user_name': str(conversation.first_user_session.user_id.full_name),
-            'user_login': str(conversation.first_user_session.user_id.login),
-            'department_name': str(conversation.first_user_session.user_id.department_id.name),
-            'language': conversation.selected_lang,
-            'nps_score': scores.get('recommends', '-'),
-            'translation_score': scores.get('translation_quality', '-'),
-            'usability_score': scores.get('difficulty_of_use', '-'),
-            'start_ts': format_datetime_to_iso(conversation.start_ts),
-            'end_ts': format_datetime_to_iso(conversation.end_ts) if conversation.end_ts is not None else '',
-            'conv_duration': timedelta_to_str(conversation.end_ts - conversation.start_ts) if conversation.end_ts is not None else '',
-        }
-        rows.append(row)
-    return rows
+
+#####################################################################################################
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ConversationsPageSource:
+    """Conversations of the admin table ordered by start_ts, filtered by the operator (first session user)."""
+
+    start_date: datetime
+    end_date: datetime
+    users: tuple[UUID, ...] = ()
+    departments: tuple[UUID, ...] = ()
+
+    #####################################################################################################
+
+    async def fetch_page(self, *, after: RowKey | None, offset: int, limit: int, descending: bool) -> KeysetPage:
+        async with replica_reads(ADMIN_REPORT_MAX_STALENESS_SEC):
+            conversations: Final = await fetch_conversation_list(
+                start_date=self.start_date,
+                end_date=self.end_date,
+                users=self.users,
+                departments=self.departments,
+                after=after,
+                offset=offset,
+                limit=limit,
+                descending=descending,
+            )
+
+        return KeysetPage(
+            rows=[_conversation_to_row(conversation) for conversation in conversations],
+            last_key=(conversations[-1].start_ts, str(conversations[-1].primary_uuid)) if conversations else None,
+        )
+
+    #####################################################################################################
+
+    async def count(self, /) -> int:
+        async with replica_reads(ADMIN_REPORT_MAX_STALENESS_SEC):
+            return await count_conversations(
+                start_date=self.start_date,
+                end_date=self.end_date,
+                users=self.users,
+                departments=self.departments,
+            )
+
+    #####################################################################################################
+
+    async def fetch_uuids(self, /) -> Sequence[str]:
+        async with replica_reads(ADMIN_REPORT_MAX_STALENESS_SEC):
+            uuids: Final = await fetch_conversation_uuids(
+                start_date=self.start_date,
+                end_date=self.end_date,
+                users=self.users,
+                departments=self.departments,
+            )
+        return [str(uuid) for uuid in uuids]
+
+    #####################################################################################################
+
+    async def totals(self, /) -> ConversationTotals | None:
+        """Totals of the filter from the daily rollups, None for the users filter (rollups are per department)."""
+        if self.users:
+            return None
+        async with replica_reads(ADMIN_REPORT_MAX_STALENESS_SEC):
+            return await fetch_conversation_totals(
+                start_day=self.start_date.date(),
+                end_day=self.end_date.date(),
+                departments=self.departments,
+            )
+
+#####################################################################################################
+
+def _average(total: float, count: int) -> str:
+    return f'{total / count:.2f}' if count else '-'
+
+#####################################################################################################
+
+def conversation_totals_to_str(totals: ConversationTotals) -> str:
+    duration: Final = (
+        timedelta_to_str(timedelta(seconds=totals.duration_sec / totals.closed_conversations))
+        if totals.closed_conversations else '-'
+    )
+    return ' | '.join((
+        f'{_(TKey.A_DIALOGS)}: {totals.conversations}',
+        f'{_(TKey.A_DIALOG_DURATION)}: {duration}',
+        f'{_(TKey.A_NPS_SCORE)}: {_average(totals.nps_sum, totals.nps_answers)}',
+        f'{_(TKey.A_TRANSLATION_SCORE)}: {_average(totals.translation_sum, totals.translation_answers)}',
+        f'{_(TKey.A_USABILITY_SCORE)}: {_average(totals.usability_sum, totals.usability_answers)}',
+    ))
+
+#####################################################################################################
+
+async def update_conversation_stats(stats_label: Label, source: ConversationsPageSource | None) -> None:
+    totals: Final = await source.totals() if source is not None else None
+    stats_label.set_visibility(totals is not None)
+    if totals is not None:
+        stats_label.set_text(conversation_totals_to_str(totals))
 
 #####################################################################################################
 
@@ -94,9 +174,10 @@ async def date_validator(start_date_str: str, end_date_str: str):
 async def update_filtered_conversations(
     start_date_str: str,
     end_date_str: str,
-    conv_table: Table,
+    conv_table: KeysetTable,
     users: Sequence[UUID] | None = None,
     departments: Sequence[UUID] | None = None,
+    stats_label: Label | None = None,
 ):
     if not await date_validator(start_date_str, end_date_str):
         return
@@ -105,40 +186,54 @@ async def update_filtered_conversations(
     end_date = q_date_to_utc_datetime(end_date_str).replace(hour=23, minute=59, second=59)
     curr_date = datetime.now()
 
-    if start_date.date() > curr_date.date():
-        conv_table.update_rows([])
-        return
+    source: ConversationsPageSource | None = None
+    if start_date.date() <= curr_date.date():
+        source = ConversationsPageSource(
+            start_date=start_date,
+            end_date=end_date,
+            users=tuple(users or ()),
+            departments=tuple(departments or ()),
+        )
 
-    filtered_conversations_rows = await get_all_conversations(start_date, end_date, users, departments)
-    conv_table.update_rows(filtered_conversations_rows)
+    await conv_table.set_source(source)
+    if stats_label is not None:
+        await update_conversation_stats(stats_label, source)
 
 #####################################################################################################
 
 async def clear_filter_conversations(
     start_date: str,
     end_date: str,
-    conv_table: Table,
+    conv_table: KeysetTable,
     start_date_calendar: Date,
     end_date_calendar: Date,
     departments_input: Select,
     users_input: Select,
+    stats_label: Label | None = None,
 ):
     start_date_calendar.set_value(start_date)
     end_date_calendar.set_value(end_date)
     users_input.set_value(None)
     departments_input.set_value(None)
-    await update_filtered_conversations(start_date_str=start_date, end_date_str=end_date, conv_table=conv_table)
+    await update_filtered_conversations(
+        start_date_str=start_date,
+        end_date_str=end_date,
+        conv_table=conv_table,
+        stats_label=stats_label,
+    )
 
 #####################################################################################################
 
-async def download_all_conversations(conversation_table: Table, start_calendar, end_calendar):
+async def download_all_conversations(conversation_table: KeysetTable, start_calendar, end_calendar):
     start_date: Final = start_calendar.value
     end_date: Final = end_calendar.value
 
     if not await date_validator(start_date, end_date):
         return
 
-    conversation_uuids = [conv['primary_uuid'] for conv in conversation_table.rows]
+    # all conversations of the filter, the table holds only the shown page
+    source: Final = conversation_table.source
+    conversation_uuids = list(await source.fetch_uuids()) if isinstance(source, ConversationsPageSource) else []
 
     async def _download():
         try:
@@ -172,15 +267,16 @@ async def download_all_conversations(conversation_table: Table, start_calendar,
 
 #####################################################################################################
 
-async def del_conversation(event: GenericEventArguments, table: Table) -> None:
+async def del_conversation(event: GenericEventArguments, table: KeysetTable) -> None:
     data = event.args
     conversation = await ConversationModel.objects.get_or_none(primary_uuid=data['primary_uuid'])
 
     async def _on_click_delete(conv, tab, popup) -> None:
         try:
             await conv.delete()
-            updated_rows = [row for row in tab.rows if row['primary_uuid'] != str(conv.primary_uuid)]
-            tab.update_rows(updated_rows)
+            # the day of an old conversation is out of the recomputed days of the rollups refresh
+            await invalidate_rollups(conv.start_ts)
+            await tab.reload()
         except Exception as ex:
             getLogger(DEFAULT_LOGGER_NAME).error(f"Error when delete conversation.", exc_info=ex)
             ui.notify(_(TKey.A_ERROR_DELETE_CONV), type="negative", position="top")
@@ -202,22 +298,33 @@ async def del_conversation(event: GenericEventArguments, table: Table) -> None:
 
 #####################################################################################################
 
-async def check_waiting_conversation(session_id: str, user_id: str):
+async def _join_conversation(conversation_uuid: _PYTHON_UUID, session_uuid: _PYTHON_UUID) -> bool:
+    async with create_transaction():
+        max_participants: Final = await HOT_STATEMENTS.fetchval(LOCK_OPEN_CONVERSATION, conversation_uuid)
+        if max_participants is None:
+            return False
+        return await HOT_STATEMENTS.fetchval(JOIN_CONVERSATION, conversation_uuid, session_uuid, max_participants)
+
+#####################################################################################################
+
+async def join_waiting_conversation(session_id: str, user_id: str) -> ConversationModel | None:
+    """
+    Join the session to the newest waiting conversation, returns it.
+
+    The capacity is checked in SQL under the lock of the conversation row, a conversation filled
+    by a concurrent join is skipped for the next waiting one.
+    """
+    session_uuid: Final = _PYTHON_UUID(str(session_id))
+    user_uuid: Final = _PYTHON_UUID(str(user_id))
     try:
-        # TODO OPTIMIZE and check why the same user can connect
-        conversation = await ConversationModel.objects.filter(
-            second_user_session__isnull=True,
-            end_ts__isnull=True,
-        ).exclude(
-            first_user_session__primary_uuid=session_id,
-            first_user_session__user_id=user_id,
-        ).order_by('-start_ts').limit(1, limit_raw_sql=True).all()
-        if not conversation:
-            return
-        conversation = conversation[0]
+        for _attempt in range(_JOIN_ATTEMPTS):
+            conversation_uuid = await HOT_STATEMENTS.fetchval(WAITING_CONVERSATION, session_uuid, user_uuid)
+            if conversation_uuid is None:
+                return None
+            if await _join_conversation(conversation_uuid, session_uuid):
+                return await ConversationModel.objects.get_or_none(primary_uuid=conversation_uuid)
     except Exception as ex:
-        d = True
-        print(ex)
-        return
-    return conversation
+        getLogger(DEFAULT_LOGGER_NAME).error('Error when join waiting conversation.', exc_info=ex)
+    return None
 
+#####################################################################################################
@@ -0,0 +1,210 @@
+#####################################################################################################
+
+from asyncio import timeout as _asyncio_timeout
+from collections.abc import Awaitable, Mapping
+from dataclasses import dataclass
+from logging import Logger
+from time import monotonic
+from typing import Any, Final
+
+from databases import Database, DatabaseURL
+from databases.backends.postgres import PostgresBackend, PostgresConnection
+from sqlalchemy.engine.interfaces import Dialect
+
+from l7x.configs.constants import SESSIONS_CHECK_WORKER_CONNECTIONS, STARTUP_CONNECTIONS
+from l7x.configs.settings import AppSettings
+from l7x.types.errors import AppException
+
+#####################################################################################################
+
+_REPORT_EVERY_ACQUIRES: Final = 1000
+
+_MONITORED_POSTGRES_BACKEND: Final = 'l7x.utils.db_pool_utils:MonitoredPostgresBackend'
+
+#####################################################################################################
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DbPoolConfig:
+    min_size: int
+    max_size: int
+    acquire_timeout_sec: float
+    max_idle_sec: float
+    statement_timeout_sec: float
+
+#####################################################################################################
+
+def create_db_pool_config(app_settings: AppSettings, *, reserved_connections: int = 0) -> DbPoolConfig:
+    """
+    Pool of one web worker: its share of the connection budget left by the session-check worker and the startup,
+    without the connections it keeps outside the pool. Raises AppException when the share is empty.
+    """
+    workers_budget: Final = app_settings.db_connection_budget - SESSIONS_CHECK_WORKER_CONNECTIONS - STARTUP_CONNECTIONS
+    worker_count: Final = max(app_settings.worker_count, 1)
+    max_size: Final = workers_budget // worker_count - reserved_connections
+    if max_size < 1:
+        raise AppException(
+            f'L7X_DB_CONNECTION_BUDGET {app_settings.db_connection_budget} is too small for {worker_count} web workers, '
+            + f'every worker needs {1 + reserved_connections} connections, '
+            + f'{SESSIONS_CHECK_WORKER_CONNECTIONS + STARTUP_CONNECTIONS} are kept for the session-check worker and the startup, '
+            + 'raise L7X_DB_CONNECTION_BUDGET or lower L7X_WORKER_COUNT',
+        )
+    return DbPoolConfig(
+        min_size=min(max(app_settings.db_pool_min_size, 0), max_size),
+        max_size=max_size,
+        acquire_timeout_sec=app_settings.db_pool_acquire_timeout_sec,
+        max_idle_sec=app_settings.db_pool_max_idle_sec,
+        statement_timeout_sec=app_settings.db_statement_timeout_sec,
+    )
+
+#####################################################################################################
+
+class DbPoolMonitor:
+    """
+    Measures how long the connections of the database pool are waited for and applies the acquire timeout.
+
+    The database is created by create_database(..., database_class=MonitoredDatabase, pool_monitor=monitor),
+    the pool is attached on the connect.
+    """
+
+    #####################################################################################################
+
+    def __init__(self, pool_config: DbPoolConfig, logger: Logger) -> None:
+        self._pool_config: Final = pool_config
+        self._logger: Final = logger
+        self._acquire_timeout_sec: Final = pool_config.acquire_timeout_sec if pool_config.acquire_timeout_sec > 0 else None
+        self._pool: Any = None
+        self._waiting = 0
+        self._acquires = 0
+        self._timeouts = 0
+        self._wait_sec_total = 0.0
+        self._wait_sec_max = 0.0
+
+    #####################################################################################################
+
+    def attach_pool(self, pool: Any) -> None:
+        self._pool = pool
+
+    #####################################################################################################
+
+    async def wait_for_connection(self, acquire: Awaitable[None]) -> None:
+        start_ts: Final = monotonic()
+        self._waiting += 1
+        try:
+            async with _asyncio_timeout(self._acquire_timeout_sec):
+                await acquire
+        except TimeoutError:
+            self._timeouts += 1
+            self._logger.warning(f'Database pool acquire timeout, pool stats: {self.stats()}')
+            raise
+        finally:
+            self._waiting -= 1
+        self._on_acquired(monotonic() - start_ts)
+
+    #####################################################################################################
+
+    def _on_acquired(self, wait_sec: float) -> None:
+        self._acquires += 1
+        self._wait_sec_total += wait_sec
+        self._wait_sec_max = max(self._wait_sec_max, wait_sec)
+        if self._acquires % _REPORT_EVERY_ACQUIRES == 0:
+            self._logger.info(f'Database pool stats: {self.stats()}')
+
+    #####################################################################################################
+
+    def stats(self, /) -> Mapping[str, Any]:
+        size: Final = self._pool.get_size() if self._pool is not None else 0
+        idle: Final = self._pool.get_idle_size() if self._pool is not None else 0
+        return {
+            'max_size': self._pool_config.max_size,
+            'size': size,
+            'in_use': size - idle,
+            'saturation': (size - idle) / self._pool_config.max_size,
+            'waiting': self._waiting,
+            'acquires': self._acquires,
+            'timeouts': self._timeouts,
+            'mean_wait_ms': self._wait_sec_total / self._acquires * 1000 if self._acquires else 0.0,
+            'max_wait_ms': self._wait_sec_max * 1000,
+        }
+
+#####################################################################################################
+
+def create_database(
+    db_url: str,
+    pool_config: DbPoolConfig,
+    *,
+    database_class: type[Database] = Database,
+    pool_monitor: DbPoolMonitor | None = None,
+) -> Database:
+    server_settings: Final[dict[str, str]] = {}
+    if pool_config.statement_timeout_sec > 0:
+        server_settings['statement_timeout'] = str(int(pool_config.statement_timeout_sec * 1000))
+    monitor_options: Final = {} if pool_monitor is None else {'pool_monitor': pool_monitor}
+    # options are passed to asyncpg.create_pool, pool_monitor is taken by MonitoredPostgresBackend
+    return database_class(
+        db_url,
+        min_size=pool_config.min_size,
+        max_size=pool_config.max_size,
+        max_inactive_connection_lifetime=pool_config.max_idle_sec,
+        server_settings=server_settings,
+        **monitor_options,
+    )
+
+#####################################################################################################
+
+class MonitoredDatabase(Database):
+    """Database accepting the pool_monitor option, its Postgres connections report their acquires to the monitor."""
+
+    SUPPORTED_BACKENDS = {  # noqa: WPS115
+        **Database.SUPPORTED_BACKENDS,
+        'postgresql': _MONITORED_POSTGRES_BACKEND,
+        'postgres': _MONITORED_POSTGRES_BACKEND,
+    }
+
+#####################################################################################################
+
+class MonitoredPostgresBackend(PostgresBackend):
+    """Postgres backend of databases, the connection acquires are measured by the DbPoolMonitor."""
+
+    #####################################################################################################
+
+    def __init__(self, database_url: DatabaseURL | str, *, pool_monitor: DbPoolMonitor | None = None, **options: Any) -> None:
+        super().__init__(database_url, **options)
+        self._pool_monitor: Final = pool_monitor
+
+    #####################################################################################################
+
+    async def connect(self, /) -> None:
+        await super().connect()
+        if self._pool_monitor is not None:
+            self._pool_monitor.attach_pool(self._pool)
+
+    #####################################################################################################
+
+    async def disconnect(self, /) -> None:
+        if self._pool_monitor is not None:
+            self._pool_monitor.attach_pool(None)
+        await super().disconnect()
+
+    #####################################################################################################
+
+    def connection(self, /) -> PostgresConnection:
+        if self._pool_monitor is None:
+            return super().connection()
+        return _MonitoredPostgresConnection(self, self._dialect, self._pool_monitor)
+
+#####################################################################################################
+
+class _MonitoredPostgresConnection(PostgresConnection):
+    #####################################################################################################
+
+    def __init__(self, database: PostgresBackend, dialect: Dialect, pool_monitor: DbPoolMonitor) -> None:
+        super().__init__(database, dialect)
+        self._pool_monitor: Final = pool_monitor
+
+    #####################################################################################################
+
+    async def acquire(self, /) -> None:
+        # called by databases when a task enters its first "async with database.connection()"
+        await self._pool_monitor.wait_for_connection(super().acquire())
+
+#####################################################################################################
@@ -1,10 +1,22 @@
-from collections.abc import Sequence
-from typing import Final
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, Final
+from uuid import UUID
 
+from nicegui import app as nicegui_app
 from starlette.requests import Request
 
-from l7x.db import ConversationModel, SessionModel
+from l7x.db import SessionModel, TextModel
+from l7x.db.prepared_statements import (
+    CLOSE_SESSIONS_CONVERSATIONS,
+    HOT_STATEMENTS,
+    INSERT_TEXT,
+    SESSION_STATE,
+    UPDATE_TEXT_FIX,
+    UPDATE_TEXT_TRANSLATIONS,
+)
 from l7x.utils.datetime_utils import now_utc
+from l7x.utils.session_cache_utils import SessionCache, SessionState
+from l7x.utils.storage_utils import ConversationStorageHelper
 
 #####################################################################################################
 
@@ -24,56 +36,121 @@ class UserNotActive(Exception):
 #####################################################################################################
 
 
-async def get_session_with_conversations(session_uuid) -> SessionModel | None:
-    return await SessionModel.objects.select_related(
-        'user_id',
-    ).prefetch_related(
-        'first_user_conversations'
-    ).prefetch_related(
-        'second_user_conversations'
-    ).get_or_none(
-        primary_uuid=session_uuid,
+def _to_uuids(uuids: Iterable[str | UUID]) -> list[UUID]:
+    return [uuid if isinstance(uuid, UUID) else UUID(str(uuid)) for uuid in uuids]
+
+#####################################################################################################
+
+def _forget_closed_conversations(conversation_uuids: Sequence[UUID]) -> None:
+    conversations_storage: Final[ConversationStorageHelper | None] = getattr(nicegui_app, 'conversations_storage', None)
+    if conversations_storage is not None:
+        conversations_storage.remove_convs(conversation_uuids)
+
+#####################################################################################################
+
+async def close_sessions_conversations(session_uuids: Iterable[str | UUID]) -> Sequence[UUID]:
+    """
+    The sessions leave their conversations by one statement, returns uuids of the closed conversations.
+
+    A conversation is closed when its first session leaves or when less than two participants stay.
+    """
+    session_uuids_list: Final = _to_uuids(session_uuids)
+    if not session_uuids_list:
+        return ()
+
+    closed_rows: Final = await HOT_STATEMENTS.fetch(CLOSE_SESSIONS_CONVERSATIONS, session_uuids_list)
+    closed_uuids: Final = tuple(row['primary_uuid'] for row in closed_rows)
+    _forget_closed_conversations(closed_uuids)
+    return closed_uuids
+
+#####################################################################################################
+
+async def close_sessions(session_uuids: Iterable[str | UUID]) -> Sequence[UUID]:
+    """Log out the sessions and close their conversations, returns uuids of the closed sessions."""
+    session_uuids_list: Final = _to_uuids(session_uuids)
+    if not session_uuids_list:
+        return ()
+
+    sessions: Final = SessionModel.ormar_config.table
+    closed_rows: Final = await SessionModel.ormar_config.database.fetch_all(
+        sessions.update().where(
+            sessions.c.logout_ts.is_(None),
+            sessions.c.primary_uuid.in_(session_uuids_list),
+        ).values(
+            logout_ts=now_utc(),
+        ).returning(
+            sessions.c.primary_uuid,
+        ),
     )
+    closed_uuids: Final = tuple(row['primary_uuid'] for row in closed_rows)
+    await close_sessions_conversations(closed_uuids)
+    return closed_uuids
 
 #####################################################################################################
 
-async def close_conversations(conversations: Sequence[ConversationModel]) -> None:
-    for conversation in conversations:
-        if conversation.end_ts is None:
-            await conversation.update(end_ts=now_utc())
+async def close_sessions_and_conversations(user_uuid: str | UUID) -> Sequence[UUID]:
+    sessions: Final = SessionModel.ormar_config.table
+    closed_rows: Final = await SessionModel.ormar_config.database.fetch_all(
+        sessions.update().where(
+            sessions.c.logout_ts.is_(None),
+            sessions.c.user_id == _to_uuids((user_uuid,))[0],
+        ).values(
+            logout_ts=now_utc(),
+        ).returning(
+            sessions.c.primary_uuid,
+        ),
+    )
+    closed_uuids: Final = tuple(row['primary_uuid'] for row in closed_rows)
+    await close_sessions_conversations(closed_uuids)
+    return closed_uuids
 
 #####################################################################################################
 
-async def close_sessions_and_conversations(user_uuid) -> None:
-    user_sessions = await SessionModel.objects.prefetch_related(
-        'conversations',
-    ).filter(
-        user_id__primary_uuid=user_uuid,
-        logout_ts__isnull=True,
-    ).all()
-    for user_session in user_sessions:
-        await user_session.update(logout_ts=now_utc())
-        await close_conversations(user_session.conversations)
+async def get_session_state(session_uuid: str | None) -> SessionState | None:
+    """Session validity from the worker session cache, the database is queried only on a cache miss."""
+    if session_uuid is None:
+        return None
+
+    session_cache: Final[SessionCache | None] = getattr(nicegui_app, 'session_cache', None)
+    if session_cache is not None:
+        cached_state = session_cache.get(session_uuid)
+        if cached_state is not None:
+            return cached_state
+        generation = session_cache.generation
+
+    try:
+        session_uuid_value: Final = UUID(str(session_uuid))
+    except ValueError:
+        return None
+    row: Final = await HOT_STATEMENTS.fetchrow(SESSION_STATE, session_uuid_value)
+    if row is None:
+        return None
+
+    state: Final = SessionState(
+        session_uuid=str(row['session_uuid']),
+        user_uuid=str(row['user_uuid']),
+        is_closed=row['is_closed'],
+        is_user_active=row['is_user_active'],
+        is_superuser=row['is_superuser'],
+    )
+    if session_cache is not None:
+        session_cache.put(state, generation=generation)
+    return state
 
 #####################################################################################################
 
 async def check_valid_session(session_uuid: str) -> None:
-    session: Final[SessionModel | None] = await get_session_with_conversations(session_uuid)
+    state: Final = await get_session_state(session_uuid)
 
-    if session is None:
+    if state is None:
         raise SessionNotFound
 
-    if session.logout_ts is not None:
-        session_conversations = []
-        if session.first_user_conversations:
-            session_conversations.extend(session.first_user_conversations)
-        if session.second_user_conversations:
-            session_conversations.extend(session.second_user_conversations)
-        await close_conversations(session_conversations)
+    if state.is_closed:
+        await close_sessions_conversations((state.session_uuid,))
         raise SessionClosed
 
-    if not session.user_id.is_active:
-        await close_sessions_and_conversations(session.user_id.primary_uuid)
+    if not state.is_user_active:
+        await close_sessions_and_conversations(state.user_uuid)
         raise UserNotActive
 
 #####################################################################################################
@@ -84,20 +161,13 @@ async def check_session_with_request(request: Request, action_str: str) -> bool:
     if session_uuid is None:
         logger.warning(f'Can`t {action_str}. session_uuid in cookie not found')
         return False
-    session = await SessionModel.objects \
-        .prefetch_related('first_user_conversations').prefetch_related('second_user_conversations') \
-        .get_or_none(primary_uuid=session_uuid)
-    if session is None:
+    session_state = await get_session_state(session_uuid)
+    if session_state is None:
         logger.warning(f'Can`t {action_str}. Session is not valid')
         return False
-    if session.logout_ts is not None:
+    if session_state.is_closed:
         logger.warning(f'Can`t {action_str}. This session has been closed')
-        for conversation in session.first_user_conversations:
-            if conversation.end_ts is None:
-                await conversation.update(end_ts=now_utc())
-        for conversation in session.second_user_conversations:
-            if conversation.end_ts is None:
-                await conversation.update(end_ts=now_utc())
+        await close_sessions_conversations((session_state.session_uuid,))
         return False
     return True
 
@@ -119,3 +189,42 @@ async def check_superuser_state(request: Request) -> bool:
         return False
 
 #####################################################################################################
+
+def _related_pk(related: Any) -> Any:
+    return related.pk if related is not None else None
+
+#####################################################################################################
+
+async def insert_text(text: TextModel) -> TextModel:
+    """Insert the new text by the prepared statement, the generated primary uuid is set to the model."""
+    text.primary_uuid = await HOT_STATEMENTS.fetchval(
+        INSERT_TEXT,
+        text.create_ts,
+        _related_pk(text.audio_id),
+        text.lang_from,
+        text.lang_to,
+        text.recognized_text,
+        text.translated_text,
+        _related_pk(text.owner_session_uuid),
+        _related_pk(text.conversation_id),
+    )
+    text.set_save_status(True)
+    return text
+
+#####################################################################################################
+
+async def update_text_fix(text: TextModel, *, fixed_text: str, translated_text: str) -> None:
+    edit_ts: Final = now_utc()
+    await HOT_STATEMENTS.fetch(UPDATE_TEXT_FIX, text.primary_uuid, fixed_text, translated_text, edit_ts)
+    text.fixed_text = fixed_text
+    text.translated_text = translated_text
+    text.edit_ts = edit_ts
+    text.set_save_status(True)
+
+#####################################################################################################
+
+async def update_text_translations(text: TextModel, translations: Mapping[str, str]) -> None:
+    """Replace the saved listener translations of the edited text."""
+    await HOT_STATEMENTS.execute(UPDATE_TEXT_TRANSLATIONS, text.primary_uuid, list(translations), list(translations.values()))
+
+#####################################################################################################
@@ -0,0 +1,48 @@
+#####################################################################################################
+
+from asyncio import run as _asyncio_run
+from logging import Logger
+from typing import Final
+
+from asyncpg import PostgresError, UndefinedTableError, connect as _asyncpg_connect
+
+from l7x.alembic.head import DB_HEAD_REVISION
+from l7x.configs.settings import AppSettings
+from l7x.db.db_utils import get_db_url_from_app_settings
+
+#####################################################################################################
+
+async def _fetch_db_revisions(dsn: str) -> frozenset[str]:
+    connection: Final = await _asyncpg_connect(dsn)
+    try:
+        rows: Final = await connection.fetch('SELECT version_num FROM alembic_version')
+    except UndefinedTableError:
+        return frozenset()
+    finally:
+        await connection.close()
+    return frozenset(row['version_num'] for row in rows)
+
+#####################################################################################################
+
+def is_db_at_head(app_settings: AppSettings) -> bool:
+    """Compare alembic_version with the packaged head by one query, without Alembic."""
+    dsn: Final = get_db_url_from_app_settings(app_settings, use_db_admin_credentials=True).replace('+asyncpg', '', 1)
+    return _asyncio_run(_fetch_db_revisions(dsn)) == {DB_HEAD_REVISION}
+
+#####################################################################################################
+
+def upgrade_db_to_head_if_needed(app_settings: AppSettings, logger: Logger) -> None:
+    try:
+        if is_db_at_head(app_settings):
+            logger.info(f'Database is at the head revision {DB_HEAD_REVISION}, no migrations to run')
+            return
+    except (OSError, PostgresError) as exc:
+        # Alembic reports the problem, if it is not a transient one
+        logger.warning(f'Cannot check the database revision, running migrations: {exc!r}')
+
+    from l7x.utils.alembic_utils import upgrade_db_to_head  # noqa: WPS433 # pylint: disable=import-outside-toplevel
+
+    logger.info(f'Upgrading the database to the head revision {DB_HEAD_REVISION}')
+    upgrade_db_to_head(app_settings)
+
+#####################################################################################################
@@ -0,0 +1,74 @@
+#####################################################################################################
+
+from asyncio import gather, get_running_loop
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context as _multiprocessing_get_context
+from typing import Final
+
+#####################################################################################################
+
+# (recognized text, fixed text)
+TextPair = tuple[str, str | None]
+
+#####################################################################################################
+
+def levenshtein_distance(source: str, target: str) -> int:
+    """Character edits (insertions, deletions, substitutions) turning source into target."""
+    if len(source) < len(target):
+        source, target = target, source
+    previous_row: list[int] = list(range(len(target) + 1))
+    for source_index, source_char in enumerate(source, start=1):
+        current_row = [source_index]
+        for target_index, target_char in enumerate(target, start=1):
+            current_row.append(min(
+                previous_row[target_index] + 1,
+                current_row[target_index - 1] + 1,
+                previous_row[target_index - 1] + (source_char != target_char),
+            ))
+        previous_row = current_row
+    return previous_row[-1]
+
+#####################################################################################################
+
+def _edit_distances(pairs: Sequence[TextPair]) -> list[int]:
+    return [levenshtein_distance(recognized, fixed or '') for recognized, fixed in pairs]
+
+#####################################################################################################
+
+class EditDistanceCalculator:
+    """Edit distances of the shown recognition errors, computed by a process pool out of the event loop."""
+
+    #####################################################################################################
+
+    def __init__(self, max_workers: int) -> None:
+        self._max_workers: Final = max(max_workers, 1)
+        self._executor: ProcessPoolExecutor | None = None
+
+    #####################################################################################################
+
+    async def calculate(self, pairs: Sequence[TextPair]) -> list[int]:
+        if not pairs:
+            return []
+        if self._executor is None:
+            # the workers are spawned on the first use, the pool is not needed without the admin page
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=_multiprocessing_get_context('spawn'),
+            )
+        chunk_size: Final = -(-len(pairs) // self._max_workers)
+        chunks: Final = [pairs[index:index + chunk_size] for index in range(0, len(pairs), chunk_size)]
+        loop: Final = get_running_loop()
+        chunks_distances: Final = await gather(*(
+            loop.run_in_executor(self._executor, _edit_distances, list(chunk)) for chunk in chunks
+        ))
+        return [distance for chunk_distances in chunks_distances for distance in chunk_distances]
+
+    #####################################################################################################
+
+    def shutdown(self, /) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+#####################################################################################################
@@ -0,0 +1,167 @@
+#####################################################################################################
+
+from collections.abc import Hashable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from time import monotonic
+from typing import Any, Final, Protocol
+
+from nicegui.elements.table import Table
+from nicegui.events import GenericEventArguments
+
+#####################################################################################################
+
+# (sort timestamp, primary uuid) of a row, the uuid makes the order total
+RowKey = tuple[datetime, str]
+
+ROWS_PER_PAGE_OPTIONS: Final = (10, 25, 50, 100)
+
+_COUNT_CACHE_SEC: Final = 60.0
+_COUNT_CACHE_MAX_ENTRIES: Final = 256
+
+#####################################################################################################
+
+@dataclass(frozen=True, slots=True)
+class KeysetPage:
+    rows: Sequence[Mapping[str, Any]]
+    last_key: RowKey | None
+
+#####################################################################################################
+
+class PageSource(Protocol):
+    """Filtered rows of a table, equal sources share the cached count."""
+
+    async def fetch_page(self, *, after: RowKey | None, offset: int, limit: int, descending: bool) -> KeysetPage:
+        """Rows after the key (or after offset rows when there is no key) in the sort order."""
+
+    async def count(self, /) -> int:
+        ...
+
+#####################################################################################################
+
+_COUNTS: Final[dict[Hashable, tuple[float, int]]] = {}
+
+#####################################################################################################
+
+async def _cached_count(source: PageSource, *, is_force: bool = False) -> int:
+    cur_ts: Final = monotonic()
+    cached: Final = _COUNTS.get(source)
+    if cached is not None and cached[0] > cur_ts and not is_force:
+        return cached[1]
+
+    count: Final = await source.count()
+    _COUNTS.pop(source, None)
+    _COUNTS[source] = (cur_ts + _COUNT_CACHE_SEC, count)
+    if len(_COUNTS) > _COUNT_CACHE_MAX_ENTRIES:
+        _COUNTS.pop(next(iter(_COUNTS)))
+    return count
+
+#####################################################################################################
+
+class KeysetTable:
+    """
+    Server side pagination of ui.table, the table requests only the shown page.
+
+    A page is read after the key of the last row of the previous page, so sequential paging does not
+    depend on the page number. Only a jump to a page which previous page was not shown is read by offset.
+    """
+
+    #####################################################################################################
+
+    def __init__(self, table: Table, *, sort_by: str, rows_per_page: int, descending: bool = True) -> None:
+        self._table: Final = table
+        self._sort_by: Final = sort_by
+        self._source: PageSource | None = None
+        # (descending, rows per page, page) -> key of the last row of the previous page
+        self._cursors: Final[dict[tuple[bool, int, int], RowKey]] = {}
+        table.props(f':rows-per-page-options="{list(ROWS_PER_PAGE_OPTIONS)}"')
+        table.pagination = {
+            'page': 1,
+            'rowsPerPage': rows_per_page,
+            'rowsNumber': 0,
+            'sortBy': sort_by,
+            'descending': descending,
+        }
+        table.on('request', self._on_request)
+
+    #####################################################################################################
+
+    @property
+    def source(self, /) -> PageSource | None:
+        return self._source
+
+    #####################################################################################################
+
+    async def set_source(self, source: PageSource | None) -> None:
+        """Show the first page of the new filtered rows, None shows an empty table."""
+        self._source = source
+        self._cursors.clear()
+        await self._load(page=1)
+
+    #####################################################################################################
+
+    async def reload(self, /) -> None:
+        """Show the current page again, after the rows were changed."""
+        self._cursors.clear()
+        await self._load(page=self._table.pagination.get('page', 1), is_force_count=True)
+
+    #####################################################################################################
+
+    async def _on_request(self, event: GenericEventArguments) -> None:
+        pagination: Final = event.args.get('pagination', {})
+        rows_per_page = pagination.get('rowsPerPage') or ROWS_PER_PAGE_OPTIONS[-1]
+        await self._load(
+            page=max(int(pagination.get('page', 1)), 1),
+            rows_per_page=min(int(rows_per_page), ROWS_PER_PAGE_OPTIONS[-1]),
+            # only the key column is sortable, other sort requests keep the order
+            descending=bool(pagination.get('descending')) if pagination.get('sortBy') == self._sort_by else None,
+        )
+
+    #####################################################################################################
+
+    async def _load(
+        self,
+        *,
+        page: int,
+        rows_per_page: int | None = None,
+        descending: bool | None = None,
+        is_force_count: bool = False,
+    ) -> None:
+        pagination: Final = dict(self._table.pagination)
+        rows_per_page = rows_per_page or pagination['rowsPerPage']
+        descending = descending if descending is not None else pagination['descending']
+
+        if self._source is None:
+            rows: Sequence[Mapping[str, Any]] = []
+            rows_number = 0
+        else:
+            rows_number = await _cached_count(self._source, is_force=is_force_count)
+            page = min(page, max((rows_number + rows_per_page - 1) // rows_per_page, 1))
+            cursor = self._cursors.get((descending, rows_per_page, page)) if page > 1 else None
+            keyset_page = await self._source.fetch_page(
+                after=cursor,
+                offset=0 if cursor is not None else (page - 1) * rows_per_page,
+                limit=rows_per_page,
+                descending=descending,
+            )
+            if keyset_page.last_key is not None:
+                self._cursors[(descending, rows_per_page, page + 1)] = keyset_page.last_key
+            rows = keyset_page.rows
+
+        pagination.update(
+            page=page,
+            rowsPerPage=rows_per_page,
+            rowsNumber=rows_number,
+            sortBy=self._sort_by,
+            descending=descending,
+        )
+        self._table.pagination = pagination
+        self._table.update_rows(list(rows))
+
+#####################################################################################################
+
+def keyset_columns(columns: Sequence[Mapping[str, Any]], sort_by: str) -> list[dict[str, Any]]:
+    """Columns of a server side paginated table, only the key column stays sortable."""
+    return [{**column, 'sortable': column['name'] == sort_by} for column in columns]
+
+#####################################################################################################
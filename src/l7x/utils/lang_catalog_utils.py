@@ -0,0 +1,245 @@
+#####################################################################################################
+
+from asyncio import CancelledError, Task, create_task, shield, sleep
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from contextlib import contextmanager, suppress
+from fcntl import LOCK_EX, LOCK_NB, LOCK_UN, flock
+from logging import Logger
+from os import O_CREAT, O_EXCL, O_WRONLY, fdopen, getpid, getuid, open as os_open, replace
+from pathlib import Path
+from stat import S_IMODE, S_IWGRP, S_IWOTH
+from time import time
+from types import MappingProxyType
+from typing import Any, Final
+
+from l7x.configs.constants import TRANSLATE_API_LANGS_CACHE_EXPIRE_WHEN_LIST_EMPTY_SEC
+from l7x.types.lang_services import EMPTY_LANGS, LanguageDetail
+from l7x.utils.orjson_utils import JSONDecodeError, orjson_dumps, orjson_loads
+
+#####################################################################################################
+
+FetchLangs = Callable[[], Awaitable[Mapping[str, LanguageDetail]]]
+
+_MAX_RETRY_SEC: Final = 10
+# the shared files are read and written only by the user of the app
+_SHARED_DIR_MODE: Final = 0o700
+_SHARED_FILE_MODE: Final = 0o600
+
+#####################################################################################################
+
+def _langs_to_json(langs: Mapping[str, LanguageDetail]) -> Mapping[str, Any]:
+    return {lang: {'code': detail.code, 'rtl': detail.rtl} for lang, detail in langs.items()}
+
+#####################################################################################################
+
+def _langs_from_json(langs: Mapping[str, Any]) -> Mapping[str, LanguageDetail]:
+    return {lang: LanguageDetail(code=detail['code'], rtl=detail['rtl']) for lang, detail in langs.items()}
+
+#####################################################################################################
+
+def _shared_path(shared_dir: Path | None, name: str, logger: Logger) -> Path | None:
+    """Path of the shared file in the private shared_dir, None when the directory can not be used."""
+    if shared_dir is None:
+        return None
+    try:
+        shared_dir.mkdir(mode=_SHARED_DIR_MODE, parents=True, exist_ok=True)
+        dir_stat: Final = shared_dir.stat()
+    except OSError as exc:
+        logger.warning(f'Languages catalog dir {shared_dir} is not available, the list is not shared: {exc!r}')
+        return None
+    if dir_stat.st_uid != getuid() or S_IMODE(dir_stat.st_mode) & (S_IWGRP | S_IWOTH):
+        logger.warning(f'Languages catalog dir {shared_dir} is not private to the user of the app, the list is not shared')
+        return None
+    return shared_dir / f'{name}.json'
+
+#####################################################################################################
+
+class LangCatalog:
+    """
+    Stale-while-revalidate cache of a languages list.
+
+    Only the first load is awaited by callers, the list is refreshed by the background task of start().
+    The fetched list is shared by all workers of the host through a file in shared_dir:
+    workers read the fresh list of the other workers and only the worker holding the file lock fetches it.
+    The file also survives restarts, so a starting worker serves the last known list (even expired) at once.
+    shared_dir is private to the user of the app, a directory writable by the others is not used.
+    """
+
+    #####################################################################################################
+
+    def __init__(
+        self,
+        name: str,
+        fetch_langs: FetchLangs,
+        *,
+        expire_sec: float,
+        shared_dir: Path | None,
+        logger: Logger,
+    ) -> None:
+        self._name: Final = name
+        self._fetch_langs: Final = fetch_langs
+        self._expire_sec: Final = expire_sec
+        self._logger: Final = logger
+        self._shared_path: Final = _shared_path(shared_dir, name, logger)
+        self._langs: Mapping[str, LanguageDetail] = EMPTY_LANGS
+        self._version = 0
+        self._is_loaded = False
+        self._next_update_ts = -1.0
+        self._refresh_task: Task[None] | None = None
+        self._task: Task[None] | None = None
+
+    #####################################################################################################
+
+    @property
+    def version(self, /) -> int:
+        """Changes every time the languages list is changed."""
+        return self._version
+
+    #####################################################################################################
+
+    def start(self, /) -> None:
+        """Load the last known list and start its refresh in background, without waiting for the backend."""
+        if not self._is_loaded:
+            self._load_snapshot()
+        if self._task is None:
+            self._task = create_task(self._refresh_periodically())
+
+    #####################################################################################################
+
+    async def stop(self, /) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except CancelledError:
+                pass
+            self._task = None
+
+    #####################################################################################################
+
+    async def get_langs(self, /) -> Mapping[str, LanguageDetail]:
+        """The current list, only the first load without a snapshot is awaited."""
+        if not self._is_loaded:
+            self._load_snapshot()
+        if not self._is_loaded:
+            await shield(self._start_refresh())
+        return self._langs
+
+    #####################################################################################################
+
+    async def _refresh_periodically(self, /) -> None:
+        while True:
+            if self._next_update_ts <= time():
+                try:
+                    await shield(self._start_refresh())
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    self._logger.warning(f'Failed to refresh {self._name} languages, stale list is used: {exc!r}')
+                    self._next_update_ts = time() + min(self._expire_sec, _MAX_RETRY_SEC)
+            await sleep(max(self._next_update_ts - time(), 1.0))
+
+    #####################################################################################################
+
+    def _start_refresh(self, /) -> Task[None]:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = create_task(self._refresh())
+        return self._refresh_task
+
+    #####################################################################################################
+
+    async def _refresh(self, /) -> None:
+        cur_ts: Final = time()
+
+        shared: Final = self._read_shared()
+        if shared is not None and shared[0] + self._expire_sec > cur_ts:
+            self._set_langs(shared[1], next_update_ts=shared[0] + self._expire_sec)
+            return
+
+        with self._refresh_lock() as is_locked:
+            if not is_locked and self._is_loaded:
+                # other worker is fetching the list right now, its result will be read from the shared file
+                self._next_update_ts = cur_ts + TRANSLATE_API_LANGS_CACHE_EXPIRE_WHEN_LIST_EMPTY_SEC
+                return
+
+            try:
+                langs = await self._fetch_langs()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                self._logger.warning(f'Failed to refresh {self._name} languages, stale list is used: {exc!r}')
+                self._next_update_ts = cur_ts + min(self._expire_sec, _MAX_RETRY_SEC)
+                self._is_loaded = True
+                return
+
+            if not langs:
+                self._next_update_ts = cur_ts + TRANSLATE_API_LANGS_CACHE_EXPIRE_WHEN_LIST_EMPTY_SEC
+                self._is_loaded = True
+                return
+
+            self._set_langs(langs, next_update_ts=cur_ts + self._expire_sec)
+            self._write_shared(cur_ts, langs)
+
+    #####################################################################################################
+
+    def _load_snapshot(self, /) -> None:
+        shared: Final = self._read_shared()
+        if shared is not None and shared[1]:
+            self._set_langs(shared[1], next_update_ts=shared[0] + self._expire_sec)
+            self._logger.info(f'Loaded {len(shared[1])} {self._name} languages from {self._shared_path}')
+
+    #####################################################################################################
+
+    def _set_langs(self, langs: Mapping[str, LanguageDetail], *, next_update_ts: float) -> None:
+        if langs != self._langs:
+            self._langs = MappingProxyType(dict(langs))
+            self._version += 1
+        self._next_update_ts = next_update_ts
+        self._is_loaded = True
+
+    #####################################################################################################
+
+    @contextmanager
+    def _refresh_lock(self, /) -> Iterator[bool]:
+        if self._shared_path is None:
+            yield True
+            return
+
+        lock_fd: Final = os_open(self._shared_path.with_suffix('.lock'), O_WRONLY | O_CREAT, _SHARED_FILE_MODE)
+        with fdopen(lock_fd, 'a') as lock_file:
+            try:
+                flock(lock_file, LOCK_EX | LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                flock(lock_file, LOCK_UN)
+
+    #####################################################################################################
+
+    def _read_shared(self, /) -> tuple[float, Mapping[str, LanguageDetail]] | None:
+        if self._shared_path is None:
+            return None
+        try:
+            shared: Final = orjson_loads(self._shared_path.read_bytes())
+            return float(shared['fetch_ts']), _langs_from_json(shared['langs'])
+        except FileNotFoundError:
+            return None
+        except (OSError, JSONDecodeError, KeyError, TypeError, ValueError) as exc:
+            self._logger.warning(f'Invalid shared {self._name} languages file {self._shared_path}: {exc!r}')
+            return None
+
+    #####################################################################################################
+
+    def _write_shared(self, fetch_ts: float, langs: Mapping[str, LanguageDetail]) -> None:
+        if self._shared_path is None:
+            return
+        tmp_path: Final = self._shared_path.with_suffix(f'.{getpid()}.tmp')
+        try:
+            with fdopen(os_open(tmp_path, O_WRONLY | O_CREAT | O_EXCL, _SHARED_FILE_MODE), 'wb') as tmp_file:
+                tmp_file.write(orjson_dumps({'fetch_ts': fetch_ts, 'langs': _langs_to_json(langs)}))
+            replace(tmp_path, self._shared_path)
+        except OSError as exc:
+            self._logger.warning(f'Failed to write shared {self._name} languages file {self._shared_path}: {exc!r}')
+            with suppress(OSError):
+                tmp_path.unlink()
+
+#####################################################################################################
@@ -0,0 +1,230 @@
+#####################################################################################################
+
+from collections import Counter
+from collections.abc import Collection, Iterable, Mapping
+from dataclasses import dataclass
+from math import exp, log
+from re import compile as _re_compile
+from time import monotonic, perf_counter
+from typing import Any, Final
+from unicodedata import name as _unicode_name
+
+#####################################################################################################
+
+_NGRAM_SIZES: Final = (1, 2, 3)
+_NON_LETTERS_PATTERN: Final = _re_compile(r'[\W\d_]+')
+
+# texts written in these scripts are identified without the model, when only one of the languages uses the script
+_SCRIPT_LANGS: Final[Mapping[str, frozenset[str]]] = {
+    'ARMENIAN': frozenset(('hy',)),
+    'BENGALI': frozenset(('bn', 'as')),
+    'GEORGIAN': frozenset(('ka',)),
+    'GREEK': frozenset(('el',)),
+    'GUJARATI': frozenset(('gu',)),
+    'GURMUKHI': frozenset(('pa',)),
+    'HANGUL': frozenset(('ko',)),
+    'HEBREW': frozenset(('he', 'yi')),
+    'HIRAGANA': frozenset(('ja',)),
+    'KATAKANA': frozenset(('ja',)),
+    'KHMER': frozenset(('km',)),
+    'LAO': frozenset(('lo',)),
+    'MYANMAR': frozenset(('my',)),
+    'SINHALA': frozenset(('si',)),
+    'TAMIL': frozenset(('ta',)),
+    'TELUGU': frozenset(('te',)),
+    'THAI': frozenset(('th',)),
+}
+
+#####################################################################################################
+
+@dataclass(frozen=True, slots=True)
+class LangGuess:
+    lang: str
+    confidence: float
+
+#####################################################################################################
+
+def _normalize_text(text: str) -> str:
+    return ' '.join(_NON_LETTERS_PATTERN.sub(' ', text.casefold()).split())
+
+#####################################################################################################
+
+def extract_ngrams(text: str) -> Counter[str]:
+    """Character n-grams of the letters of the text, words are padded with spaces."""
+    ngrams: Final[Counter[str]] = Counter()
+    for word in _normalize_text(text).split(' '):
+        if not word:
+            continue
+        padded_word = f' {word} '
+        for size in _NGRAM_SIZES:
+            ngrams.update(padded_word[pos:pos + size] for pos in range(len(padded_word) - size + 1))
+    ngrams.pop(' ', None)
+    return ngrams
+
+#####################################################################################################
+
+def _dominant_script(text: str) -> str | None:
+    scripts: Final[Counter[str]] = Counter(
+        _unicode_name(char, 'UNKNOWN').split(' ', 1)[0] for char in text if char.isalpha()
+    )
+    if not scripts:
+        return None
+    script, count = scripts.most_common(1)[0]
+    return script if count * 2 > sum(scripts.values()) else None
+
+#####################################################################################################
+
+class NgramLangIdentifier:
+    """
+    Compact character n-gram (naive Bayes) language identifier.
+
+    Every language keeps only max_ngrams_per_lang of its most frequent n-grams. The learned counts are
+    pruned to a multiple of it, and the model is rebuilt after rebuild_every_samples new samples or
+    rebuild_interval_sec, so identify() stays cheap while samples are learned.
+    """
+
+    #####################################################################################################
+
+    def __init__(
+        self,
+        *,
+        max_ngrams_per_lang: int = 1000,
+        min_text_ngrams: int = 8,
+        rebuild_every_samples: int = 100,
+        rebuild_interval_sec: float = 60.0,
+    ) -> None:
+        self._max_ngrams_per_lang: Final = max_ngrams_per_lang
+        self._max_counted_ngrams_per_lang: Final = max_ngrams_per_lang * 4
+        self._min_text_ngrams: Final = min_text_ngrams
+        self._rebuild_every_samples: Final = max(rebuild_every_samples, 1)
+        self._rebuild_interval_sec: Final = rebuild_interval_sec
+        self._counts: Final[dict[str, Counter[str]]] = {}
+        self._log_probs: dict[str, Mapping[str, float]] = {}
+        self._unseen_log_probs: dict[str, float] = {}
+        self._pending_samples = 0
+        self._built_ts = 0.0
+
+    #####################################################################################################
+
+    @property
+    def langs(self, /) -> frozenset[str]:
+        return frozenset(self._counts)
+
+    #####################################################################################################
+
+    def add_sample(self, *, lang: str, text: str) -> None:
+        if not lang:
+            return
+        ngrams: Final = extract_ngrams(text)
+        if not ngrams:
+            return
+        counts: Final = self._counts.setdefault(lang, Counter())
+        counts.update(ngrams)
+        if len(counts) > self._max_counted_ngrams_per_lang:
+            # the rare n-grams are dropped, the kept ones are more than the model uses
+            kept: Final = counts.most_common(self._max_counted_ngrams_per_lang // 2)
+            counts.clear()
+            counts.update(dict(kept))
+        self._pending_samples += 1
+
+    #####################################################################################################
+
+    def build(self, /) -> None:
+        """Rebuild the model from the learned samples at once, after the initial training."""
+        if self._pending_samples:
+            self._build()
+
+    #####################################################################################################
+
+    def _is_rebuild_needed(self, /) -> bool:
+        if not self._pending_samples:
+            return False
+        return (
+            not self._log_probs
+            or self._pending_samples >= self._rebuild_every_samples
+            or monotonic() - self._built_ts >= self._rebuild_interval_sec
+        )
+
+    #####################################################################################################
+
+    def _build(self, /) -> None:
+        log_probs: Final[dict[str, Mapping[str, float]]] = {}
+        unseen_log_probs: Final[dict[str, float]] = {}
+        for lang, counts in self._counts.items():
+            top_ngrams = counts.most_common(self._max_ngrams_per_lang)
+            # add-one smoothing over the kept n-grams
+            denominator = log(sum(count for _, count in top_ngrams) + self._max_ngrams_per_lang)
+            log_probs[lang] = {ngram: log(count + 1) - denominator for ngram, count in top_ngrams}
+            unseen_log_probs[lang] = -denominator
+        self._log_probs = log_probs
+        self._unseen_log_probs = unseen_log_probs
+        self._pending_samples = 0
+        self._built_ts = monotonic()
+
+    #####################################################################################################
+
+    def identify(self, text: str, langs: Collection[str]) -> LangGuess | None:
+        """
+        Most probable of the langs for the text.
+
+        None when the text is too short or when any of the langs has no model yet: a guess among
+        the known langs only would be confident for a text of an unknown one.
+        """
+        script: Final = _dominant_script(text)
+        if script is not None and script in _SCRIPT_LANGS:
+            script_langs = _SCRIPT_LANGS[script].intersection(langs)
+            if len(script_langs) == 1:
+                return LangGuess(lang=next(iter(script_langs)), confidence=1.0)
+
+        if self._is_rebuild_needed():
+            self._build()
+        candidates: Final = list(dict.fromkeys(langs))
+        if not candidates or any(lang not in self._log_probs for lang in candidates):
+            return None
+        ngrams: Final = extract_ngrams(text)
+        if sum(ngrams.values()) < self._min_text_ngrams:
+            return None
+        if len(candidates) == 1:
+            return LangGuess(lang=candidates[0], confidence=1.0)
+
+        scores: Final[dict[str, float]] = {}
+        for lang in candidates:
+            lang_log_probs = self._log_probs[lang]
+            unseen_log_prob = self._unseen_log_probs[lang]
+            scores[lang] = sum(lang_log_probs.get(ngram, unseen_log_prob) * count for ngram, count in ngrams.items())
+
+        best_lang: Final = max(scores, key=scores.__getitem__)
+        best_score: Final = scores[best_lang]
+        return LangGuess(lang=best_lang, confidence=1.0 / sum(exp(score - best_score) for score in scores.values()))
+
+#####################################################################################################
+
+def evaluate_identifier(
+    identifier: NgramLangIdentifier,
+    samples: Iterable[tuple[str, str]],
+    langs: Collection[str],
+    *,
+    min_confidence: float = 0.0,
+) -> Mapping[str, Any]:
+    """Offline accuracy and latency of the identifier over (lang, text) samples."""
+    total = 0
+    answered = 0
+    correct = 0
+    elapsed_sec = 0.0
+    for lang, text in samples:
+        total += 1
+        start_ts = perf_counter()
+        guess = identifier.identify(text, langs)
+        elapsed_sec += perf_counter() - start_ts
+        if guess is None or guess.confidence < min_confidence:
+            continue
+        answered += 1
+        correct += int(guess.lang == lang)
+    return {
+        'samples': total,
+        'coverage': answered / total if total else 0.0,
+        'accuracy': correct / answered if answered else 0.0,
+        'mean_latency_us': elapsed_sec / total * 1_000_000 if total else 0.0,
+    }
+
+#####################################################################################################
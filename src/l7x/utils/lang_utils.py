@@ -1,6 +1,6 @@
 from collections.abc import Mapping
 from logging import Logger
-from typing import Final, Callable
+from typing import Any, Final, Callable
 
 from nicegui.language import Language
 from nicegui import app as nicegui_app
@@ -77,9 +77,37 @@ _AVAILABLE_NICEGUI_LOCALES: Final[set] = {
 
 #####################################################################################################
 
-async def create_available_langs_list(app):
-    translator_available_langs: Mapping[str, LanguageDetail] = await app.languages_service.get_lang_options()
-    recognizer_available_langs: Mapping[str, LanguageDetail] = await app.rec_languages_service.get_recognizer_lang_options()
+_LangsVersions = tuple[int, int]
+_AvailableLangs = tuple[dict[str, str], dict[str, str]]
+
+#####################################################################################################
+
+class _LangOptionsCache:
+    """Ready to render languages lists, dropped when any of the languages catalogs is changed."""
+
+    def __init__(self) -> None:
+        self._versions: _LangsVersions | None = None
+        self._items: Final[dict[tuple[str, str], Any]] = {}
+
+    def get_or_create(self, versions: _LangsVersions, key: tuple[str, str], create: Callable[[], Any]) -> Any:
+        if versions != self._versions:
+            self._items.clear()
+            self._versions = versions
+        item = self._items.get(key)
+        if item is None:
+            item = self._items[key] = create()
+        return item
+
+# the cached lists are shared by all clients, they must not be modified
+_LANG_OPTIONS_CACHE: Final = _LangOptionsCache()
+
+#####################################################################################################
+
+def _create_available_langs(
+    logger: Logger,
+    translator_available_langs: Mapping[str, LanguageDetail],
+    recognizer_available_langs: Mapping[str, LanguageDetail],
+) -> _AvailableLangs:
     app_available_langs = [lang.value for lang in LKey]
     intersected_codes = set(translator_available_langs.keys()).intersection(recognizer_available_langs.keys()).intersection(app_available_langs)
     available_langs = {}
@@ -91,22 +119,70 @@ async def create_available_langs_list(app):
 
     sorted_available_langs = sorted(
         available_langs.items(),
-        key=lambda unsorted_lang: TKey[f'T_{unsorted_lang[1].upper()}'](app.logger, LKey('ru')).lower(),
+        key=lambda unsorted_lang: TKey[f'T_{unsorted_lang[1].upper()}'](logger, LKey('ru')).lower(),
     )
     available_langs = {sort_lang: sort_code for sort_lang, sort_code in sorted_available_langs}
     return available_langs, langs_directions
 
 #####################################################################################################
 
-async def create_lang_list(app: App) -> dict[str, str]:
-    _lang = app.app_settings.default_language_locale
-    available_langs, _ = await create_available_langs_list(app)
-    rus_available_langs = {}
+async def _get_available_langs(app) -> tuple[_LangsVersions, _AvailableLangs]:
+    translator_available_langs: Final = await app.languages_service.get_lang_options()
+    recognizer_available_langs: Final = await app.rec_languages_service.get_recognizer_lang_options()
+    versions: Final = (app.languages_service.catalog_version, app.rec_languages_service.catalog_version)
+    available_langs: Final = _LANG_OPTIONS_CACHE.get_or_create(
+        versions,
+        ('available', ''),
+        lambda: _create_available_langs(app.logger, translator_available_langs, recognizer_available_langs),
+    )
+    return versions, available_langs
+
+#####################################################################################################
+
+async def create_available_langs_list(app) -> _AvailableLangs:
+    _, available_langs = await _get_available_langs(app)
+    return available_langs
+
+#####################################################################################################
+
+def _create_localized_langs(logger: Logger, available_langs: Mapping[str, str], locale: str) -> dict[str, str]:
+    localized_langs = {}
     for code, en_lang_name in available_langs.items():
         tkey = TKey[f'T_{en_lang_name.upper()}']
-        rus_name = tkey(app.logger, LKey(_lang)).strip().title()
-        rus_available_langs[code] = rus_name
-    return rus_available_langs
+        orig_name = tkey(logger, LKey(code)).strip().title()
+        localized_lang_name = tkey(logger, LKey(locale)).strip().title()
+        if localized_lang_name == orig_name:
+            localized_langs[code] = orig_name
+        else:
+            localized_langs[code] = f'{localized_lang_name} ({orig_name})'
+    return localized_langs
+
+#####################################################################################################
+
+async def create_localized_langs_list(app, locale: str) -> dict[str, str]:
+    """Languages as "name in the locale (native name)", cached per catalogs version and locale."""
+    versions, (available_langs, _) = await _get_available_langs(app)
+    return _LANG_OPTIONS_CACHE.get_or_create(
+        versions,
+        ('localized', locale),
+        lambda: _create_localized_langs(app.logger, available_langs, locale),
+    )
+
+#####################################################################################################
+
+async def create_lang_list(app: App) -> dict[str, str]:
+    _lang = app.app_settings.default_language_locale
+    versions, (available_langs, _) = await _get_available_langs(app)
+
+    def _create_names() -> dict[str, str]:
+        rus_available_langs = {}
+        for code, en_lang_name in available_langs.items():
+            tkey = TKey[f'T_{en_lang_name.upper()}']
+            rus_name = tkey(app.logger, LKey(_lang)).strip().title()
+            rus_available_langs[code] = rus_name
+        return rus_available_langs
+
+    return _LANG_OPTIONS_CACHE.get_or_create(versions, ('names', _lang), _create_names)
 
 #####################################################################################################
 
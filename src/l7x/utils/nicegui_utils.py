@@ -6,17 +6,30 @@ from nicegui import events as _nicegui_events, ui
 from nicegui.elements.image import Image
 from nicegui.elements.textarea import Textarea
 
-from l7x.db import AudioModel, ConversationModel, TextModel, UserModel
+from l7x.db import AudioModel, ConversationModel, ConversationParticipantModel, TextModel, TextTranslationModel, UserModel
+from l7x.db.prepared_statements import UPDATE_PARTICIPANT_LANGS_BATCH
+from l7x.db.projections import has_conversation_texts
+from l7x.services.autodetect_lang_service import AutodetectLanguageService
 from l7x.services.recognize_service import PrivateRecognizeService
-from l7x.services.translation_service import PrivateTranslationService
+from l7x.services.segmented_translation_service import SegmentedTranslationService
 from l7x.types.language import LKey
 from l7x.types.localization import TKey
-from l7x.utils.conversation_utils import check_waiting_conversation
+from l7x.utils.conversation_utils import join_waiting_conversation
 from l7x.utils.datetime_utils import now_utc
-from l7x.utils.db_utils import SessionClosed, SessionNotFound, UserNotActive, check_valid_session
-from l7x.utils.lang_utils import create_available_langs_list
+from l7x.utils.db_utils import (
+    SessionClosed,
+    SessionNotFound,
+    UserNotActive,
+    check_valid_session,
+    insert_text,
+    update_text_fix,
+    update_text_translations,
+)
+from l7x.utils.lang_utils import create_available_langs_list, create_localized_langs_list
 from l7x.utils.orjson_utils import orjson_dumps_to_str
+from l7x.utils.scheduler_utils import OutboundScheduler, WorkPriority
 from l7x.utils.storage_utils import ConversationStorageHelper, Conversation
+from l7x.utils.write_behind_utils import WriteBehindBuffer
 
 #####################################################################################################
 
@@ -60,7 +73,10 @@ class GuiProcessor:
         self.session_uuid = session_uuid
         self.user = user
         self.recognizer: PrivateRecognizeService = app.recognize_service
-        self.translator: PrivateTranslationService = app.translation_service
+        self.translator: SegmentedTranslationService = app.translation_service
+        self.lang_detector: AutodetectLanguageService = app.autodetect_language_service
+        self.scheduler: OutboundScheduler = app.outbound_scheduler
+        self.write_behind: WriteBehindBuffer = app.write_behind
         self.storage = session_storage
         self.generator = None
         self.audio_recorder: AudioRecorder | None = None
@@ -138,14 +154,78 @@ class GuiProcessor:
 
     #####################################################################################################
 
-    async def _translate(self, text: str) -> str:
+    async def _translate(
+        self,
+        text: str,
+        *,
+        source_lang: str | None = None,
+        target_lang: str | None = None,
+        priority: WorkPriority = WorkPriority.INTERACTIVE,
+    ) -> str:
+        """Перевод с выбранного языка (или с source_lang) на язык собеседника (или на target_lang)."""
         if text == '':
             return ''
-        return await self.translator.translate(
-            text=text,
-            source_lang=self.selected_lang,
-            target_lang=self._interlocutor_lang,
+        async with self.scheduler.slot(priority):
+            return await self.translator.translate(
+                text=text,
+                source_lang=self.selected_lang if source_lang is None else source_lang,
+                target_lang=self._interlocutor_lang if target_lang is None else target_lang,
+            )
+
+    #####################################################################################################
+
+    async def _translate_for_listeners(self, text: str) -> dict[str, str]:
+        """
+        Перевод сообщения для всех остальных участников беседы.
+        Сообщение переводится по одному разу на каждый язык слушателей, а не для каждого слушателя.
+        """
+        target_langs: Final = [
+            lang for lang in self._conv_in_storage.get_listeners_langs(self.session_uuid) if lang != self.selected_lang
+        ]
+        if not target_langs and self._interlocutor_lang is not None:
+            target_langs.append(self._interlocutor_lang)
+        translated_texts: Final = await asyncio.gather(
+            *(self._translate(text=text, target_lang=lang) for lang in target_langs),
+        )
+        return dict(zip(target_langs, translated_texts))
+
+    #####################################################################################################
+
+    async def _retranslate(
+        self,
+        text: str,
+        *,
+        previous_text: str,
+        message: TextModel,
+        target_lang: str,
+        priority: WorkPriority = WorkPriority.INTERACTIVE,
+    ) -> str:
+        """Перевод отредактированного сообщения. На перевод отправляются только изменённые предложения."""
+        if text == '':
+            return ''
+        async with self.scheduler.slot(priority):
+            return await self.translator.retranslate(
+                text=text,
+                previous_text=previous_text,
+                source_lang=message.lang_from,
+                target_lang=target_lang,
+            )
+
+    #####################################################################################################
+
+    async def _retranslate_for_listeners(self, text: str, *, previous_text: str, message: TextModel) -> dict[str, str]:
+        """
+        Перевод отредактированного сообщения на все языки, на которые оно было переведено:
+        язык собеседника (lang_to) и языки остальных слушателей.
+        """
+        target_langs: Final = list(dict.fromkeys(
+            lang for lang in (message.lang_to, *self._conv_in_storage.get_translation_langs(message))
+            if lang != message.lang_from
+        ))
+        translated_texts: Final = await asyncio.gather(
+            *(self._retranslate(text, previous_text=previous_text, message=message, target_lang=lang) for lang in target_langs),
         )
+        return dict(zip(target_langs, translated_texts))
 
     #####################################################################################################
 
@@ -289,13 +369,14 @@ class GuiProcessor:
                     return
 
                 try:
-                    translated_text = await self._translate(text=recognized_text)
+                    translations = await self._translate_for_listeners(text=recognized_text)
                 except Exception as ex:
                     self.logger.error(f'Error when translate: {ex}')
                     await _deactivate_record(error_msg=True)
                     return
+                translated_text = translations.get(target_lang, next(iter(translations.values()), ''))
 
-                message = await TextModel(
+                message = await insert_text(TextModel(
                     create_ts=now_utc(),
                     audio_id=audio_uuid,
                     lang_from=source_lang,
@@ -303,8 +384,15 @@ class GuiProcessor:
                     recognized_text=recognized_text,
                     translated_text=translated_text,
                     owner_session_uuid=self.session_uuid,
-                    conversation_id=self.conversation  # TODO CHECK IF IT WILL WORK
-                ).upsert()
+                    conversation_id=self.conversation,
+                ))
+                if len(translations) > 1:
+                    # the translations are conversation content, they are not written behind
+                    await TextTranslationModel.objects.bulk_create([
+                        TextTranslationModel(text_id=message, lang_to=lang, translated_text=lang_translated_text)
+                        for lang, lang_translated_text in translations.items()
+                    ])
+                self._conv_in_storage.add_translations(message, translations)
                 self.messages.append(message)
                 # TODO попробовать все меседжи положить в общий список
                 self._conv_in_storage.messages.append(message)
@@ -373,24 +461,32 @@ class GuiProcessor:
             # TODO Обрабатываем поведение когда conversation у пользователя уже есть conversation
             self.conversation = conversation
             if not self.global_conv_storage.get_conv(self.conversation.primary_uuid):
-                self._conv_in_storage = self.global_conv_storage.create_conv(conv_id=self.conversation.primary_uuid)
+                self._conv_in_storage = self.global_conv_storage.create_conv(
+                    conv_id=self.conversation.primary_uuid,
+                    max_participants=self.conversation.max_participants,
+                )
                 self._conv_in_storage.add_session_to_conv(self.session_uuid)
             else:
                 self._conv_in_storage = self.global_conv_storage.get_conv(conv_id=self.conversation.primary_uuid)
         else:
             # TODO Обрабатываем поведение когда у пользователя нет conversation
-            conv = await check_waiting_conversation(session_id=self.session_uuid, user_id=self.user.primary_uuid)
+            conv = await join_waiting_conversation(session_id=self.session_uuid, user_id=self.user.primary_uuid)
             if conv is not None:
-                # Когда уже есть conversation на ожидании
+                # Когда уже есть conversation на ожидании, сессия уже добавлена в участники
                 self.conversation = conv
-                self.conversation.second_user_session = self.session_uuid
-                await self.conversation.upsert()
                 self._conv_in_storage = self.global_conv_storage.get_conv(self.conversation.primary_uuid)
                 self._conv_in_storage.add_session_to_conv(self.session_uuid)
             else:
                 # Когда создаём новый conversation
-                self.conversation = await ConversationModel(first_user_session=self.session_uuid).upsert()
-                self._conv_in_storage = self.global_conv_storage.create_conv(conv_id=self.conversation.primary_uuid)
+                self.conversation = await ConversationModel(
+                    first_user_session=self.session_uuid,
+                    max_participants=self.app.app_settings.conversation_max_participants,
+                ).upsert()
+                await ConversationParticipantModel(conversation_id=self.conversation, session_id=self.session_uuid).upsert()
+                self._conv_in_storage = self.global_conv_storage.create_conv(
+                    conv_id=self.conversation.primary_uuid,
+                    max_participants=self.conversation.max_participants,
+                )
                 self._conv_in_storage.add_session_to_conv(self.session_uuid)
         if self.storage is not None:
             if self.storage.get('elements'):
@@ -426,13 +522,8 @@ class GuiProcessor:
         await self.prepare_dialog_lang_selector()
         await self.lang_selector_target_handler(self.selected_lang)
 
-        messages = await TextModel.objects.filter(
-            conversation_id__primary_uuid=self.conversation.primary_uuid,
-        ).order_by( # .exclude(type='feedback')
-            'create_ts'
-        ).all()
-
-        if messages:
+        # the messages are rendered from the conversation storage, only their presence is checked
+        if await has_conversation_texts(self.conversation.primary_uuid):
             self.element('dialog_background').set_visibility(False)
             with self.element('chat'):
                 self.element('chat_messages').refresh()
@@ -444,18 +535,10 @@ class GuiProcessor:
 
     @check_session_exp
     async def create_localized_available_langs(self):
-        self.localized_available_langs = {}
-        for code, en_lang_name in self.available_langs.items():
-            tkey = TKey[f'T_{en_lang_name.upper()}']
-            orig_name = tkey(self.logger, LKey(code)).strip().title()
-            if self.selected_lang is not None:
-                localized_lang_name = tkey(self.logger, LKey(self.selected_lang)).strip().title()
-            else:
-                localized_lang_name = tkey(self.logger, LKey(self.base_lang)).strip().title()
-            if localized_lang_name == orig_name:
-                self.localized_available_langs[code] = orig_name
-            else:
-                self.localized_available_langs[code] = f'{localized_lang_name} ({orig_name})'
+        self.localized_available_langs = await create_localized_langs_list(
+            self.app,
+            self.selected_lang if self.selected_lang is not None else self.base_lang,
+        )
     #####################################################################################################
 
     @check_session_exp
@@ -503,6 +586,9 @@ class GuiProcessor:
             session_id=self.session_uuid,
             lang=lang,
         )
+        # the storage has the language for the dialog, the row is written behind, the last selection wins
+        participant: Final = (str(self.conversation.primary_uuid), str(self.session_uuid))
+        await self.write_behind.add(UPDATE_PARTICIPANT_LANGS_BATCH, (*participant, lang), key=participant)
         # await self.conversation.upsert(selected_lang=self.selected_lang)
 
     #####################################################################################################
@@ -574,13 +660,14 @@ class GuiProcessor:
             return
         async def set_new_text():
             corrected_text = pop_up_input.value
-            translated_corrected_text = await self._translate(corrected_text, client=client)
+            translations = await self._retranslate_for_listeners(corrected_text, previous_text=orig_text, message=text)
+            translated_corrected_text = translations.get(text.lang_to, text.translated_text)
 
-            await text.upsert(
-                fixed_text=corrected_text,
-                translated_text=translated_corrected_text,
-                edit_ts=now_utc(),
-            )
+            await update_text_fix(text, fixed_text=corrected_text, translated_text=translated_corrected_text)
+            if len(translations) > 1:
+                await update_text_translations(text, translations)
+            # слушатели видят исправленный перевод, а не сохранённый при создании сообщения
+            self._conv_in_storage.add_translations(text, translations)
 
             if isinstance(text_elem, Textarea):
                 text_elem.set_value(corrected_text)
@@ -629,16 +716,36 @@ class GuiProcessor:
 
     #####################################################################################################
 
+    async def _detect_input_lang(self, text: str) -> str | None:
+        """Язык введённого текста, выбранный язык, если язык не определён или недоступен."""
+        try:
+            detected_lang = await self.lang_detector.detect_language(text=text)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self.logger.warning(f'Language of the typed text is not detected: {exc!r}')
+            return self.selected_lang
+        if detected_lang and self.available_langs is not None and detected_lang in self.available_langs:
+            return detected_lang
+        return self.selected_lang
+
+    #####################################################################################################
+
     @check_session_exp
     async def input_text(self, text_elem, translated_elem):
         """Функция ввода отзыва. Создаёт модалку для ввода текста."""
         async def set_new_text():
             input_text = pop_up_input.value
-            translated_input_text = await self._translate(input_text, client=True)
+            # отзыв могут написать не на выбранном языке
+            input_lang = await self._detect_input_lang(input_text) if input_text else self.selected_lang
+            translated_input_text = await self._translate(
+                input_text,
+                source_lang=input_lang,
+                target_lang=self.base_lang,
+                priority=WorkPriority.BACKGROUND,
+            )
 
             self.review = await TextModel(
                 create_ts=now_utc(),
-                lang_from=self.selected_lang,
+                lang_from=input_lang,
                 lang_to=self.base_lang,
                 recognized_text=input_text,
                 translated_text=translated_input_text,
@@ -712,7 +819,11 @@ class GuiProcessor:
                     await _deactivate_review_record(error_msg=True)
                     return
 
-                translated_review_text: Final = await self._translate(recognized_review_text, client=True)
+                translated_review_text: Final = await self._translate(
+                    recognized_review_text,
+                    target_lang=self.base_lang,
+                    priority=WorkPriority.BACKGROUND,
+                )
 
                 self.review = await TextModel(
                     create_ts=now_utc(),
@@ -101,7 +101,7 @@ async def chat_messages(gp, conv):
         # await self._add_dialog_msg(message)
         is_client = str(message.owner_session_uuid.primary_uuid) != gp.session_uuid
         ui.chat_message(
-            text=message.translated_text,
+            text=conv.get_translation(message, gp.selected_lang) if is_client else message.translated_text,
             sent=is_client,
         )
 
@@ -0,0 +1,74 @@
+#####################################################################################################
+
+from datetime import datetime, timedelta
+from logging import Logger
+from typing import Final
+
+from databases import Database
+
+from l7x.configs.constants import PARTITIONS_ADVISORY_LOCK_KEY
+
+#####################################################################################################
+
+# tables range partitioned by month of create_ts, see the migration d9a2c4e6f813
+PARTITIONED_TABLES: Final = ('texts', 'audio')
+
+# there is no DEFAULT partition, an insert after the last partition fails, so the coverage is alerted early
+MIN_PARTITIONS_COVERAGE: Final = timedelta(days=31)
+
+# the upper bound of the last partition, parsed from "FOR VALUES FROM ('...') TO ('...')"
+_PARTITIONS_END_QUERY: Final = r'''
+SELECT max((regexp_match(pg_get_expr(c.relpartbound, c.oid), 'TO \(''([^'']+)''\)'))[1]::timestamptz)
+FROM pg_inherits AS i
+JOIN pg_class AS c ON c.oid = i.inhrelid
+WHERE i.inhparent = to_regclass(:table_name)
+'''
+
+#####################################################################################################
+
+async def create_future_partitions(database: Database, months_ahead: int) -> int | None:
+    """
+    Create the missing monthly partitions up to months_ahead months after the current one.
+
+    Returns the count of the created partitions, None when another worker holds the lock.
+    """
+    async with database.transaction():
+        is_lock_acquired: Final = await database.fetch_val(
+            'SELECT pg_try_advisory_xact_lock(:lock_key)',
+            values={'lock_key': PARTITIONS_ADVISORY_LOCK_KEY},
+        )
+        if not is_lock_acquired:
+            return None
+
+        created_count = 0
+        for table_name in PARTITIONED_TABLES:
+            created_count += await database.fetch_val(
+                'SELECT l7x_create_monthly_partitions(:table_name, now(), :months_ahead)',
+                values={'table_name': table_name, 'months_ahead': months_ahead},
+            )
+        return created_count
+
+#####################################################################################################
+
+async def fetch_partitions_end(database: Database) -> dict[str, datetime | None]:
+    """The end of the last partition of each partitioned table, None for a table without partitions."""
+    return {
+        table_name: await database.fetch_val(_PARTITIONS_END_QUERY, values={'table_name': table_name})
+        for table_name in PARTITIONED_TABLES
+    }
+
+#####################################################################################################
+
+async def check_partitions_coverage(database: Database, logger: Logger, now: datetime) -> bool:
+    """Log an error for every table with partitions ending in less than MIN_PARTITIONS_COVERAGE, returns whether all are covered."""
+    is_covered = True
+    for table_name, partitions_end in (await fetch_partitions_end(database)).items():
+        if partitions_end is None or partitions_end - now < MIN_PARTITIONS_COVERAGE:
+            is_covered = False
+            logger.error(
+                f'Partitions of "{table_name}" end at {partitions_end}, less than {MIN_PARTITIONS_COVERAGE} ahead, '
+                + 'the inserts fail after the end: check the partitions_check job',
+            )
+    return is_covered
+
+#####################################################################################################
@@ -1,9 +1,15 @@
 #####################################################################################################
 
+from asyncio import gather, get_running_loop
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 from logging import Logger
+from multiprocessing import cpu_count, get_context as _multiprocessing_get_context
+from os import sysconf
 from typing import Final
 
 from argon2 import Parameters, PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from argon2.low_level import Type
 from argon2.profiles import CHEAPEST
 
@@ -11,10 +17,15 @@ from l7x.configs.settings import AppSettings
 
 #####################################################################################################
 
-def create_password_hasher(settings: AppSettings, logger: Logger) -> PasswordHasher:
+# the parallel hashes take at most this share of the available memory
+_HASHING_MEMORY_SHARE: Final = 0.5
+
+#####################################################################################################
+
+def create_password_hasher_parameters(settings: AppSettings, logger: Logger) -> Parameters:
     if settings.is_dev_mode:
         logger.warning('Using CHEAPEST password hasher for debug purpose')
-    params: Final = CHEAPEST if settings.is_dev_mode else Parameters(
+    return CHEAPEST if settings.is_dev_mode else Parameters(
         type=Type.ID,
         version=19,
         salt_len=settings.pwd_salt_len,
@@ -23,6 +34,57 @@ def create_password_hasher(settings: AppSettings, logger: Logger) -> PasswordHas
         memory_cost=settings.pwd_memory_cost_kib,
         parallelism=settings.pwd_parallelism,
     )
-    return PasswordHasher.from_parameters(params)
+
+#####################################################################################################
+
+def create_password_hasher(settings: AppSettings, logger: Logger) -> PasswordHasher:
+    return PasswordHasher.from_parameters(create_password_hasher_parameters(settings, logger))
+
+#####################################################################################################
+
+def password_hashing_workers(parameters: Parameters) -> int:
+    """Processes hashing at once: a hash takes memory_cost KiB and runs parallelism threads."""
+    by_cpu: Final = max((cpu_count() or 1) // max(parameters.parallelism, 1), 1)
+    try:
+        available_bytes = sysconf('SC_AVPHYS_PAGES') * sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError):
+        return 1
+    by_memory: Final = int(available_bytes * _HASHING_MEMORY_SHARE) // (parameters.memory_cost * 1024)
+    return max(min(by_cpu, by_memory), 1)
+
+#####################################################################################################
+
+def _hash_if_changed(parameters: Parameters, password: str, current_hash: str | None) -> str | None:
+    password_hasher: Final = PasswordHasher.from_parameters(parameters)
+    if current_hash is not None:
+        try:
+            password_hasher.verify(current_hash, password)
+        except (VerificationError, InvalidHashError):
+            pass
+        else:
+            if not password_hasher.check_needs_rehash(current_hash):
+                return None
+    return password_hasher.hash(password)
+
+#####################################################################################################
+
+async def hash_changed_passwords(
+    parameters: Parameters,
+    passwords: Sequence[tuple[str, str | None]],
+) -> list[str | None]:
+    """
+    Hash (password, current hash) pairs in a process pool bounded by the available memory.
+
+    None is returned for a password matching its current hash with the current parameters.
+    """
+    if not passwords:
+        return []
+    workers: Final = min(password_hashing_workers(parameters), len(passwords))
+    loop: Final = get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_multiprocessing_get_context('spawn')) as executor:
+        return list(await gather(*(
+            loop.run_in_executor(executor, _hash_if_changed, parameters, password, current_hash)
+            for password, current_hash in passwords
+        )))
 
 #####################################################################################################
@@ -0,0 +1,125 @@
+#####################################################################################################
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from logging import Logger
+from time import monotonic
+from typing import Final
+
+from databases import Database
+from databases.core import Connection
+from nicegui import app as nicegui_app
+
+from l7x.utils.db_pool_utils import MonitoredDatabase
+
+#####################################################################################################
+
+_LAG_CHECK_INTERVAL_SEC: Final = 5.0
+
+# no lag when the streaming replica replayed all received WAL, pg_last_xact_replay_timestamp grows on an idle primary;
+# without a streaming WAL receiver nothing more is received and the lag is unknown (NULL)
+_REPLICA_LAG_QUERY: Final = '''
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
+'''
+
+_READ_DATABASE: Final[ContextVar[Database | None]] = ContextVar('l7x_read_database', default=None)
+
+#####################################################################################################
+
+class RoutingDatabase(MonitoredDatabase):
+    """Primary database, the queries of the replica_reads blocks go to the read replica."""
+
+    def connection(self, /) -> Connection:
+        read_database: Final = _READ_DATABASE.get()
+        if read_database is not None:
+            return read_database.connection()
+        return super().connection()
+
+#####################################################################################################
+
+class ReadReplica:
+    """Read-only replica with the cached replication lag, unreachable replica or unknown lag is reported as stale."""
+
+    #####################################################################################################
+
+    def __init__(self, database: Database, logger: Logger) -> None:
+        self._database: Final = database
+        self._logger: Final = logger
+        self._lag_sec: float | None = None
+        self._next_check_ts = -1.0
+
+    #####################################################################################################
+
+    @property
+    def database(self, /) -> Database:
+        return self._database
+
+    #####################################################################################################
+
+    async def connect(self, /) -> None:
+        try:
+            await self._database.connect()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self._logger.warning(f'Read replica is not available, the primary database is used: {exc!r}')
+
+    #####################################################################################################
+
+    async def disconnect(self, /) -> None:
+        if self._database.is_connected:
+            await self._database.disconnect()
+
+    #####################################################################################################
+
+    async def is_fresh(self, max_staleness_sec: float) -> bool:
+        cur_ts: Final = monotonic()
+        if self._next_check_ts <= cur_ts:
+            self._next_check_ts = cur_ts + _LAG_CHECK_INTERVAL_SEC
+            self._lag_sec = await self._check_lag()
+        return self._lag_sec is not None and self._lag_sec <= max_staleness_sec
+
+    #####################################################################################################
+
+    async def _check_lag(self, /) -> float | None:
+        try:
+            if not self._database.is_connected:
+                await self._database.connect()
+            lag_sec = await self._database.fetch_val(_REPLICA_LAG_QUERY)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self._logger.warning(f'Read replica lag check failed, the primary database is used: {exc!r}')
+            return None
+        if lag_sec is None:
+            if self._lag_sec is not None:
+                self._logger.warning('Read replica does not stream WAL, the lag is unknown, the primary database is used')
+            return None
+        lag_sec = float(lag_sec)
+        if lag_sec != self._lag_sec:
+            self._logger.debug(f'Read replica lag: {lag_sec:.3f} sec')
+        return lag_sec
+
+#####################################################################################################
+
+@asynccontextmanager
+async def replica_reads(max_staleness_sec: float) -> AsyncIterator[bool]:
+    """
+    Queries of the block read from the replica when its lag is not above max_staleness_sec, otherwise from the primary.
+
+    Only read-only queries may run in the block, yields whether the replica is used.
+    """
+    read_replica: Final[ReadReplica | None] = getattr(nicegui_app, 'read_replica', None)
+    if read_replica is None or not await read_replica.is_fresh(max_staleness_sec):
+        yield False
+        return
+
+    token: Final = _READ_DATABASE.set(read_replica.database)
+    try:
+        yield True
+    finally:
+        _READ_DATABASE.reset(token)
+
+#####################################################################################################
@@ -0,0 +1,124 @@
+#####################################################################################################
+
+from asyncio import Future, get_running_loop
+from collections import deque
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum, unique
+from typing import Any, Final
+
+#####################################################################################################
+
+@unique
+class WorkPriority(IntEnum):
+    INTERACTIVE = 0  # live dialog messages, edits of the dialog messages
+    BACKGROUND = 1  # reviews, feedback
+
+#####################################################################################################
+
+@dataclass(slots=True)
+class _Waiter:
+    # the waiters of one priority are started by the deadline, the background deadline is max_delay_sec later
+    deadline_ts: float
+    future: Future[None] = field(repr=False)
+
+#####################################################################################################
+
+class OutboundScheduler:
+    """
+    Priority queue of the outbound backend work of one worker.
+
+    At most concurrency works are in flight, background work takes at most background_concurrency of them.
+    A free slot goes to the waiting work with the earliest deadline: the enqueue time of interactive work and
+    the enqueue time plus max_delay_sec of background work. So interactive work goes first, but background work
+    waiting for max_delay_sec goes before the later interactive work and is not starved under constant load.
+    """
+
+    #####################################################################################################
+
+    def __init__(self, *, concurrency: int, background_concurrency: int, max_delay_sec: float) -> None:
+        self._concurrency: Final = max(concurrency, 1)
+        # interactive work always has a slot of its own
+        self._background_concurrency: Final = max(min(background_concurrency, self._concurrency - 1), 1)
+        self._max_delay_sec: Final = max(max_delay_sec, 0.0)
+        self._waiters: Final[Mapping[WorkPriority, deque[_Waiter]]] = {priority: deque() for priority in WorkPriority}
+        self._active: Final[dict[WorkPriority, int]] = dict.fromkeys(WorkPriority, 0)
+        self._background_promoted = 0
+
+    #####################################################################################################
+
+    @asynccontextmanager
+    async def slot(self, priority: WorkPriority, /) -> AsyncIterator[None]:
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    #####################################################################################################
+
+    async def _acquire(self, priority: WorkPriority, /) -> None:
+        loop: Final = get_running_loop()
+        delay_sec: Final = self._max_delay_sec if priority is WorkPriority.BACKGROUND else 0.0
+        waiter: Final = _Waiter(deadline_ts=loop.time() + delay_sec, future=loop.create_future())
+        self._waiters[priority].append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except BaseException:
+            if not waiter.future.cancelled():
+                # the slot was given to the cancelled work, it goes to the next waiting work
+                self._release(priority)
+            elif waiter in self._waiters[priority]:
+                self._waiters[priority].remove(waiter)
+            raise
+
+    #####################################################################################################
+
+    def _release(self, priority: WorkPriority, /) -> None:
+        self._active[priority] -= 1
+        self._dispatch()
+
+    #####################################################################################################
+
+    def _dispatch(self, /) -> None:
+        while sum(self._active.values()) < self._concurrency:
+            priority = self._next_priority()
+            if priority is None:
+                return
+            waiter = self._waiters[priority].popleft()
+            if waiter.future.cancelled():
+                continue
+            self._active[priority] += 1
+            if priority is WorkPriority.BACKGROUND and self._waiters[WorkPriority.INTERACTIVE]:
+                # waited for max_delay_sec, started before the waiting interactive work
+                self._background_promoted += 1
+            waiter.future.set_result(None)
+
+    #####################################################################################################
+
+    def _next_priority(self, /) -> WorkPriority | None:
+        """Priority of the waiting work with the earliest deadline which may start now."""
+        candidates: Final = [
+            (waiters[0].deadline_ts, priority)
+            for priority, waiters in self._waiters.items()
+            if waiters and (
+                priority is not WorkPriority.BACKGROUND
+                or self._active[WorkPriority.BACKGROUND] < self._background_concurrency
+            )
+        ]
+        return min(candidates)[1] if candidates else None
+
+    #####################################################################################################
+
+    def stats(self, /) -> Mapping[str, Any]:
+        return {
+            'interactive_active': self._active[WorkPriority.INTERACTIVE],
+            'interactive_waiting': len(self._waiters[WorkPriority.INTERACTIVE]),
+            'background_active': self._active[WorkPriority.BACKGROUND],
+            'background_waiting': len(self._waiters[WorkPriority.BACKGROUND]),
+            'background_promoted': self._background_promoted,
+        }
+
+#####################################################################################################
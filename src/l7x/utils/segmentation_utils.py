@@ -0,0 +1,69 @@
+#####################################################################################################
+
+from re import compile as _re_compile
+from typing import Final
+
+#####################################################################################################
+
+# end of sentence punctuation (with closing quotes/brackets) followed by spaces, CJK punctuation needs no spaces
+_SENTENCE_BOUNDARY_PATTERN: Final = _re_compile(r'[.!?…]+["\'»”)\]]*\s+|[。！？]+\s*')
+
+# the word before a single period which does not end a sentence: "Dr. Smith", "p.m. today", "3. Mai"
+_NOT_ENDING_WORD_PATTERN: Final = _re_compile(r'(?:^|\s)(\w+(?:\.\w+)*)\.$')
+_ABBREVIATIONS: Final = frozenset((
+    'dr', 'mr', 'mrs', 'ms', 'prof', 'st', 'jr', 'sr', 'vs', 'no', 'nr', 'approx', 'ca', 'vol', 'fig',
+    'bzw', 'usw', 'mme', 'mlle', 'tel', 'ул', 'им', 'др', 'тел', 'стр', 'проф',
+))
+
+#####################################################################################################
+
+Segment = tuple[str, str]
+
+#####################################################################################################
+
+def _to_segment(chunk: str) -> Segment:
+    sentence: Final = chunk.rstrip()
+    return sentence, chunk[len(sentence):]
+
+#####################################################################################################
+
+def _is_sentence_end(chunk: str) -> bool:
+    """The chunk ending with a boundary ends a sentence, unless its last word is an abbreviation, a letter or a number."""
+    not_ending_word: Final = _NOT_ENDING_WORD_PATTERN.search(chunk.rstrip())
+    if not_ending_word is None:
+        return True
+    word: Final = not_ending_word.group(1)
+    return not ('.' in word or len(word) == 1 or word.isdigit() or word.casefold() in _ABBREVIATIONS)
+
+#####################################################################################################
+
+def split_sentences(text: str, min_chars: int = 0) -> list[Segment]:
+    """
+    Split text to (sentence, separator) pairs, joining all of them gives the original text back.
+
+    A text shorter than min_chars is not split, it is one segment.
+    """
+    if len(text) < min_chars:
+        return [_to_segment(text)] if text else []
+    segments: Final[list[Segment]] = []
+    start = 0
+    for boundary in _SENTENCE_BOUNDARY_PATTERN.finditer(text):
+        if not _is_sentence_end(text[start:boundary.end()]):
+            continue
+        segments.append(_to_segment(text[start:boundary.end()]))
+        start = boundary.end()
+    if start < len(text):
+        segments.append(_to_segment(text[start:]))
+    return segments
+
+#####################################################################################################
+
+def join_sentences(sentences: list[str], segments: list[Segment]) -> str:
+    return ''.join(sentence + separator for sentence, (_, separator) in zip(sentences, segments))
+
+#####################################################################################################
+
+def is_translatable(sentence: str) -> bool:
+    return any(char.isalnum() for char in sentence)
+
+#####################################################################################################
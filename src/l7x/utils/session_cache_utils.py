@@ -0,0 +1,180 @@
+#####################################################################################################
+
+from asyncio import CancelledError, Task, create_task, sleep
+from collections.abc import Mapping
+from dataclasses import dataclass
+from logging import Logger
+from time import monotonic
+from typing import Any, Final
+from uuid import UUID
+
+from asyncpg import Connection, connect as _asyncpg_connect
+
+#####################################################################################################
+
+SESSIONS_NOTIFY_CHANNEL: Final = 'l7x_sessions'
+SESSION_NOTIFY_PREFIX: Final = 'session:'
+USER_NOTIFY_PREFIX: Final = 'user:'
+
+_RECONNECT_DELAY_SEC: Final = 5.0
+
+#####################################################################################################
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class SessionState:
+    session_uuid: str
+    user_uuid: str
+    is_closed: bool
+    is_user_active: bool
+    is_superuser: bool
+
+#####################################################################################################
+
+class SessionCache:
+    """
+    Per worker cache of the sessions validity.
+
+    Entries live ttl_sec at most, changes of sessions and users are invalidated earlier
+    by the database notifications (see SessionInvalidationListener).
+    """
+
+    #####################################################################################################
+
+    def __init__(self, *, ttl_sec: float, max_entries: int) -> None:
+        self._ttl_sec: Final = ttl_sec
+        self._max_entries: Final = max_entries
+        self._entries: Final[dict[str, tuple[float, SessionState]]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._generation = 0
+
+    #####################################################################################################
+
+    @property
+    def is_enabled(self, /) -> bool:
+        return self._ttl_sec > 0 and self._max_entries > 0
+
+    #####################################################################################################
+
+    @property
+    def generation(self, /) -> int:
+        """Changes on every invalidation, states loaded before the change must not be put."""
+        return self._generation
+
+    #####################################################################################################
+
+    def get(self, session_uuid: str | UUID) -> SessionState | None:
+        entry: Final = self._entries.get(str(session_uuid))
+        if entry is None or entry[0] <= monotonic():
+            self._misses += 1
+            return None
+        self._hits += 1
+        return entry[1]
+
+    #####################################################################################################
+
+    def put(self, state: SessionState, *, generation: int) -> None:
+        if not self.is_enabled or generation != self._generation:
+            return
+        self._entries.pop(state.session_uuid, None)
+        self._entries[state.session_uuid] = (monotonic() + self._ttl_sec, state)
+        if len(self._entries) > self._max_entries:
+            self._entries.pop(next(iter(self._entries)))
+
+    #####################################################################################################
+
+    def invalidate(self, session_uuid: str | UUID) -> None:
+        self._generation += 1
+        if self._entries.pop(str(session_uuid), None) is not None:
+            self._invalidations += 1
+
+    #####################################################################################################
+
+    def invalidate_user(self, user_uuid: str | UUID) -> None:
+        user_uuid_str: Final = str(user_uuid)
+        self._generation += 1
+        for session_uuid in [key for key, (_, state) in self._entries.items() if state.user_uuid == user_uuid_str]:
+            self.invalidate(session_uuid)
+
+    #####################################################################################################
+
+    def clear(self, /) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    #####################################################################################################
+
+    def stats(self, /) -> Mapping[str, Any]:
+        return {
+            'entries': len(self._entries),
+            'hits': self._hits,
+            'misses': self._misses,
+            'invalidations': self._invalidations,
+        }
+
+#####################################################################################################
+
+class SessionInvalidationListener:
+    """LISTEN to the sessions/users changes notifications and drop the changed entries of the cache."""
+
+    #####################################################################################################
+
+    def __init__(self, dsn: str, session_cache: SessionCache, logger: Logger) -> None:
+        self._dsn: Final = dsn
+        self._session_cache: Final = session_cache
+        self._logger: Final = logger
+        self._task: Task[None] | None = None
+
+    #####################################################################################################
+
+    def start(self, /) -> None:
+        if self._task is None and self._session_cache.is_enabled:
+            self._task = create_task(self._listen())
+
+    #####################################################################################################
+
+    async def stop(self, /) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except CancelledError:
+            pass
+        self._task = None
+
+    #####################################################################################################
+
+    def _on_notify(self, _connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        if payload.startswith(SESSION_NOTIFY_PREFIX):
+            self._session_cache.invalidate(payload.removeprefix(SESSION_NOTIFY_PREFIX))
+        elif payload.startswith(USER_NOTIFY_PREFIX):
+            self._session_cache.invalidate_user(payload.removeprefix(USER_NOTIFY_PREFIX))
+        else:
+            self._session_cache.clear()
+
+    #####################################################################################################
+
+    async def _listen(self, /) -> None:
+        while True:
+            connection: Connection | None = None
+            try:
+                connection = await _asyncpg_connect(self._dsn)
+                await connection.add_listener(SESSIONS_NOTIFY_CHANNEL, self._on_notify)
+                # notifications could be missed while there was no connection
+                self._session_cache.clear()
+                while not connection.is_closed():
+                    await sleep(_RECONNECT_DELAY_SEC)
+            except CancelledError:
+                raise
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                self._logger.warning(f'Sessions notifications listener failed, reconnecting: {exc!r}')
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            # without notifications the entries must not outlive the connection loss
+            self._session_cache.clear()
+            await sleep(_RECONNECT_DELAY_SEC)
+
+#####################################################################################################
@@ -0,0 +1,80 @@
+#####################################################################################################
+
+from collections.abc import Awaitable, Callable
+from hashlib import sha256
+from logging import Logger
+from pathlib import Path
+from typing import Final
+
+from databases import Database
+
+from l7x.configs.constants import STARTUP_TASKS_ADVISORY_LOCK_KEY
+
+#####################################################################################################
+
+_GET_RUN_KEY_QUERY: Final = 'SELECT run_key FROM startup_runs WHERE name = :name'
+
+_SET_RUN_KEY_QUERY: Final = '''
+INSERT INTO startup_runs (name, run_key, run_ts) VALUES (:name, :run_key, now())
+ON CONFLICT (name) DO UPDATE SET run_key = excluded.run_key, run_ts = excluded.run_ts
+'''
+
+# the claim of a failed run is given back, unless another process has claimed a newer run key already
+_RESTORE_RUN_KEY_QUERY: Final = '''
+UPDATE startup_runs SET run_key = coalesce(:previous_run_key, '') WHERE name = :name AND run_key = :run_key
+'''
+
+#####################################################################################################
+
+def file_run_key(path: Path) -> str:
+    """Run key of a task importing the file, the task runs again only when the content is changed."""
+    return sha256(path.read_bytes()).hexdigest()
+
+#####################################################################################################
+
+async def _claim_run(database: Database, *, name: str, run_key: str) -> tuple[bool, str | None]:
+    """Set the run key of the task under the startup lock, returns (is_claimed, previous run key)."""
+    async with database.transaction():
+        await database.execute(
+            'SELECT pg_advisory_xact_lock(:lock_key)',
+            values={'lock_key': STARTUP_TASKS_ADVISORY_LOCK_KEY},
+        )
+        last_run_key: Final = await database.fetch_val(_GET_RUN_KEY_QUERY, values={'name': name})
+        if last_run_key == run_key:
+            return False, last_run_key
+        await database.execute(_SET_RUN_KEY_QUERY, values={'name': name, 'run_key': run_key})
+    return True, last_run_key
+
+#####################################################################################################
+
+async def run_startup_task(
+    database: Database,
+    logger: Logger,
+    *,
+    name: str,
+    run_key: str,
+    task: Callable[[], Awaitable[object]],
+) -> bool:
+    """
+    Run the task once for the run key (a start, a deployment, a file content) over all processes and hosts.
+
+    The startup advisory lock is held only to claim the run (the "last run" marker is set to the run key),
+    the task runs after the lock is released, so the other processes do not wait for it at boot and skip
+    the claimed task. A failed task gives its claim back, it is run again by the next start.
+    Returns whether the task was run.
+    """
+    is_claimed, previous_run_key = await _claim_run(database, name=name, run_key=run_key)
+    if not is_claimed:
+        logger.debug(f'Startup task "{name}" was already run for "{run_key}", skipped')
+        return False
+    try:
+        await task()
+    except Exception:
+        await database.execute(
+            _RESTORE_RUN_KEY_QUERY,
+            values={'name': name, 'run_key': run_key, 'previous_run_key': previous_run_key},
+        )
+        raise
+    return True
+
+#####################################################################################################
@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from dataclasses import asdict, dataclass, field
 from uuid import UUID
 
@@ -9,18 +10,38 @@ from l7x.db import TextModel
 @dataclass(kw_only=True)
 class Conversation:
     conv_id: str = None
+    max_participants: int = 2
 
-    first_user_session: str = None
-    first_user_lang: str = None
-
-    second_user_session: str = None
-    second_user_lang: str = None
+    # session id -> selected language, in the order of joining
+    participants: dict[str, str | None] = field(default_factory=dict)
 
     messages: list = field(default_factory=list)
+    # message id -> {listener language: translated text}
+    translations: dict[str, dict[str, str]] = field(default_factory=dict)
     shared_elements: dict = field(default_factory=dict)
     # messages_first_user: list = field(default_factory=list)
     # messages_second_user: list = field(default_factory=list)
 
+    def _session_by_index(self, index: int) -> str | None:
+        sessions = list(self.participants)
+        return sessions[index] if index < len(sessions) else None
+
+    @property
+    def first_user_session(self) -> str | None:
+        return self._session_by_index(0)
+
+    @property
+    def second_user_session(self) -> str | None:
+        return self._session_by_index(1)
+
+    @property
+    def first_user_lang(self) -> str | None:
+        return self.participants.get(self.first_user_session)
+
+    @property
+    def second_user_lang(self) -> str | None:
+        return self.participants.get(self.second_user_session)
+
     def add_elem(self, session_id: str, name: str, element):
         session_elements = self.shared_elements.get(session_id)
         if session_elements is None:
@@ -28,49 +49,53 @@ class Conversation:
             return
         session_elements[name] = element
 
+    def is_full(self) -> bool:
+        return len(self.participants) >= self.max_participants
+
     def add_session_to_conv(self, session_id: str) -> None:
-        if not self.first_user_session:
-            self.first_user_session = session_id
-        elif not self.second_user_session:
-            self.second_user_session = session_id
-        else:
-            raise ValueError('Conversation already has two users')
+        if session_id in self.participants:
+            return
+        if self.is_full():
+            raise ValueError(f'Conversation already has {self.max_participants} users')
+        self.participants[session_id] = None
 
     def set_user_lang(self, lang: str, session_id: str) -> None:
-        match session_id:
-            case self.first_user_session:
-                self.first_user_lang = lang
-            case self.second_user_session:
-                self.second_user_lang = lang
-            case _:
-                raise ValueError(f'There are no such session in current conversation "{session_id}"')
-
-    def get_interlocutor_lang_by_session(self, session_id: str) -> str:
-        """Отдаёт выбранный собеседником язык"""
-        match session_id:
-            case self.first_user_session:
-                return self.second_user_lang
-            case self.second_user_session:
-                return self.first_user_lang
+        if session_id not in self.participants:
+            raise ValueError(f'There are no such session in current conversation "{session_id}"')
+        self.participants[session_id] = lang
+
+    def get_interlocutor_lang_by_session(self, session_id: str) -> str | None:
+        """Отдаёт выбранный собеседником язык (первого из собеседников, если участников больше двух)"""
+        interlocutor_session_id = self.get_interlocutor_session_id(session_id)
+        return self.participants.get(interlocutor_session_id) if interlocutor_session_id is not None else None
+
+    def get_listeners_langs(self, session_id: str) -> tuple[str, ...]:
+        """Различные языки остальных участников: сообщение переводится по одному разу на каждый из них"""
+        return tuple({
+            lang: None for listener_session_id, lang in self.participants.items()
+            if listener_session_id != session_id and lang is not None
+        })
 
     def get_selected_lang_by_session(self, session_id: str) -> str | None:
-        match session_id:
-            case self.first_user_session:
-                return self.first_user_lang
-            case self.second_user_session:
-                return self.second_user_lang
+        return self.participants.get(session_id)
 
     def is_ready_to_start(self) -> bool:
-        """Ready, когда в conversation есть два пользователя с выбранным языком"""
+        """Ready, когда в conversation есть хотя бы два пользователя и все выбрали язык"""
 
-        return all(
-            (
-                self.first_user_session,
-                self.second_user_session,
-                self.first_user_lang,
-                self.second_user_lang,
-            )
-        )
+        return len(self.participants) >= 2 and all(self.participants.values())
+
+    def add_translations(self, message: TextModel, translations: dict[str, str]) -> None:
+        self.translations[str(message.primary_uuid)] = translations
+
+    def get_translation_langs(self, message: TextModel) -> tuple[str, ...]:
+        """Языки, на которые сообщение было переведено для слушателей"""
+        return tuple(self.translations.get(str(message.primary_uuid), {}))
+
+    def get_translation(self, message: TextModel, lang: str | None) -> str:
+        """Текст сообщения на языке слушателя"""
+        if lang is not None and lang == message.lang_from:
+            return message.fixed_text or message.recognized_text
+        return self.translations.get(str(message.primary_uuid), {}).get(lang, message.translated_text)
 
     def add_message(self, session_id: str, message: TextModel) -> None:
         if self.messages.get(session_id) is not None:
@@ -82,31 +107,29 @@ class Conversation:
         if self.messages.get(session_id):
             return self.messages[session_id].pop()
 
-    def get_interlocutor_session_id(self, client_session_id: str) -> str:
-        match client_session_id:
-            case self.first_user_session:
-                return self.second_user_session
-            case self.second_user_session:
-                return self.first_user_session
+    def get_interlocutor_session_id(self, client_session_id: str) -> str | None:
+        return next((session_id for session_id in self.participants if session_id != client_session_id), None)
 
     def get_direction_by_session(self, session_id: str) -> str | None:
-        match session_id:
-            case self.first_user_session:
+        if session_id not in self.participants:
+            return None
+        match list(self.participants).index(session_id):
+            case 0:
                 return 'First'
-            case self.second_user_session:
+            case 1:
                 return 'Second'
             case _:
-                return None
+                return 'Listener'
 
 class ConversationStorageHelper():
     def __init__(self, app: App):
         app.storage.general['conversations'] = {}
         self._storage = app.storage.general['conversations']
 
-    def create_conv(self, conv_id: str | UUID) -> Conversation:
+    def create_conv(self, conv_id: str | UUID, max_participants: int = 2) -> Conversation:
         if isinstance(conv_id, UUID):
             conv_id = str(conv_id)
-        conv = Conversation(conv_id=conv_id)
+        conv = Conversation(conv_id=conv_id, max_participants=max_participants)
         self._storage[conv_id] = conv
         return conv
 
@@ -115,6 +138,14 @@ class ConversationStorageHelper():
             conv_id = str(conv_id)
         return self._storage.get(conv_id)
 
+    def remove_convs(self, conv_ids: Iterable[str | UUID]) -> int:
+        """Forget the closed conversations, returns how many of them were in the storage"""
+        removed = 0
+        for conv_id in conv_ids:
+            if self._storage.pop(str(conv_id), None) is not None:
+                removed += 1
+        return removed
+
     def handle_select_lang(self, conv_id: str | UUID, session_id: str | UUID, lang: str) -> None:
         """Find the cur conversation and set selected language for desired session"""
         if isinstance(session_id, UUID):
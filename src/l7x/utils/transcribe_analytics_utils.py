@@ -1,67 +1,161 @@
 from collections.abc import Sequence
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Final
 
-from nicegui import ui
+from nicegui import app as nicegui_app, ui
 from nicegui.elements.date import Date
+from nicegui.elements.label import Label
 from nicegui.elements.select import Select
 from nicegui.elements.table import Table
 
-from l7x.db import TextModel
+from l7x.configs.constants import ADMIN_REPORT_MAX_STALENESS_SEC
+from l7x.db.projections import EditedTextRecord, count_edited_texts, fetch_edited_text_uuids, fetch_edited_texts
+from l7x.db.rollups import TextGroupTotals, TextTotals, fetch_text_groups, fetch_text_totals
 from l7x.types.localization import TKey
 from l7x.utils.conversation_utils import date_validator
 from l7x.utils.datetime_utils import format_datetime_to_iso, q_date_to_utc_datetime
+from l7x.utils.edit_distance_utils import EditDistanceCalculator
+from l7x.utils.keyset_pagination_utils import KeysetPage, KeysetTable, RowKey
 from l7x.utils.orjson_utils import orjson_dumps_to_str
 from l7x.utils.lang_utils import localize as _
+from l7x.utils.read_replica_utils import replica_reads
+
+
+def _text_to_row(text: EditedTextRecord, edit_distance: int) -> dict[str, str]:
+    # the distance relative to the recognized text length
+    edit_ratio: Final = edit_distance / max(len(text.recognized_text), 1)
+    return {
+        'primary_uuid': str(text.primary_uuid),
+        'create_date': format_datetime_to_iso(text.create_ts),
+        'transcribe_text': text.recognized_text,
+        'edited_text': text.fixed_text,
+        'edit_distance': f'{edit_distance} ({edit_ratio:.0%})',
+        'language': text.lang_from,
+        'audio_url': f'/api/audio_file/{text.audio_id}'
+    }
 
+#####################################################################################################
 
-async def get_edited_texts(
-    start_date: datetime,
-    end_date: datetime,
-    languages: Sequence[str] | None = None,
-):
-    filters = {
-        'create_ts__gte': start_date,
-        'create_ts__lte': end_date,
-        'audio_id__isnull': False,
-        'edit_ts__isnull': False,
+def _text_group_to_row(group: TextGroupTotals) -> dict[str, str | int]:
+    edited_ratio: Final = group.edited_audio_texts / group.audio_texts if group.audio_texts else 0
+    return {
+        'key': f'{group.department_name}:{group.lang_from}',
+        'department': group.department_name,
+        'language': group.lang_from,
+        'recognized_texts': group.audio_texts,
+        'edited_texts': f'{group.edited_audio_texts} ({edited_ratio:.1%})',
     }
-    if languages:
-        filters['lang_from__in'] = languages
-
-    texts: Final[Sequence[TextModel]] = await TextModel.objects.filter(
-        **filters
-    ).order_by(
-        ['create_ts'],
-    ).all()
-
-    rows = []
-
-    for text in texts:
-        rec_text = text.recognized_text.strip(),
-        fixed_text = text.fixed_text.strip()
-        if rec_text == fixed_text:
-            continue
-
-        row = {
-            'primary_uuid': str(text.primary_uuid),
-            'create_date': format_datetime_to_iso(text.create_ts),
-            'transcribe_text': text.recognized_text,
-            'edited_text': text.fixed_text,
-            'language': text.lang_from,
-            'audio_url': f'/api/audio_file/{text.audio_id.primary_uuid}'
-        }
-        rows.append(row)
-
-    return rows
+
+#####################################################################################################
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class EditedTextsPageSource:
+    """Edited texts with audio of the recognition errors table ordered by create_ts."""
+
+    start_date: datetime
+    end_date: datetime
+    languages: tuple[str, ...] = ()
+
+    #####################################################################################################
+
+    async def fetch_page(self, *, after: RowKey | None, offset: int, limit: int, descending: bool) -> KeysetPage:
+        async with replica_reads(ADMIN_REPORT_MAX_STALENESS_SEC):
+            texts: Final = await fetch_edited_texts(
+                start_date=self.start_date,
+                end_date=self.end_date,
+                languages=self.languages,
+                after=after,
+                offset=offset,
+                limit=limit,
+                descending=descending,
+            )
+
+        # only the shown rows are compared, out of the event loop
+        edit_distance_calculator: Final[EditDistanceCalculator] = nicegui_app.edit_distance_calculator
+        edit_distances: Final = await edit_distance_calculator.calculate(
+            [(text.recognized_text, text.fixed_text) for text in texts],
+        )
+
+        return KeysetPage(
+            rows=[_text_to_row(text, edit_distance) for text, edit_distance in zip(texts, edit_distances, strict=True)],
+            last_key=(texts[-1].create_ts, str(texts[-1].primary_uuid)) if texts else None,
+        )
+
+    #####################################################################################################
+
+    async def count(self, /) -> int:
+        async with replica_reads(ADMIN_REPORT_MAX_STALENESS_SEC):
+            return await count_edited_texts(start_date=self.start_date, end_date=self.end_date, languages=self.languages)
+
+    #####################################################################################################
+
+    async def fetch_uuids(self, /) -> Sequence[str]:
+        async with replica_reads(ADMIN_REPORT_MAX_STALENESS_SEC):
+            uuids: Final = await fetch_edited_text_uuids(
+                start_date=self.start_date,
+                end_date=self.end_date,
+                languages=self.languages,
+            )
+        return [str(uuid) for uuid in uuids]
+
+    #####################################################################################################
+
+    async def totals(self, /) -> TextTotals:
+        """Totals of the filter from the daily rollups."""
+        async with replica_reads(ADMIN_REPORT_MAX_STALENESS_SEC):
+            return await fetch_text_totals(
+                start_day=self.start_date.date(),
+                end_day=self.end_date.date(),
+                languages=self.languages,
+            )
+
+    #####################################################################################################
+
+    async def groups(self, /) -> list[TextGroupTotals]:
+        """Recognition errors of the filter by department and language from the daily rollups."""
+        async with replica_reads(ADMIN_REPORT_MAX_STALENESS_SEC):
+            return await fetch_text_groups(
+                start_day=self.start_date.date(),
+                end_day=self.end_date.date(),
+                languages=self.languages,
+            )
+
+#####################################################################################################
+
+def text_totals_to_str(totals: TextTotals) -> str:
+    # the recognition errors are the edited texts with audio
+    edited_ratio: Final = f' ({totals.edited_audio_texts / totals.audio_texts:.1%})' if totals.audio_texts else ''
+    return ' | '.join((
+        f'{_(TKey.A_RECOGNIZED_TEXT)}: {totals.audio_texts}',
+        f'{_(TKey.A_EDITED_TEXT)}: {totals.edited_audio_texts}{edited_ratio}',
+    ))
+
+#####################################################################################################
+
+async def update_text_stats(
+    stats_label: Label,
+    source: EditedTextsPageSource | None,
+    groups_table: Table | None = None,
+) -> None:
+    totals: Final = await source.totals() if source is not None else None
+    stats_label.set_visibility(totals is not None)
+    if totals is not None:
+        stats_label.set_text(text_totals_to_str(totals))
+    if groups_table is not None:
+        groups: Final = await source.groups() if source is not None else []
+        groups_table.set_visibility(bool(groups))
+        groups_table.update_rows([_text_group_to_row(group) for group in groups])
 
 #####################################################################################################
 
 async def update_filtered_audio_analysis(
     start_date_str: str,
     end_date_str: str,
-    audio_analysis_table: Table,
+    audio_analysis_table: KeysetTable,
     languages: Sequence[str] | None = None,
+    stats_label: Label | None = None,
+    groups_table: Table | None = None,
 ):
     if not await date_validator(start_date_str, end_date_str):
         return
@@ -70,22 +164,29 @@ async def update_filtered_audio_analysis(
     end_date = q_date_to_utc_datetime(end_date_str).replace(hour=23, minute=59, second=59)
     curr_date = datetime.now()
 
-    if start_date.date() > curr_date.date():
-        audio_analysis_table.update_rows([])
-        return
+    source: EditedTextsPageSource | None = None
+    if start_date.date() <= curr_date.date():
+        source = EditedTextsPageSource(
+            start_date=start_date,
+            end_date=end_date,
+            languages=tuple(languages or ()),
+        )
 
-    filtered_conversations_rows = await get_edited_texts(start_date, end_date, languages)
-    audio_analysis_table.update_rows(filtered_conversations_rows)
+    await audio_analysis_table.set_source(source)
+    if stats_label is not None:
+        await update_text_stats(stats_label, source, groups_table)
 
 #####################################################################################################
 
 async def clear_filter_audio_analysis(
     start_date: str,
     end_date: str,
-    audio_analysis_table: Table,
+    audio_analysis_table: KeysetTable,
     start_date_calendar: Date,
     end_date_calendar: Date,
     language_input: Select,
+    stats_label: Label | None = None,
+    groups_table: Table | None = None,
 ):
     start_date_calendar.set_value(start_date)
     end_date_calendar.set_value(end_date)
@@ -94,18 +195,22 @@ async def clear_filter_audio_analysis(
         start_date_str=start_date,
         end_date_str=end_date,
         audio_analysis_table=audio_analysis_table,
+        stats_label=stats_label,
+        groups_table=groups_table,
     )
 
 #####################################################################################################
 
-async def download_all_audio_cases(audio_analysis_table: Table, start_calendar, end_calendar):
+async def download_all_audio_cases(audio_analysis_table: KeysetTable, start_calendar, end_calendar):
     start_date: Final = start_calendar.value
     end_date: Final = end_calendar.value
 
     if not await date_validator(start_date, end_date):
         return
 
-    text_uuids = [text['primary_uuid'] for text in audio_analysis_table.rows]
+    # all texts of the filter, the table holds only the shown page
+    source: Final = audio_analysis_table.source
+    text_uuids = list(await source.fetch_uuids()) if isinstance(source, EditedTextsPageSource) else []
 
     async def _download_analysis():
         try:
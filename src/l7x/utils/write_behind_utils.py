@@ -0,0 +1,160 @@
+#####################################################################################################
+
+from asyncio import CancelledError, Event, Lock, Task, TimeoutError as AsyncTimeoutError, create_task, wait_for
+from collections.abc import Hashable, Sequence
+from logging import Logger
+from typing import Any, Final
+
+from l7x.db.prepared_statements import HOT_STATEMENTS, PreparedStatement
+
+#####################################################################################################
+
+_MAX_FLUSH_ATTEMPTS: Final = 3
+
+#####################################################################################################
+
+class _PendingRows:
+    """The rows of one statement, a row with a key replaces the pending row with the same key."""
+
+    #####################################################################################################
+
+    def __init__(self, /) -> None:
+        self.rows: Final[dict[Hashable, tuple[Any, ...]]] = {}
+        self.attempts = 0
+
+    #####################################################################################################
+
+    def add(self, row: tuple[Any, ...], key: Hashable | None) -> None:
+        if key is None:
+            key = object()
+        # the replaced row is moved to the end, the newer write of the key wins in the batch order
+        self.rows.pop(key, None)
+        self.rows[key] = row
+
+#####################################################################################################
+
+class WriteBehindBuffer:
+    """
+    Buffer of the writes nobody waits for and that may be lost (the participant languages).
+
+    The rows are flushed by one multi-row statement per statement kind, when max_rows rows are pending
+    or every flush_interval_sec. The statement gets every column as an array (see the *_BATCH statements
+    of l7x.db.prepared_statements). A failed batch is retried with the next flush, stop() flushes the rest.
+    The pending rows are lost when the process is killed, conversation content is never written here.
+    """
+
+    #####################################################################################################
+
+    def __init__(self, logger: Logger, *, max_rows: int, flush_interval_sec: float) -> None:
+        self._logger: Final = logger
+        self._max_rows: Final = max(max_rows, 1)
+        self._flush_interval_sec: Final = flush_interval_sec
+        self._pending: dict[PreparedStatement, _PendingRows] = {}
+        self._pending_count = 0
+        self._flush_lock: Final = Lock()
+        self._size_reached: Final = Event()
+        self._task: Task[None] | None = None
+
+    #####################################################################################################
+
+    @property
+    def is_enabled(self, /) -> bool:
+        return self._flush_interval_sec > 0
+
+    #####################################################################################################
+
+    @property
+    def pending_count(self, /) -> int:
+        return self._pending_count
+
+    #####################################################################################################
+
+    async def add(self, statement: PreparedStatement, row: Sequence[Any], *, key: Hashable | None = None) -> None:
+        """Queue the row, the statement is executed at once when the buffer is not started or disabled."""
+        if self._task is None:
+            await self._execute(statement, [tuple(row)])
+            return
+        pending_rows: Final = self._pending.setdefault(statement, _PendingRows())
+        count_before: Final = len(pending_rows.rows)
+        pending_rows.add(tuple(row), key)
+        self._pending_count += len(pending_rows.rows) - count_before
+        if self._pending_count >= self._max_rows:
+            self._size_reached.set()
+
+    #####################################################################################################
+
+    def start(self, /) -> None:
+        if self._task is None and self.is_enabled:
+            self._task = create_task(self._flush_periodically())
+
+    #####################################################################################################
+
+    async def stop(self, /) -> None:
+        """Stop the flushing task and flush the pending rows, called before the database is disconnected."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except CancelledError:
+                pass
+            self._task = None
+        await self.flush(is_final=True)
+
+    #####################################################################################################
+
+    async def flush(self, /, *, is_final: bool = False) -> None:
+        async with self._flush_lock:
+            self._size_reached.clear()
+            pending: Final = self._pending
+            self._pending = {}
+            self._pending_count = 0
+            batches: Final = list(pending.items())
+            for index, (statement, pending_rows) in enumerate(batches):
+                rows = list(pending_rows.rows.values())
+                try:
+                    await self._execute(statement, rows)
+                except CancelledError:
+                    # cancelled by stop(), the not flushed batches are flushed by its final flush
+                    for not_flushed_statement, not_flushed_rows in batches[index:]:
+                        self._requeue(not_flushed_statement, not_flushed_rows)
+                    raise
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    pending_rows.attempts += 1
+                    if is_final or pending_rows.attempts >= _MAX_FLUSH_ATTEMPTS:
+                        self._logger.error(
+                            f'Write-behind batch "{statement.name}" of {len(rows)} rows is dropped: {exc!r}',
+                        )
+                    else:
+                        self._logger.warning(f'Write-behind batch "{statement.name}" failed, retrying: {exc!r}')
+                        self._requeue(statement, pending_rows)
+
+    #####################################################################################################
+
+    def _requeue(self, statement: PreparedStatement, pending_rows: _PendingRows) -> None:
+        # the rows queued during the flush are newer than the requeued ones
+        newer_rows: Final = self._pending.pop(statement, None)
+        if newer_rows is not None:
+            self._pending_count -= len(newer_rows.rows)
+            for key, row in newer_rows.rows.items():
+                pending_rows.add(row, key)
+        self._pending[statement] = pending_rows
+        self._pending_count += len(pending_rows.rows)
+
+    #####################################################################################################
+
+    async def _execute(self, statement: PreparedStatement, rows: Sequence[tuple[Any, ...]]) -> None:
+        # row tuples -> column arrays
+        await HOT_STATEMENTS.execute(statement, *(list(column) for column in zip(*rows, strict=True)))
+
+    #####################################################################################################
+
+    async def _flush_periodically(self, /) -> None:
+        while True:
+            try:
+                await wait_for(self._size_reached.wait(), timeout=self._flush_interval_sec)
+            except AsyncTimeoutError:
+                pass
+            if self._pending_count:
+                await self.flush()
+
+#####################################################################################################
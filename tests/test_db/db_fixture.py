@@ -0,0 +1,51 @@
+#####################################################################################################
+
+from collections.abc import AsyncIterator
+from dataclasses import replace
+from os import getenv
+from typing import Final
+
+import pytest
+from databases import Database
+from sqlalchemy.exc import OperationalError
+
+from l7x.configs.settings import AppSettings, create_app_settings
+from l7x.db.db_utils import get_db_url_from_app_settings
+from l7x.utils.alembic_utils import upgrade_db_to_head
+from l7x.utils.db_pool_utils import create_database, create_db_pool_config
+
+#####################################################################################################
+
+# only a dedicated local database is used, the tests migrate it to the head and write to it
+_LOCAL_DB_HOSTS: Final = frozenset(('127.0.0.1', 'localhost'))
+_TEST_DB_NAME_ENV: Final = 'L7X_TEST_DB_NAME'
+_TEST_DB_NAME_SUFFIX: Final = '_test'
+
+#####################################################################################################
+
+@pytest.fixture(scope='session')
+def local_db_settings() -> AppSettings:
+    test_db_name: Final = getenv(_TEST_DB_NAME_ENV, '').strip()
+    if not test_db_name.endswith(_TEST_DB_NAME_SUFFIX):
+        pytest.skip(f'{_TEST_DB_NAME_ENV} "{test_db_name}" is not a test database name ending with "{_TEST_DB_NAME_SUFFIX}"')
+    app_settings: Final = replace(create_app_settings(include_db_admin_credentials=True), db_name=test_db_name)
+    if app_settings.db_host not in _LOCAL_DB_HOSTS:
+        pytest.skip(f'L7X_DB_HOST "{app_settings.db_host}" is not a local database')
+    try:
+        upgrade_db_to_head(app_settings)
+    except (OSError, OperationalError) as err:
+        pytest.skip(f'Local database is not available: {err!r}')
+    return app_settings
+
+#####################################################################################################
+
+@pytest.fixture()
+async def local_db(local_db_settings: AppSettings) -> AsyncIterator[Database]:
+    database: Final = create_database(
+        get_db_url_from_app_settings(local_db_settings, use_db_admin_credentials=True),
+        create_db_pool_config(local_db_settings),
+    )
+    async with database:
+        yield database
+
+#####################################################################################################
@@ -0,0 +1,15 @@
+#####################################################################################################
+
+from typing import Final
+
+from l7x.alembic.head import DB_HEAD_REVISION
+from l7x.alembic.migrations import MIGRATIONS
+
+#####################################################################################################
+
+def test_packaged_head_revision_is_the_migrations_head() -> None:
+    down_revisions: Final = {migration.down_revision for migration in MIGRATIONS}
+    heads: Final = {migration.revision for migration in MIGRATIONS} - down_revisions
+    assert heads == {DB_HEAD_REVISION}
+
+#####################################################################################################
@@ -0,0 +1,51 @@
+#####################################################################################################
+
+from typing import Final
+
+from l7x.db.bulk_import import (
+    _DEPARTMENT_UPDATED_COLUMNS,
+    _USER_PROFILE_COLUMNS,
+    _USER_UPDATED_COLUMNS,
+    DEPARTMENT_COLUMNS,
+    USER_COLUMNS,
+    _merge_sql,
+)
+
+#####################################################################################################
+
+def _normalize(sql: str) -> str:
+    return ' '.join(sql.split())
+
+#####################################################################################################
+
+def test_merge_sql_updates_only_distinct_rows() -> None:
+    sql: Final = _normalize(_merge_sql('departments', 'departments_import', DEPARTMENT_COLUMNS, _DEPARTMENT_UPDATED_COLUMNS))
+
+    assert sql == (
+        'INSERT INTO departments (primary_uuid, name, address, timezone) '
+        + 'SELECT primary_uuid, name, address, timezone FROM departments_import '
+        + 'ON CONFLICT (primary_uuid) DO UPDATE '
+        + 'SET (name, address, timezone) = ROW(excluded.name, excluded.address, excluded.timezone) '
+        + 'WHERE (departments.name, departments.address, departments.timezone) '
+        + 'IS DISTINCT FROM (excluded.name, excluded.address, excluded.timezone)'
+    )
+
+#####################################################################################################
+
+def test_merge_sql_keeps_user_access_unless_overwritten() -> None:
+    profile_sql: Final = _normalize(_merge_sql('users', 'users_import', USER_COLUMNS, _USER_PROFILE_COLUMNS))
+    set_clause: Final = profile_sql.split(' SET ', 1)[1]
+
+    # the new users get every column, the existing ones keep their creation time, password and is_active
+    assert profile_sql.startswith(f'INSERT INTO users ({", ".join(USER_COLUMNS)}) ')
+    for column in ('primary_uuid', 'create_at', 'password', 'is_active'):
+        assert f'excluded.{column}' not in set_clause
+    for column in ('login', 'full_name', 'ip_v4', 'is_superuser', 'department_id'):
+        assert f'excluded.{column}' in set_clause
+
+    access_sql: Final = _normalize(_merge_sql('users', 'users_import', USER_COLUMNS, _USER_UPDATED_COLUMNS))
+    assert 'excluded.password' in access_sql
+    assert 'excluded.is_active' in access_sql
+    assert 'excluded.create_at' not in access_sql
+
+#####################################################################################################
@@ -0,0 +1,81 @@
+#####################################################################################################
+
+from collections.abc import Sequence
+from typing import Any, Final
+from uuid import UUID
+
+from databases import Database
+
+from l7x.db.base_meta import create_none_database, ormar_change_database
+from l7x.utils.db_utils import close_sessions, close_sessions_conversations
+
+#####################################################################################################
+
+_CREATE_SESSIONS_QUERY: Final = '''
+WITH department AS (
+    INSERT INTO departments (name, address, timezone) VALUES ('close test', 'address', '+00:00')
+    RETURNING primary_uuid
+), test_user AS (
+    INSERT INTO users (login, full_name, password, is_active, department_id)
+    SELECT 'close-test-' || gen_random_uuid(), 'Close Test', 'password', TRUE, primary_uuid FROM department
+    RETURNING primary_uuid
+)
+INSERT INTO sessions (login_ts, user_id) SELECT now(), primary_uuid FROM test_user, generate_series(1, 3)
+RETURNING primary_uuid
+'''
+
+_CREATE_CONVERSATION_QUERY: Final = '''
+WITH conversation AS (
+    INSERT INTO conversations (start_ts, first_user_session, max_participants) VALUES (now(), $1, 3)
+    RETURNING primary_uuid
+), participants AS (
+    INSERT INTO conversation_participants (join_ts, conversation_id, session_id)
+    SELECT now(), conversation.primary_uuid, session_id FROM conversation, unnest($2::uuid[]) AS session_id
+)
+SELECT primary_uuid FROM conversation
+'''
+
+#####################################################################################################
+
+async def _create_conversation(raw_connection: Any, sessions: Sequence[UUID]) -> UUID:
+    return await raw_connection.fetchval(_CREATE_CONVERSATION_QUERY, sessions[0], list(sessions))
+
+#####################################################################################################
+
+async def test_conversation_is_closed_when_less_than_two_participants_stay(local_db: Database) -> None:
+    ormar_change_database(local_db)
+    try:
+        async with local_db.connection() as connection, connection.transaction(force_rollback=True):
+            raw_connection = connection.raw_connection
+            operator, client, listener = [row['primary_uuid'] for row in await raw_connection.fetch(_CREATE_SESSIONS_QUERY)]
+            conversation: Final = await _create_conversation(raw_connection, (operator, client, listener))
+
+            # the operator and the client stay
+            assert await close_sessions_conversations((listener,)) == ()
+            assert await close_sessions_conversations((str(client),)) == (conversation,)
+            assert await raw_connection.fetchval(
+                'SELECT count(*) FROM conversation_participants WHERE conversation_id = $1 AND leave_ts IS NOT NULL',
+                conversation,
+            ) == 2
+    finally:
+        ormar_change_database(create_none_database())
+
+#####################################################################################################
+
+async def test_closed_sessions_close_their_conversations_once(local_db: Database) -> None:
+    ormar_change_database(local_db)
+    try:
+        async with local_db.connection() as connection, connection.transaction(force_rollback=True):
+            raw_connection = connection.raw_connection
+            operator, client, listener = [row['primary_uuid'] for row in await raw_connection.fetch(_CREATE_SESSIONS_QUERY)]
+            conversation: Final = await _create_conversation(raw_connection, (operator, client, listener))
+
+            # the first session leaves, the conversation is closed for all participants
+            assert await close_sessions((operator,)) == (operator,)
+            assert await raw_connection.fetchval('SELECT end_ts IS NOT NULL FROM conversations WHERE primary_uuid = $1', conversation)
+            assert await close_sessions((operator,)) == ()
+            assert set(await close_sessions((operator, client, listener))) == {client, listener}
+    finally:
+        ormar_change_database(create_none_database())
+
+#####################################################################################################
@@ -0,0 +1,70 @@
+#####################################################################################################
+
+from logging import getLogger
+from typing import Final
+
+from databases import Database
+
+from l7x.utils.datetime_utils import now_utc
+from l7x.utils.partition_utils import (
+    MIN_PARTITIONS_COVERAGE,
+    PARTITIONED_TABLES,
+    check_partitions_coverage,
+    create_future_partitions,
+    fetch_partitions_end,
+)
+
+#####################################################################################################
+
+_LOGGER: Final = getLogger(__name__)
+
+_CREATE_TEXT_QUERY: Final = '''
+WITH department AS (
+    INSERT INTO departments (name, address, timezone) VALUES ('partitions test', 'address', '+00:00')
+    RETURNING primary_uuid
+), test_user AS (
+    INSERT INTO users (login, full_name, password, is_active, department_id)
+    SELECT 'partitions-test-' || gen_random_uuid(), 'Partitions Test', 'password', TRUE, primary_uuid FROM department
+    RETURNING primary_uuid
+), test_session AS (
+    INSERT INTO sessions (login_ts, user_id) SELECT now(), primary_uuid FROM test_user
+    RETURNING primary_uuid
+), conversation AS (
+    INSERT INTO conversations (start_ts, first_user_session) SELECT now(), primary_uuid FROM test_session
+    RETURNING primary_uuid
+)
+INSERT INTO texts (lang_from, lang_to, recognized_text, translated_text, conversation_id)
+SELECT 'en', 'de', 'hello', 'hallo', primary_uuid FROM conversation
+RETURNING primary_uuid
+'''
+
+#####################################################################################################
+
+async def test_text_delete_deletes_translations(local_db: Database) -> None:
+    # the foreign key of text_translations to the partitioned texts is replaced by a trigger
+    async with local_db.connection() as connection, connection.transaction(force_rollback=True):
+        raw_connection = connection.raw_connection
+        text_uuid = await raw_connection.fetchval(_CREATE_TEXT_QUERY)
+        await raw_connection.execute(
+            "INSERT INTO text_translations (lang_to, translated_text, text_id) VALUES ('fr', 'bonjour', $1), ('es', 'hola', $1)",
+            text_uuid,
+        )
+
+        await raw_connection.execute('DELETE FROM texts WHERE primary_uuid = $1', text_uuid)
+
+        assert await raw_connection.fetchval('SELECT count(*) FROM text_translations WHERE text_id = $1', text_uuid) == 0
+
+#####################################################################################################
+
+async def test_partitions_coverage_is_checked(local_db: Database) -> None:
+    await create_future_partitions(local_db, months_ahead=3)
+    now: Final = now_utc()
+    partitions_end: Final = await fetch_partitions_end(local_db)
+
+    assert set(partitions_end) == set(PARTITIONED_TABLES)
+    assert all(end is not None and end - now >= MIN_PARTITIONS_COVERAGE for end in partitions_end.values())
+    assert await check_partitions_coverage(local_db, _LOGGER, now)
+    # less than MIN_PARTITIONS_COVERAGE before the end of the last partition the coverage is alerted
+    assert not await check_partitions_coverage(local_db, _LOGGER, max(partitions_end.values()) - MIN_PARTITIONS_COVERAGE / 2)
+
+#####################################################################################################
@@ -0,0 +1,28 @@
+#####################################################################################################
+
+from typing import Final
+
+from sqlalchemy.dialects import postgresql
+
+from l7x.db.projections import _conversation_texts_query
+
+#####################################################################################################
+
+def _compile(query) -> str:
+    compiled: Final = query.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True})
+    return ' '.join(str(compiled).split())
+
+#####################################################################################################
+
+def test_text_type_maps_feedback_operator_and_client() -> None:
+    sql: Final = _compile(_conversation_texts_query(with_audio=False))
+
+    type_sql: Final = sql[sql.index('CASE WHEN'):sql.index(' AS type')]
+
+    # the first matching branch wins: the feedback without an owner session, the operator, the participants
+    assert type_sql.index('owner_session_uuid IS NULL') < type_sql.index("THEN 'feedback'")
+    assert type_sql.index("THEN 'feedback'") < type_sql.index('= conversations.first_user_session')
+    assert type_sql.index('= conversations.first_user_session') < type_sql.index("THEN 'operator'")
+    assert type_sql.endswith("ELSE 'client' END")
+
+#####################################################################################################
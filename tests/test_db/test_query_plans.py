@@ -0,0 +1,124 @@
+#####################################################################################################
+
+import json
+from collections.abc import Iterator, Mapping
+from datetime import timedelta
+from typing import Any, Final
+from uuid import uuid4
+
+import pytest
+from databases import Database
+from sqlalchemy.sql import ClauseElement
+
+from l7x.db.prepared_statements import (
+    CLOSE_SESSIONS_CONVERSATIONS,
+    CONVERSATION_HAS_TEXTS,
+    HOT_STATEMENTS,
+    INSERT_TEXT,
+    JOIN_CONVERSATION,
+    LOCK_OPEN_CONVERSATION,
+    SESSION_STATE,
+    PreparedStatement,
+    UPDATE_PARTICIPANT_LANGS_BATCH,
+    UPDATE_TEXT_FIX,
+    UPDATE_TEXT_TRANSLATIONS,
+    WAITING_CONVERSATION,
+)
+from l7x.db.projections import _conversation_list_query, _edited_texts_query
+from l7x.sessions_check_worker import _EXPIRE_SESSIONS_QUERY
+from l7x.utils.datetime_utils import now_utc
+
+#####################################################################################################
+
+# pylint: disable=redefined-outer-name
+
+_END_TS: Final = now_utc()
+_START_TS: Final = _END_TS - timedelta(days=30)
+
+# parameters of every prepared statement of HOT_STATEMENTS, each statement has to be served by an index
+_STATEMENT_PARAMS: Final[Mapping[str, tuple[Any, ...]]] = {
+    SESSION_STATE.name: (uuid4(),),
+    WAITING_CONVERSATION.name: (uuid4(), uuid4()),
+    LOCK_OPEN_CONVERSATION.name: (uuid4(),),
+    JOIN_CONVERSATION.name: (uuid4(), uuid4(), 2),
+    CLOSE_SESSIONS_CONVERSATIONS.name: ([uuid4(), uuid4()],),
+    CONVERSATION_HAS_TEXTS.name: (uuid4(),),
+    INSERT_TEXT.name: (_END_TS, None, 'en', 'de', 'hello', 'hallo', uuid4(), uuid4()),
+    UPDATE_TEXT_FIX.name: (uuid4(), 'fixed', 'translated', _END_TS),
+    UPDATE_TEXT_TRANSLATIONS.name: (uuid4(), ['de', 'fr'], ['hallo', 'bonjour']),
+    UPDATE_PARTICIPANT_LANGS_BATCH.name: ([uuid4(), uuid4()], [uuid4(), uuid4()], ['en', 'de']),
+}
+
+# SQLAlchemy queries as the application builds them, compiled by the database backend
+_SQLALCHEMY_QUERIES: Final[Mapping[str, ClauseElement]] = {
+    'conversations_page': _conversation_list_query(start_date=_START_TS, end_date=_END_TS, limit=50),
+    'conversations_next_page': _conversation_list_query(
+        start_date=_START_TS,
+        end_date=_END_TS,
+        after=(_END_TS, str(uuid4())),
+        limit=50,
+    ),
+    'conversations_page_by_users': _conversation_list_query(
+        start_date=_START_TS,
+        end_date=_END_TS,
+        users=(uuid4(),),
+        departments=(uuid4(),),
+        limit=50,
+    ),
+    'edited_texts_page': _edited_texts_query(start_date=_START_TS, end_date=_END_TS, limit=50),
+    'edited_texts_page_by_languages': _edited_texts_query(
+        start_date=_START_TS,
+        end_date=_END_TS,
+        languages=('en', 'de'),
+        after=(_END_TS, str(uuid4())),
+        limit=50,
+    ),
+    'expire_sessions': _EXPIRE_SESSIONS_QUERY.bindparams(max_age_sec=86400.0),
+}
+
+#####################################################################################################
+
+def _plan_nodes(node: Mapping[str, Any]) -> Iterator[Mapping[str, Any]]:
+    yield node
+    for child in node.get('Plans', ()):
+        yield from _plan_nodes(child)
+
+#####################################################################################################
+
+async def _seq_scanned_relations(database: Database, query: str | ClauseElement, params: tuple[Any, ...] = ()) -> list[str]:
+    # the test tables are small, without seq scans the planner shows whether an index can serve the query
+    async with database.connection() as connection, connection.transaction():
+        if isinstance(query, ClauseElement):
+            # the SQL and the arguments sent by the databases backend for the query
+            query, args, *_ = connection._connection._compile(query)  # noqa: WPS437
+            params = tuple(args)
+        raw_connection = connection.raw_connection
+        await raw_connection.execute('SET LOCAL enable_seqscan = off')
+        plan = await raw_connection.fetchval(f'EXPLAIN (FORMAT JSON) {query}', *params)
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return [
+        node['Relation Name'] for node in _plan_nodes(plan[0]['Plan'])
+        if node['Node Type'] == 'Seq Scan'
+    ]
+
+#####################################################################################################
+
+def test_every_prepared_statement_is_checked() -> None:
+    assert {statement.name for statement in HOT_STATEMENTS} == set(_STATEMENT_PARAMS)
+
+#####################################################################################################
+
+@pytest.mark.parametrize('statement', list(HOT_STATEMENTS), ids=lambda statement: statement.name)
+async def test_prepared_statement_uses_index(local_db: Database, statement: PreparedStatement) -> None:
+    seq_scanned: Final = await _seq_scanned_relations(local_db, statement.sql, _STATEMENT_PARAMS[statement.name])
+    assert not seq_scanned, f'{statement.name} scans {seq_scanned} sequentially'
+
+#####################################################################################################
+
+@pytest.mark.parametrize('query_name', sorted(_SQLALCHEMY_QUERIES))
+async def test_query_uses_index(local_db: Database, query_name: str) -> None:
+    seq_scanned: Final = await _seq_scanned_relations(local_db, _SQLALCHEMY_QUERIES[query_name])
+    assert not seq_scanned, f'{query_name} scans {seq_scanned} sequentially'
+
+#####################################################################################################
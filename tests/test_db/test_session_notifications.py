@@ -0,0 +1,58 @@
+#####################################################################################################
+
+import asyncio
+from typing import Final
+
+from databases import Database
+
+from l7x.utils.session_cache_utils import SESSION_NOTIFY_PREFIX, SESSIONS_NOTIFY_CHANNEL, USER_NOTIFY_PREFIX
+
+#####################################################################################################
+
+_CREATE_SESSION_QUERY: Final = '''
+WITH department AS (
+    INSERT INTO departments (name, address, timezone) VALUES ('notifications test', 'address', '+00:00')
+    RETURNING primary_uuid
+), test_user AS (
+    INSERT INTO users (login, full_name, password, is_active, department_id)
+    SELECT 'notifications-test-' || gen_random_uuid(), 'Notifications Test', 'password', TRUE, primary_uuid FROM department
+    RETURNING primary_uuid, department_id
+)
+INSERT INTO sessions (login_ts, user_id) SELECT now(), primary_uuid FROM test_user
+RETURNING primary_uuid, user_id, (SELECT department_id FROM test_user)
+'''
+
+#####################################################################################################
+
+async def _wait_for(payloads: list[str], count: int) -> None:
+    for _ in range(100):
+        if len(payloads) >= count:
+            return
+        await asyncio.sleep(0.01)
+
+#####################################################################################################
+
+async def test_sessions_and_users_changes_are_notified(local_db: Database) -> None:
+    payloads: Final[list[str]] = []
+
+    def on_notify(_connection: object, _pid: int, _channel: str, payload: str) -> None:
+        payloads.append(payload)
+
+    # the notifications are sent on commit, so the rows are committed and deleted at the end
+    async with local_db.connection() as connection:
+        raw_connection = connection.raw_connection
+        session_uuid, user_uuid, department_uuid = await raw_connection.fetchrow(_CREATE_SESSION_QUERY)
+        await raw_connection.add_listener(SESSIONS_NOTIFY_CHANNEL, on_notify)
+        try:
+            await raw_connection.execute('UPDATE sessions SET logout_ts = now() WHERE primary_uuid = $1', session_uuid)
+            await raw_connection.execute('UPDATE users SET is_active = FALSE WHERE primary_uuid = $1', user_uuid)
+            await _wait_for(payloads, 2)
+        finally:
+            await raw_connection.remove_listener(SESSIONS_NOTIFY_CHANNEL, on_notify)
+            await raw_connection.execute('DELETE FROM sessions WHERE primary_uuid = $1', session_uuid)
+            await raw_connection.execute('DELETE FROM users WHERE primary_uuid = $1', user_uuid)
+            await raw_connection.execute('DELETE FROM departments WHERE primary_uuid = $1', department_uuid)
+
+    assert payloads == [f'{SESSION_NOTIFY_PREFIX}{session_uuid}', f'{USER_NOTIFY_PREFIX}{user_uuid}']
+
+#####################################################################################################
@@ -0,0 +1,93 @@
+#####################################################################################################
+
+import asyncio
+from types import SimpleNamespace
+from typing import Final
+
+from databases import Database
+
+from l7x.configs.constants import SESSIONS_EXPIRY_ADVISORY_LOCK_KEY
+from l7x.sessions_check_worker import check_sessions
+
+#####################################################################################################
+
+_SETTINGS: Final = SimpleNamespace(session_max_age_sec=3600)
+
+# the first session is older than the max age, the conversation of the two sessions is closed by its expiry
+_CREATE_SESSIONS_QUERY: Final = '''
+WITH department AS (
+    INSERT INTO departments (name, address, timezone) VALUES ('expiry test', 'address', '+00:00')
+    RETURNING primary_uuid
+), test_user AS (
+    INSERT INTO users (login, full_name, password, is_active, department_id)
+    SELECT 'expiry-test-' || gen_random_uuid(), 'Expiry Test', 'password', TRUE, primary_uuid FROM department
+    RETURNING primary_uuid
+), expired_session AS (
+    INSERT INTO sessions (login_ts, user_id) SELECT now() - interval '2 hours', primary_uuid FROM test_user
+    RETURNING primary_uuid
+), fresh_session AS (
+    INSERT INTO sessions (login_ts, user_id) SELECT now(), primary_uuid FROM test_user
+    RETURNING primary_uuid
+), conversation AS (
+    INSERT INTO conversations (start_ts, first_user_session) SELECT now(), primary_uuid FROM expired_session
+    RETURNING primary_uuid
+), participants AS (
+    INSERT INTO conversation_participants (join_ts, conversation_id, session_id)
+    SELECT now(), conversation.primary_uuid, session.primary_uuid
+    FROM conversation, (SELECT primary_uuid FROM expired_session UNION ALL SELECT primary_uuid FROM fresh_session) AS session
+)
+SELECT
+    (SELECT primary_uuid FROM expired_session) AS expired_session,
+    (SELECT primary_uuid FROM fresh_session) AS fresh_session,
+    (SELECT primary_uuid FROM conversation) AS conversation
+'''
+
+_SESSION_IS_CLOSED_QUERY: Final = 'SELECT logout_ts IS NOT NULL FROM sessions WHERE primary_uuid = $1'
+
+#####################################################################################################
+
+async def test_expired_sessions_leave_and_close_conversations(local_db: Database) -> None:
+    async with local_db.connection() as connection, connection.transaction(force_rollback=True):
+        raw_connection = connection.raw_connection
+        created = await raw_connection.fetchrow(_CREATE_SESSIONS_QUERY)
+
+        stats = await check_sessions(local_db, _SETTINGS)  # type: ignore[arg-type]
+
+        assert stats.is_lock_acquired
+        assert stats.expired_sessions >= 1
+        assert stats.closed_conversations >= 1
+        assert await raw_connection.fetchval(_SESSION_IS_CLOSED_QUERY, created['expired_session'])
+        assert not await raw_connection.fetchval(_SESSION_IS_CLOSED_QUERY, created['fresh_session'])
+        assert await raw_connection.fetchval(
+            'SELECT end_ts IS NOT NULL FROM conversations WHERE primary_uuid = $1',
+            created['conversation'],
+        )
+
+        # the expired sessions are closed once
+        assert (await check_sessions(local_db, _SETTINGS)).expired_sessions == 0  # type: ignore[arg-type]
+
+#####################################################################################################
+
+async def test_expiry_is_skipped_while_other_worker_runs_it(local_db: Database) -> None:
+    is_locked: Final = asyncio.Event()
+    release: Final = asyncio.Event()
+
+    async def other_worker() -> None:
+        # a task of its own gets its own connection of the pool
+        async with local_db.connection() as connection:
+            await connection.execute('SELECT pg_advisory_lock(:lock_key)', values={'lock_key': SESSIONS_EXPIRY_ADVISORY_LOCK_KEY})
+            try:
+                is_locked.set()
+                await release.wait()
+            finally:
+                await connection.execute('SELECT pg_advisory_unlock(:lock_key)', values={'lock_key': SESSIONS_EXPIRY_ADVISORY_LOCK_KEY})
+
+    other_worker_task: Final = asyncio.create_task(other_worker())
+    try:
+        await is_locked.wait()
+        assert not (await check_sessions(local_db, _SETTINGS)).is_lock_acquired  # type: ignore[arg-type]
+    finally:
+        release.set()
+        await other_worker_task
+
+#####################################################################################################
@@ -0,0 +1,112 @@
+#####################################################################################################
+
+from logging import getLogger
+from typing import Final
+from unittest.mock import AsyncMock
+
+from databases import Database
+
+from l7x.db.base_meta import create_none_database, ormar_change_database
+from l7x.services.translation_memory_service import TranslationMemoryService
+
+#####################################################################################################
+
+_CREATE_CORRECTED_TEXT_QUERY: Final = '''
+WITH department AS (
+    INSERT INTO departments (name, address, timezone) VALUES ('memory test', 'address', '+00:00')
+    RETURNING primary_uuid
+), test_user AS (
+    INSERT INTO users (login, full_name, password, is_active, department_id)
+    SELECT 'memory-test-' || gen_random_uuid(), 'Memory Test', 'password', TRUE, primary_uuid FROM department
+    RETURNING primary_uuid
+), test_session AS (
+    INSERT INTO sessions (login_ts, user_id) SELECT now(), primary_uuid FROM test_user
+    RETURNING primary_uuid
+), conversation AS (
+    INSERT INTO conversations (start_ts, first_user_session) SELECT now(), primary_uuid FROM test_session
+    RETURNING primary_uuid
+)
+INSERT INTO texts (edit_ts, lang_from, lang_to, recognized_text, fixed_text, translated_text, conversation_id)
+SELECT now(), 'en', 'ru', 'Good morning, docter', $1, $2, primary_uuid FROM conversation
+'''
+
+#####################################################################################################
+
+def _create_memory(max_entries: int = 10) -> tuple[TranslationMemoryService, AsyncMock]:
+    backend: Final = AsyncMock()
+    backend.translate.return_value = 'from backend'
+    memory: Final = TranslationMemoryService(None, getLogger(__name__), backend, max_entries)  # type: ignore[arg-type]
+    return memory, backend
+
+#####################################################################################################
+
+async def test_exact_hit_skips_backend() -> None:
+    memory, backend = _create_memory()
+    memory.add(text='Hello', translated_text='Привет', source_lang='en', target_lang='ru')
+    assert await memory.translate(text='Hello', target_lang='ru', source_lang='en') == 'Привет'
+    backend.translate.assert_not_awaited()
+    assert memory.stats()['exact_hits'] == 1
+
+#####################################################################################################
+
+async def test_normalized_hit_ignores_case_spaces_and_repeated_marks() -> None:
+    memory, backend = _create_memory()
+    memory.add(text='Good  morning!', translated_text='Доброе утро!', source_lang='en', target_lang='ru')
+    assert await memory.translate(text='«good morning!!»', target_lang='ru', source_lang='en') == 'Доброе утро!'
+    backend.translate.assert_not_awaited()
+    assert memory.stats()['fuzzy_hits'] == 1
+
+#####################################################################################################
+
+def test_question_does_not_match_statement() -> None:
+    memory, _ = _create_memory()
+    memory.add(text='Are you ready.', translated_text='Вы готовы.', source_lang='en', target_lang='ru')
+    assert memory.lookup(text='Are you ready?', source_lang='en', target_lang='ru') is None
+    assert memory.lookup(text='are you ready', source_lang='en', target_lang='ru') == 'Вы готовы.'
+
+#####################################################################################################
+
+async def test_miss_asks_backend_and_remembers() -> None:
+    memory, backend = _create_memory()
+    assert await memory.translate(text='Bye', target_lang='ru', source_lang='en') == 'from backend'
+    assert await memory.translate(text='Bye', target_lang='ru', source_lang='en') == 'from backend'
+    backend.translate.assert_awaited_once()
+
+#####################################################################################################
+
+def test_segments_of_corrected_text_are_added_by_sentence() -> None:
+    memory, _ = _create_memory()
+    memory.add_segments(text='Hello. How are you?', translated_text='Привет. Как дела?', source_lang='en', target_lang='ru')
+    assert memory.lookup(text='Hello.', source_lang='en', target_lang='ru') == 'Привет.'
+    assert memory.lookup(text='How are you?', source_lang='en', target_lang='ru') == 'Как дела?'
+
+#####################################################################################################
+
+def test_eviction_drops_least_recently_used() -> None:
+    memory, _ = _create_memory(max_entries=2)
+    memory.add(text='one', translated_text='один', source_lang='en', target_lang='ru')
+    memory.add(text='two', translated_text='два', source_lang='en', target_lang='ru')
+    assert memory.lookup(text='one', source_lang='en', target_lang='ru') == 'один'
+    memory.add(text='three', translated_text='три', source_lang='en', target_lang='ru')
+    assert memory.lookup(text='two', source_lang='en', target_lang='ru') is None
+    assert memory.lookup(text='one', source_lang='en', target_lang='ru') == 'один'
+    assert memory.lookup(text='three', source_lang='en', target_lang='ru') == 'три'
+
+#####################################################################################################
+
+async def test_memory_is_warmed_up_with_corrected_texts(local_db: Database) -> None:
+    memory, backend = _create_memory()
+    ormar_change_database(local_db)
+    try:
+        async with local_db.connection() as connection, connection.transaction(force_rollback=True):
+            await connection.raw_connection.execute(_CREATE_CORRECTED_TEXT_QUERY, 'Good morning, doctor', 'Доброе утро, доктор')
+            await memory.load_from_db()
+    finally:
+        ormar_change_database(create_none_database())
+
+    # the fixed source text is the key, the translation is the value
+    assert await memory.translate(text='Good morning, doctor', target_lang='ru', source_lang='en') == 'Доброе утро, доктор'
+    assert memory.lookup(text='Доброе утро, доктор', source_lang='en', target_lang='ru') is None
+    backend.translate.assert_not_awaited()
+
+#####################################################################################################
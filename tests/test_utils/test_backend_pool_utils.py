@@ -0,0 +1,109 @@
+#####################################################################################################
+
+from logging import INFO, getLogger
+from typing import Final
+
+import pytest
+from aiohttp import ClientConnectionError
+
+from l7x.types.errors import AppException
+from l7x.utils import backend_pool_utils
+from l7x.utils.backend_pool_utils import BackendPool
+
+#####################################################################################################
+
+_LOGGER: Final = getLogger(__name__)
+
+#####################################################################################################
+
+def _create_pool(*base_urls: str, max_fails: int = 2, eject_sec: float = 60.0) -> BackendPool:
+    return BackendPool('test', base_urls, max_fails=max_fails, eject_sec=eject_sec, logger=_LOGGER)
+
+#####################################################################################################
+
+async def _fail(pool: BackendPool, error: Exception) -> str:
+    base_url = ''
+    with pytest.raises(type(error)):
+        async with pool.acquire() as lease:
+            base_url = lease.endpoint.base_url
+            raise error
+    return base_url
+
+#####################################################################################################
+
+async def test_power_of_two_choices_takes_less_loaded_endpoint() -> None:
+    pool: Final = _create_pool('http://a/', 'http://b/')
+    busy, idle = pool.endpoints
+    busy.outstanding = 5
+    for _ in range(20):
+        async with pool.acquire() as lease:
+            assert lease.endpoint is idle
+
+#####################################################################################################
+
+async def test_transport_errors_eject_endpoint() -> None:
+    pool: Final = _create_pool('http://a/', 'http://b/')
+    failing, healthy = pool.endpoints
+    healthy.outstanding = 100  # the failing endpoint is chosen while it is not ejected
+    for _ in range(2):
+        assert await _fail(pool, ClientConnectionError()) == failing.base_url
+    assert failing.consecutive_fails == 2
+    async with pool.acquire() as lease:
+        assert lease.endpoint is healthy
+
+#####################################################################################################
+
+async def test_server_errors_eject_and_client_errors_do_not() -> None:
+    pool: Final = _create_pool('http://a/', 'http://b/', max_fails=1)
+    endpoint, other = pool.endpoints
+    other.outstanding = 100
+
+    await _fail(pool, ValueError('invalid request'))
+    assert endpoint.consecutive_fails == 0
+
+    async with pool.acquire() as lease:
+        lease.track_status(404)
+    assert endpoint.consecutive_fails == 0
+
+    async with pool.acquire() as lease:
+        lease.track_status(503)
+    assert endpoint.consecutive_fails == 1
+    assert endpoint.ejected_until > 0
+
+#####################################################################################################
+
+async def test_ejected_endpoint_recovers() -> None:
+    pool: Final = _create_pool('http://a/', 'http://b/', max_fails=1, eject_sec=0.0)
+    endpoint, other = pool.endpoints
+    other.outstanding = 100
+    await _fail(pool, ClientConnectionError())
+    assert endpoint.consecutive_fails == 1
+
+    # the ejection is over, the first success makes the endpoint healthy
+    async with pool.acquire() as lease:
+        assert lease.endpoint is endpoint
+    assert endpoint.consecutive_fails == 0
+    assert endpoint.ejected_until < 0
+
+#####################################################################################################
+
+async def test_pool_without_endpoints_fails_requests_only() -> None:
+    pool: Final = _create_pool()
+    with pytest.raises(AppException):
+        async with pool.acquire():
+            pass
+
+#####################################################################################################
+
+async def test_stats_are_reported(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture) -> None:
+    monkeypatch.setattr(backend_pool_utils, '_REPORT_EVERY_REQUESTS', 2)
+    pool: Final = _create_pool('http://a/')
+    with caplog.at_level(INFO, logger=_LOGGER.name):
+        for _ in range(2):
+            async with pool.acquire():
+                pass
+
+    assert pool.stats() == {'http://a/': {'outstanding': 0, 'requests': 2, 'fails': 0, 'ejected': False}}
+    assert caplog.messages == [f'Backend pool "test" stats: {pool.stats()}']
+
+#####################################################################################################
@@ -0,0 +1,53 @@
+#####################################################################################################
+
+from types import SimpleNamespace
+from typing import Any, Final
+
+import pytest
+
+from l7x.configs import settings
+from l7x.configs.constants import SESSIONS_CHECK_WORKER_CONNECTIONS, STARTUP_CONNECTIONS
+from l7x.types.errors import AppException
+from l7x.utils.db_pool_utils import create_db_pool_config
+
+#####################################################################################################
+
+def _settings(*, budget: int, workers: int) -> Any:
+    return SimpleNamespace(
+        db_connection_budget=budget,
+        worker_count=workers,
+        db_pool_min_size=1,
+        db_pool_acquire_timeout_sec=10.0,
+        db_pool_max_idle_sec=300.0,
+        db_statement_timeout_sec=0.0,
+    )
+
+#####################################################################################################
+
+def test_pools_fit_the_budget_with_the_other_connections() -> None:
+    budget: Final = 80
+    workers: Final = 9
+    pool_config: Final = create_db_pool_config(_settings(budget=budget, workers=workers), reserved_connections=1)
+
+    # every worker keeps its pool and the notifications listener connection
+    assert pool_config.max_size == 7
+    assert workers * (pool_config.max_size + 1) + SESSIONS_CHECK_WORKER_CONNECTIONS + STARTUP_CONNECTIONS <= budget
+
+#####################################################################################################
+
+def test_too_small_budget_is_rejected() -> None:
+    with pytest.raises(AppException):
+        create_db_pool_config(_settings(budget=10, workers=9))
+
+#####################################################################################################
+
+@pytest.mark.parametrize(('cpus', 'workers'), [(4, 9), (64, 39)])
+def test_default_workers_fit_the_budget(monkeypatch: pytest.MonkeyPatch, cpus: int, workers: int) -> None:
+    monkeypatch.setattr(settings, 'cpu_count', lambda: cpus)
+    worker_count: Final = settings._default_worker_count(80)  # noqa: WPS437
+
+    # on a large host the worker count is limited by the budget, the pool of every worker keeps a connection
+    assert worker_count == workers
+    assert create_db_pool_config(_settings(budget=80, workers=worker_count), reserved_connections=1).max_size >= 1
+
+#####################################################################################################
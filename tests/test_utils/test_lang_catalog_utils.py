@@ -0,0 +1,144 @@
+#####################################################################################################
+
+import asyncio
+from collections.abc import Mapping
+from logging import getLogger
+from pathlib import Path
+from stat import S_IMODE
+from time import time
+from typing import Final
+
+from l7x.types.lang_services import LanguageDetail
+from l7x.utils.lang_catalog_utils import LangCatalog
+from l7x.utils.orjson_utils import orjson_dumps
+
+#####################################################################################################
+
+_LOGGER: Final = getLogger(__name__)
+
+_LANGS: Final = {'en': LanguageDetail(code='English', rtl=False), 'ar': LanguageDetail(code='Arabic', rtl=True)}
+
+#####################################################################################################
+
+class _Backend:
+    """Languages backend counting the fetches."""
+
+    #####################################################################################################
+
+    def __init__(self, langs: Mapping[str, LanguageDetail] = _LANGS) -> None:
+        self.langs = langs
+        self.fetches = 0
+
+    #####################################################################################################
+
+    async def fetch_langs(self, /) -> Mapping[str, LanguageDetail]:
+        self.fetches += 1
+        return self.langs
+
+#####################################################################################################
+
+def _create_catalog(backend: _Backend, shared_dir: Path | None, *, expire_sec: float = 3600.0) -> LangCatalog:
+    return LangCatalog('test_langs', backend.fetch_langs, expire_sec=expire_sec, shared_dir=shared_dir, logger=_LOGGER)
+
+#####################################################################################################
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+#####################################################################################################
+
+async def test_list_is_shared_through_private_files(tmp_path: Path) -> None:
+    shared_dir: Final = tmp_path / 'langs'
+    backend: Final = _Backend()
+
+    assert await _create_catalog(backend, shared_dir).get_langs() == _LANGS
+
+    assert S_IMODE(shared_dir.stat().st_mode) == 0o700
+    assert S_IMODE((shared_dir / 'test_langs.json').stat().st_mode) == 0o600
+    # the other worker reads the fresh list of the shared file, the backend is not asked again
+    assert await _create_catalog(backend, shared_dir).get_langs() == _LANGS
+    assert backend.fetches == 1
+
+#####################################################################################################
+
+async def test_dir_writable_by_others_is_not_used(tmp_path: Path) -> None:
+    shared_dir: Final = tmp_path / 'langs'
+    shared_dir.mkdir()
+    shared_dir.chmod(0o777)
+    backend: Final = _Backend()
+
+    assert await _create_catalog(backend, shared_dir).get_langs() == _LANGS
+    assert await _create_catalog(backend, shared_dir).get_langs() == _LANGS
+
+    assert not any(shared_dir.iterdir())
+    assert backend.fetches == 2
+
+#####################################################################################################
+
+async def test_stale_snapshot_is_served_at_cold_start(tmp_path: Path) -> None:
+    shared_dir: Final = tmp_path / 'langs'
+    shared_dir.mkdir(mode=0o700)
+    stale_langs: Final = {'en': {'code': 'English', 'rtl': False}}
+    (shared_dir / 'test_langs.json').write_bytes(orjson_dumps({'fetch_ts': time() - 7200, 'langs': stale_langs}))
+    backend: Final = _Backend()
+    catalog: Final = _create_catalog(backend, shared_dir)
+
+    catalog.start()
+    try:
+        # the last known list is served at once, the background refresh replaces it
+        assert await catalog.get_langs() == {'en': _LANGS['en']}
+        await _settle()
+        assert await catalog.get_langs() == _LANGS
+        assert backend.fetches == 1
+    finally:
+        await catalog.stop()
+
+#####################################################################################################
+
+async def test_requests_do_not_refresh_the_list() -> None:
+    backend: Final = _Backend()
+    catalog: Final = _create_catalog(backend, None, expire_sec=0.0)
+
+    # only the first load without a snapshot is awaited, the expired list is refreshed by the background task
+    for _ in range(3):
+        assert await catalog.get_langs() == _LANGS
+        await _settle()
+    assert backend.fetches == 1
+
+    catalog.start()
+    try:
+        await _settle()
+        assert backend.fetches == 2
+    finally:
+        await catalog.stop()
+
+#####################################################################################################
+
+async def test_snapshot_is_served_while_backend_is_down(tmp_path: Path) -> None:
+    shared_dir: Final = tmp_path / 'langs'
+    await _create_catalog(_Backend(), shared_dir, expire_sec=0.0).get_langs()
+
+    async def fetch_failed() -> Mapping[str, LanguageDetail]:
+        raise ConnectionError('backend is down')
+
+    catalog: Final = LangCatalog('test_langs', fetch_failed, expire_sec=0.0, shared_dir=shared_dir, logger=_LOGGER)
+    catalog.start()
+    try:
+        await _settle()
+        assert await catalog.get_langs() == _LANGS
+    finally:
+        await catalog.stop()
+
+#####################################################################################################
+
+async def test_invalid_snapshot_is_fetched_again(tmp_path: Path) -> None:
+    shared_dir: Final = tmp_path / 'langs'
+    shared_dir.mkdir(mode=0o700)
+    (shared_dir / 'test_langs.json').write_bytes(b'{"fetch_ts": ')
+    backend: Final = _Backend()
+
+    assert await _create_catalog(backend, shared_dir).get_langs() == _LANGS
+    assert backend.fetches == 1
+
+#####################################################################################################
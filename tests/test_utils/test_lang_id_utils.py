@@ -0,0 +1,97 @@
+#####################################################################################################
+
+from typing import Final
+
+from l7x.utils.lang_id_utils import LangGuess, NgramLangIdentifier, evaluate_identifier
+
+#####################################################################################################
+
+_LANGS: Final = ('en', 'de', 'fr')
+
+_TRAIN_SAMPLES: Final = (
+    ('en', 'The weather is very nice today and we are going to the park with the children.'),
+    ('en', 'Please show me your passport and the ticket for the train to the city.'),
+    ('en', 'I would like to know where the nearest hospital is and how to get there.'),
+    ('en', 'Thank you for waiting, the doctor will see you in a few minutes.'),
+    ('de', 'Das Wetter ist heute sehr schön und wir gehen mit den Kindern in den Park.'),
+    ('de', 'Bitte zeigen Sie mir Ihren Reisepass und die Fahrkarte für den Zug in die Stadt.'),
+    ('de', 'Ich möchte wissen, wo das nächste Krankenhaus ist und wie ich dorthin komme.'),
+    ('de', 'Danke für das Warten, der Arzt wird Sie in wenigen Minuten sehen.'),
+    ('fr', "Il fait très beau aujourd'hui et nous allons au parc avec les enfants."),
+    ('fr', 'Montrez-moi votre passeport et le billet pour le train vers la ville, s\'il vous plaît.'),
+    ('fr', "Je voudrais savoir où se trouve l'hôpital le plus proche et comment y aller."),
+    ('fr', 'Merci pour votre attente, le médecin va vous recevoir dans quelques minutes.'),
+)
+
+_TEST_SAMPLES: Final = (
+    ('en', 'Where is the train station and when does the next train leave?'),
+    ('en', 'The children are waiting for the doctor in the hospital.'),
+    ('de', 'Wo ist der Bahnhof und wann fährt der nächste Zug?'),
+    ('de', 'Die Kinder warten im Krankenhaus auf den Arzt.'),
+    ('fr', 'Où est la gare et quand part le prochain train?'),
+    ('fr', "Les enfants attendent le médecin à l'hôpital."),
+)
+
+#####################################################################################################
+
+def _create_identifier(**kwargs) -> NgramLangIdentifier:
+    identifier: Final = NgramLangIdentifier(**kwargs)
+    for lang, text in _TRAIN_SAMPLES:
+        identifier.add_sample(lang=lang, text=text)
+    identifier.build()
+    return identifier
+
+#####################################################################################################
+
+def test_evaluate_identifier_on_labelled_samples() -> None:
+    metrics: Final = evaluate_identifier(_create_identifier(), _TEST_SAMPLES, _LANGS)
+
+    assert metrics['samples'] == len(_TEST_SAMPLES)
+    assert metrics['coverage'] == 1.0
+    assert metrics['accuracy'] >= 5 / 6
+    assert metrics['mean_latency_us'] > 0
+
+#####################################################################################################
+
+def test_evaluate_identifier_counts_low_confidence_as_not_answered() -> None:
+    metrics: Final = evaluate_identifier(_create_identifier(), _TEST_SAMPLES, _LANGS, min_confidence=1.1)
+
+    assert metrics['coverage'] == 0.0
+    assert metrics['accuracy'] == 0.0
+
+#####################################################################################################
+
+def test_learned_samples_are_used_after_batch_rebuild() -> None:
+    identifier: Final = _create_identifier(rebuild_every_samples=2, rebuild_interval_sec=3600.0)
+    text: Final = 'Dobrý den, kde je nejbližší nemocnice a jak se tam dostanu?'
+
+    identifier.add_sample(lang='cs', text='Dobrý den, prosím ukažte mi váš cestovní pas a jízdenku na vlak.')
+    # the model of the new lang is not built yet, the text is left to the remote service
+    assert identifier.identify(text, ('cs',) + _LANGS) is None
+
+    identifier.add_sample(lang='cs', text='Děti čekají v nemocnici na lékaře, děkuji za trpělivost.')
+    assert identifier.identify(text, ('cs',) + _LANGS).lang == 'cs'
+
+#####################################################################################################
+
+def test_learned_ngrams_are_capped() -> None:
+    identifier: Final = NgramLangIdentifier(max_ngrams_per_lang=10)
+    for lang, text in _TRAIN_SAMPLES * 5:
+        identifier.add_sample(lang=lang, text=text)
+
+    assert all(len(counts) <= 40 for counts in identifier._counts.values())  # noqa: WPS437
+
+#####################################################################################################
+
+def test_untrained_offered_lang_is_not_guessed_by_the_trained_ones() -> None:
+    identifier: Final = NgramLangIdentifier()
+    for lang, text in _TRAIN_SAMPLES:
+        if lang == 'de':
+            identifier.add_sample(lang=lang, text=text)
+    identifier.build()
+    text: Final = 'Where is the train station and when does the next train leave?'
+
+    assert identifier.identify(text, _LANGS) is None
+    assert identifier.identify(text, ('de',)) == LangGuess(lang='de', confidence=1.0)
+
+#####################################################################################################
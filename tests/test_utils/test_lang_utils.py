@@ -0,0 +1,72 @@
+#####################################################################################################
+
+from collections.abc import Mapping
+from itertools import count
+from logging import getLogger
+from types import SimpleNamespace
+from typing import Any, Final
+
+from l7x.types.lang_services import LanguageDetail
+from l7x.utils.lang_utils import _LangOptionsCache, create_available_langs_list, create_localized_langs_list
+
+#####################################################################################################
+
+# the lists are memoized in the module, every test has its own catalogs versions
+_VERSIONS: Final = count(1_000_000)
+
+_TRANSLATE_LANGS: Final = {
+    'en': LanguageDetail(code='English', rtl=False),
+    'ar': LanguageDetail(code='Arabic', rtl=True),
+    'de': LanguageDetail(code='German', rtl=False),
+}
+
+#####################################################################################################
+
+def _catalog(langs: Mapping[str, LanguageDetail]) -> Any:
+    async def get_langs() -> Mapping[str, LanguageDetail]:
+        return langs
+
+    return SimpleNamespace(catalog_version=next(_VERSIONS), get_lang_options=get_langs, get_recognizer_lang_options=get_langs)
+
+#####################################################################################################
+
+def _app(recognizer_langs: Mapping[str, LanguageDetail]) -> Any:
+    return SimpleNamespace(
+        logger=getLogger(__name__),
+        languages_service=_catalog(_TRANSLATE_LANGS),
+        rec_languages_service=_catalog(recognizer_langs),
+    )
+
+#####################################################################################################
+
+def test_cache_is_dropped_when_catalogs_version_changes() -> None:
+    cache: Final = _LangOptionsCache()
+    created: Final[list[int]] = []
+
+    def create() -> dict[str, str]:
+        created.append(len(created))
+        return {}
+
+    first: Final = cache.get_or_create((1, 1), ('names', 'en'), create)
+    assert cache.get_or_create((1, 1), ('names', 'en'), create) is first
+    cache.get_or_create((1, 1), ('names', 'ru'), create)
+    assert cache.get_or_create((1, 2), ('names', 'en'), create) is not first
+    assert len(created) == 3
+
+#####################################################################################################
+
+async def test_available_langs_are_memoized_per_catalogs_version() -> None:
+    app: Final = _app({'en': _TRANSLATE_LANGS['en'], 'ar': _TRANSLATE_LANGS['ar']})
+
+    available_langs, directions = await create_available_langs_list(app)
+
+    # only the languages of both catalogs are offered
+    assert set(available_langs) == {'en', 'ar'}
+    assert directions == {'en': 'ltr', 'ar': 'rtl'}
+    assert (await create_available_langs_list(app))[0] is available_langs
+    assert await create_localized_langs_list(app, 'en') is await create_localized_langs_list(app, 'en')
+
+    app.rec_languages_service = _catalog(_TRANSLATE_LANGS)
+    assert set((await create_available_langs_list(app))[0]) == {'en', 'ar', 'de'}
+
+#####################################################################################################
@@ -0,0 +1,70 @@
+#####################################################################################################
+
+from typing import Final
+
+import pytest
+from argon2 import Parameters
+from argon2.low_level import Type
+
+from l7x.utils import pwd_utils
+from l7x.utils.pwd_utils import password_hashing_workers
+
+#####################################################################################################
+
+_MIB: Final = 1024 * 1024
+_PAGE_SIZE: Final = 4096
+
+#####################################################################################################
+
+def _parameters(*, memory_cost_kib: int, parallelism: int) -> Parameters:
+    return Parameters(
+        type=Type.ID,
+        version=19,
+        salt_len=16,
+        hash_len=32,
+        time_cost=2,
+        memory_cost=memory_cost_kib,
+        parallelism=parallelism,
+    )
+
+#####################################################################################################
+
+def _set_machine(monkeypatch: pytest.MonkeyPatch, *, cpus: int, available_mib: int) -> None:
+    pages: Final = {'SC_AVPHYS_PAGES': available_mib * _MIB // _PAGE_SIZE, 'SC_PAGE_SIZE': _PAGE_SIZE}
+    monkeypatch.setattr(pwd_utils, 'cpu_count', lambda: cpus)
+    monkeypatch.setattr(pwd_utils, 'sysconf', pages.__getitem__)
+
+#####################################################################################################
+
+def test_workers_are_bounded_by_cpus(monkeypatch: pytest.MonkeyPatch) -> None:
+    _set_machine(monkeypatch, cpus=8, available_mib=16 * 1024)
+
+    assert password_hashing_workers(_parameters(memory_cost_kib=64 * 1024, parallelism=2)) == 4
+
+#####################################################################################################
+
+def test_workers_are_bounded_by_half_of_available_memory(monkeypatch: pytest.MonkeyPatch) -> None:
+    _set_machine(monkeypatch, cpus=32, available_mib=512)
+
+    # 256 MiB for the hashes of 64 MiB each
+    assert password_hashing_workers(_parameters(memory_cost_kib=64 * 1024, parallelism=1)) == 4
+
+#####################################################################################################
+
+def test_at_least_one_worker(monkeypatch: pytest.MonkeyPatch) -> None:
+    _set_machine(monkeypatch, cpus=1, available_mib=16)
+
+    assert password_hashing_workers(_parameters(memory_cost_kib=64 * 1024, parallelism=4)) == 1
+
+#####################################################################################################
+
+def test_one_worker_without_memory_info(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _sysconf(name: str) -> int:
+        raise ValueError(name)
+
+    monkeypatch.setattr(pwd_utils, 'cpu_count', lambda: 8)
+    monkeypatch.setattr(pwd_utils, 'sysconf', _sysconf)
+
+    assert password_hashing_workers(_parameters(memory_cost_kib=1024, parallelism=1)) == 1
+
+#####################################################################################################
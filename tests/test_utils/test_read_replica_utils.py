@@ -0,0 +1,47 @@
+#####################################################################################################
+
+from logging import getLogger
+from typing import Final
+
+import pytest
+
+from l7x.utils.read_replica_utils import ReadReplica
+
+#####################################################################################################
+
+_LOGGER: Final = getLogger(__name__)
+
+#####################################################################################################
+
+class _LagDatabase:
+    """Replica connection answering the lag query with the given value."""
+
+    is_connected: Final = True
+
+    #####################################################################################################
+
+    def __init__(self, lag: float | Exception | None) -> None:
+        self._lag: Final = lag
+
+    #####################################################################################################
+
+    async def fetch_val(self, query: str) -> float | None:
+        if isinstance(self._lag, Exception):
+            raise self._lag
+        return self._lag
+
+#####################################################################################################
+
+@pytest.mark.parametrize(('lag', 'is_fresh'), [
+    (0.0, True),
+    (0.5, True),
+    (2.0, False),
+    # no streaming WAL receiver, the replica does not receive changes anymore
+    (None, False),
+    (ConnectionError('replica is down'), False),
+])
+async def test_replica_is_used_only_with_known_small_lag(lag: float | Exception | None, is_fresh: bool) -> None:
+    read_replica: Final = ReadReplica(_LagDatabase(lag), _LOGGER)  # type: ignore[arg-type]
+    assert await read_replica.is_fresh(max_staleness_sec=1.0) is is_fresh
+
+#####################################################################################################
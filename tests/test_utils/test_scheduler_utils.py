@@ -0,0 +1,129 @@
+#####################################################################################################
+
+import asyncio
+from typing import Final
+
+import pytest
+
+from l7x.utils.scheduler_utils import OutboundScheduler, WorkPriority
+
+#####################################################################################################
+
+async def _run(scheduler: OutboundScheduler, name: str, priority: WorkPriority, started: list[str], release: asyncio.Event) -> None:
+    async with scheduler.slot(priority):
+        started.append(name)
+        await release.wait()
+
+#####################################################################################################
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+#####################################################################################################
+
+async def test_background_starts_at_once_when_slots_are_free() -> None:
+    scheduler: Final = OutboundScheduler(concurrency=4, background_concurrency=2, max_delay_sec=5.0)
+    started: Final[list[str]] = []
+    release: Final = asyncio.Event()
+
+    tasks: Final = [
+        asyncio.create_task(_run(scheduler, 'interactive', WorkPriority.INTERACTIVE, started, release)),
+        asyncio.create_task(_run(scheduler, 'background', WorkPriority.BACKGROUND, started, release)),
+    ]
+    await _settle()
+
+    # the background work does not wait for the interactive work to finish
+    assert started == ['interactive', 'background']
+    release.set()
+    await asyncio.gather(*tasks)
+    assert scheduler.stats()['interactive_active'] == scheduler.stats()['background_active'] == 0
+
+#####################################################################################################
+
+async def test_free_slot_goes_to_interactive_work_first() -> None:
+    scheduler: Final = OutboundScheduler(concurrency=1, background_concurrency=1, max_delay_sec=5.0)
+    started: Final[list[str]] = []
+    releases: Final = {name: asyncio.Event() for name in ('busy', 'background', 'interactive')}
+
+    tasks: Final = [asyncio.create_task(_run(scheduler, 'busy', WorkPriority.INTERACTIVE, started, releases['busy']))]
+    await _settle()
+    tasks.append(asyncio.create_task(_run(scheduler, 'background', WorkPriority.BACKGROUND, started, releases['background'])))
+    await _settle()
+    tasks.append(asyncio.create_task(_run(scheduler, 'interactive', WorkPriority.INTERACTIVE, started, releases['interactive'])))
+    await _settle()
+    assert scheduler.stats()['background_waiting'] == scheduler.stats()['interactive_waiting'] == 1
+
+    for name in ('busy', 'interactive', 'background'):
+        releases[name].set()
+        await _settle()
+    await asyncio.gather(*tasks)
+
+    # the background work was queued first, but the interactive work got the slot
+    assert started == ['busy', 'interactive', 'background']
+
+#####################################################################################################
+
+async def test_background_waiting_for_max_delay_goes_before_later_interactive_work() -> None:
+    max_delay_sec: Final = 0.05
+    scheduler: Final = OutboundScheduler(concurrency=1, background_concurrency=1, max_delay_sec=max_delay_sec)
+    started: Final[list[str]] = []
+    releases: Final = {name: asyncio.Event() for name in ('busy', 'background', 'interactive')}
+
+    tasks: Final = [asyncio.create_task(_run(scheduler, 'busy', WorkPriority.INTERACTIVE, started, releases['busy']))]
+    await _settle()
+    tasks.append(asyncio.create_task(_run(scheduler, 'background', WorkPriority.BACKGROUND, started, releases['background'])))
+    await asyncio.sleep(max_delay_sec * 2)
+    tasks.append(asyncio.create_task(_run(scheduler, 'interactive', WorkPriority.INTERACTIVE, started, releases['interactive'])))
+    await _settle()
+
+    for name in ('busy', 'background', 'interactive'):
+        releases[name].set()
+        await _settle()
+    await asyncio.gather(*tasks)
+
+    # under constant interactive load the background work is not starved
+    assert started == ['busy', 'background', 'interactive']
+    assert scheduler.stats()['background_promoted'] == 1
+
+#####################################################################################################
+
+async def test_background_concurrency_keeps_slot_for_interactive_work() -> None:
+    scheduler: Final = OutboundScheduler(concurrency=2, background_concurrency=2, max_delay_sec=5.0)
+    started: Final[list[str]] = []
+    release: Final = asyncio.Event()
+
+    tasks: Final = [
+        asyncio.create_task(_run(scheduler, f'background-{index}', WorkPriority.BACKGROUND, started, release))
+        for index in range(2)
+    ]
+    await _settle()
+    tasks.append(asyncio.create_task(_run(scheduler, 'interactive', WorkPriority.INTERACTIVE, started, release)))
+    await _settle()
+
+    assert started == ['background-0', 'interactive']
+    release.set()
+    await asyncio.gather(*tasks)
+    assert started == ['background-0', 'interactive', 'background-1']
+
+#####################################################################################################
+
+async def test_cancelled_waiting_work_leaves_the_queue() -> None:
+    scheduler: Final = OutboundScheduler(concurrency=1, background_concurrency=1, max_delay_sec=5.0)
+    started: Final[list[str]] = []
+    release: Final = asyncio.Event()
+
+    busy: Final = asyncio.create_task(_run(scheduler, 'busy', WorkPriority.INTERACTIVE, started, release))
+    await _settle()
+    waiting: Final = asyncio.create_task(_run(scheduler, 'waiting', WorkPriority.INTERACTIVE, started, release))
+    await _settle()
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    release.set()
+    await busy
+    assert started == ['busy']
+    assert scheduler.stats()['interactive_waiting'] == scheduler.stats()['interactive_active'] == 0
+
+#####################################################################################################
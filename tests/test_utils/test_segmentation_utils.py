@@ -0,0 +1,55 @@
+#####################################################################################################
+
+from typing import Final
+
+import pytest
+
+from l7x.utils.segmentation_utils import is_translatable, join_sentences, split_sentences
+
+#####################################################################################################
+
+@pytest.mark.parametrize('text', [
+    'Hello. How are you?  Fine!',
+    'Dr. Smith will see you at 3 p.m. today.',
+    '«Stop!» he said. Then he left…',
+    '你好。你好吗？',
+    '',
+])
+def test_join_gives_original_text_back(text: str) -> None:
+    segments: Final = split_sentences(text)
+    assert join_sentences([sentence for sentence, _ in segments], segments) == text
+
+#####################################################################################################
+
+def test_sentences_are_split_with_separators() -> None:
+    assert split_sentences('Hello. How are you?  Fine!') == [('Hello.', ' '), ('How are you?', '  '), ('Fine!', '')]
+
+#####################################################################################################
+
+@pytest.mark.parametrize(('text', 'sentences'), [
+    ('Dr. Smith will see you at 3 p.m. today.', ['Dr. Smith will see you at 3 p.m. today.']),
+    ('Am 3. Mai kommt er. Gut.', ['Am 3. Mai kommt er.', 'Gut.']),
+    ('J. R. R. Tolkien wrote it. Read it.', ['J. R. R. Tolkien wrote it.', 'Read it.']),
+    ('Он живёт на ул. Ленина. Да.', ['Он живёт на ул. Ленина.', 'Да.']),
+])
+def test_abbreviations_letters_and_numbers_do_not_end_sentence(text: str, sentences: list[str]) -> None:
+    assert [sentence for sentence, _ in split_sentences(text)] == sentences
+
+#####################################################################################################
+
+def test_short_text_is_not_split() -> None:
+    text: Final = 'Hello. How are you?'
+
+    assert split_sentences(text, min_chars=len(text) + 1) == [(text, '')]
+    assert len(split_sentences(text, min_chars=len(text))) == 2
+
+#####################################################################################################
+
+def test_join_uses_translated_sentences() -> None:
+    segments: Final = split_sentences('Hello. How are you?')
+
+    assert join_sentences(['Привет.', 'Как дела?'], segments) == 'Привет. Как дела?'
+    assert not is_translatable('...')
+    assert is_translatable('3')
+
+#####################################################################################################
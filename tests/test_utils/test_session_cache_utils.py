@@ -0,0 +1,88 @@
+#####################################################################################################
+
+from logging import getLogger
+from typing import Final
+from uuid import uuid4
+
+from l7x.utils.session_cache_utils import (
+    SESSION_NOTIFY_PREFIX,
+    USER_NOTIFY_PREFIX,
+    SessionCache,
+    SessionInvalidationListener,
+    SessionState,
+)
+
+#####################################################################################################
+
+def _state(user_uuid: str = 'user') -> SessionState:
+    return SessionState(
+        session_uuid=str(uuid4()),
+        user_uuid=user_uuid,
+        is_closed=False,
+        is_user_active=True,
+        is_superuser=False,
+    )
+
+#####################################################################################################
+
+def test_cached_state_is_returned_until_invalidated() -> None:
+    cache: Final = SessionCache(ttl_sec=60.0, max_entries=10)
+    state: Final = _state()
+    cache.put(state, generation=cache.generation)
+
+    assert cache.get(state.session_uuid) is state
+    cache.invalidate(state.session_uuid)
+    assert cache.get(state.session_uuid) is None
+    assert cache.stats() == {'entries': 0, 'hits': 1, 'misses': 1, 'invalidations': 1}
+
+#####################################################################################################
+
+def test_state_loaded_before_invalidation_is_not_put() -> None:
+    cache: Final = SessionCache(ttl_sec=60.0, max_entries=10)
+    state: Final = _state()
+    generation: Final = cache.generation
+
+    # the session was changed while its state was loaded from the database
+    cache.invalidate(state.session_uuid)
+    cache.put(state, generation=generation)
+
+    assert cache.get(state.session_uuid) is None
+
+#####################################################################################################
+
+def test_expired_and_evicted_states_are_not_returned() -> None:
+    expired_cache: Final = SessionCache(ttl_sec=-1.0, max_entries=10)
+    assert not expired_cache.is_enabled
+
+    cache: Final = SessionCache(ttl_sec=60.0, max_entries=2)
+    states: Final = [_state() for _ in range(3)]
+    for state in states:
+        cache.put(state, generation=cache.generation)
+
+    # the oldest state is evicted
+    assert cache.get(states[0].session_uuid) is None
+    assert [cache.get(state.session_uuid) for state in states[1:]] == states[1:]
+
+#####################################################################################################
+
+def test_notifications_invalidate_sessions_and_users() -> None:
+    cache: Final = SessionCache(ttl_sec=60.0, max_entries=10)
+    listener: Final = SessionInvalidationListener('postgresql://localhost/unused', cache, getLogger(__name__))
+    session: Final = _state('first user')
+    user_sessions: Final = [_state('second user') for _ in range(2)]
+    other: Final = _state('third user')
+    for state in (session, *user_sessions, other):
+        cache.put(state, generation=cache.generation)
+
+    listener._on_notify(None, 0, '', f'{SESSION_NOTIFY_PREFIX}{session.session_uuid}')  # noqa: WPS437
+    listener._on_notify(None, 0, '', f'{USER_NOTIFY_PREFIX}second user')  # noqa: WPS437
+
+    assert cache.get(session.session_uuid) is None
+    assert all(cache.get(state.session_uuid) is None for state in user_sessions)
+    assert cache.get(other.session_uuid) is other
+
+    # an unknown notification drops the whole cache
+    listener._on_notify(None, 0, '', 'unknown')  # noqa: WPS437
+    assert cache.get(other.session_uuid) is None
+
+#####################################################################################################
@@ -0,0 +1,84 @@
+#####################################################################################################
+
+from contextlib import asynccontextmanager
+from logging import getLogger
+from typing import Any, Final
+
+import pytest
+
+from l7x.utils.startup_utils import run_startup_task
+
+#####################################################################################################
+
+_LOGGER: Final = getLogger(__name__)
+
+#####################################################################################################
+
+class _RunKeysDatabase:
+    """The startup_runs table in memory, the lock is recorded to check that no task runs under it."""
+
+    #####################################################################################################
+
+    def __init__(self, /) -> None:
+        self.run_keys: Final[dict[str, str]] = {}
+        self.is_locked = False
+
+    #####################################################################################################
+
+    @asynccontextmanager
+    async def transaction(self, /):
+        try:
+            yield
+        finally:
+            self.is_locked = False
+
+    #####################################################################################################
+
+    async def execute(self, query: str, values: dict[str, Any]) -> None:
+        if 'pg_advisory_xact_lock' in query:
+            self.is_locked = True
+        elif query.lstrip().startswith('INSERT'):
+            self.run_keys[values['name']] = values['run_key']
+        elif self.run_keys.get(values['name']) == values['run_key']:
+            self.run_keys[values['name']] = values['previous_run_key'] or ''
+
+    #####################################################################################################
+
+    async def fetch_val(self, query: str, values: dict[str, Any]) -> str | None:
+        return self.run_keys.get(values['name'])
+
+#####################################################################################################
+
+async def test_task_runs_once_per_run_key_outside_the_lock() -> None:
+    database: Final = _RunKeysDatabase()
+    locked_runs: Final[list[bool]] = []
+
+    async def task() -> None:
+        locked_runs.append(database.is_locked)
+
+    assert await run_startup_task(database, _LOGGER, name='task', run_key='first', task=task)  # type: ignore[arg-type]
+    assert not await run_startup_task(database, _LOGGER, name='task', run_key='first', task=task)  # type: ignore[arg-type]
+    assert await run_startup_task(database, _LOGGER, name='task', run_key='second', task=task)  # type: ignore[arg-type]
+
+    assert locked_runs == [False, False]
+    assert database.run_keys == {'task': 'second'}
+
+#####################################################################################################
+
+async def test_failed_task_gives_its_claim_back() -> None:
+    database: Final = _RunKeysDatabase()
+    database.run_keys['task'] = 'first'
+
+    async def failed_task() -> None:
+        raise RuntimeError('failed')
+
+    async def task() -> None:
+        """Nothing to do."""
+
+    with pytest.raises(RuntimeError):
+        await run_startup_task(database, _LOGGER, name='task', run_key='second', task=failed_task)  # type: ignore[arg-type]
+    assert database.run_keys == {'task': 'first'}
+
+    assert await run_startup_task(database, _LOGGER, name='task', run_key='second', task=task)  # type: ignore[arg-type]
+
+#####################################################################################################
@@ -0,0 +1,78 @@
+#####################################################################################################
+
+from types import SimpleNamespace
+from typing import Any, Final
+from uuid import uuid4
+
+import pytest
+
+from l7x.utils.storage_utils import Conversation
+
+#####################################################################################################
+
+def _message(**fields: Any) -> Any:
+    # only the fields read by the conversation storage, no ormar model is needed
+    defaults: Final = {'primary_uuid': uuid4(), 'lang_from': 'en', 'lang_to': 'de', 'fixed_text': None}
+    return SimpleNamespace(**(defaults | fields))
+
+#####################################################################################################
+
+def _conversation(langs: dict[str, str | None], max_participants: int = 3) -> Conversation:
+    conversation: Final = Conversation(conv_id=str(uuid4()), max_participants=max_participants)
+    for session_id, lang in langs.items():
+        conversation.add_session_to_conv(session_id)
+        if lang is not None:
+            conversation.set_user_lang(lang, session_id)
+    return conversation
+
+#####################################################################################################
+
+def test_participants_keep_joining_order_and_capacity() -> None:
+    conversation: Final = _conversation({'operator': 'en', 'client': 'de', 'listener': None})
+
+    assert conversation.first_user_session == 'operator'
+    assert conversation.second_user_session == 'client'
+    assert conversation.get_direction_by_session('listener') == 'Listener'
+    assert conversation.is_full()
+    assert not conversation.is_ready_to_start()
+    with pytest.raises(ValueError):
+        conversation.add_session_to_conv('late')
+
+#####################################################################################################
+
+def test_listeners_langs_are_distinct_and_exclude_speaker() -> None:
+    conversation: Final = _conversation({'operator': 'en', 'client': 'de', 'listener': 'de', 'other': 'fr'}, max_participants=4)
+
+    assert conversation.get_listeners_langs('operator') == ('de', 'fr')
+    assert conversation.get_listeners_langs('client') == ('en', 'de', 'fr')
+    assert conversation.get_interlocutor_lang_by_session('operator') == 'de'
+
+#####################################################################################################
+
+def test_translation_is_read_by_listener_lang() -> None:
+    conversation: Final = _conversation({'operator': 'en', 'client': 'de', 'listener': 'fr'})
+    message: Final = _message(recognized_text='Hello', translated_text='Hallo')
+    conversation.add_translations(message, {'de': 'Hallo', 'fr': 'Bonjour'})
+
+    assert conversation.get_translation(message, 'fr') == 'Bonjour'
+    assert conversation.get_translation(message, 'de') == 'Hallo'
+    assert conversation.get_translation(message, 'en') == 'Hello'
+    assert conversation.get_translation(message, 'es') == 'Hallo'
+    assert conversation.get_translation_langs(message) == ('de', 'fr')
+
+#####################################################################################################
+
+def test_edited_translations_replace_stale_ones() -> None:
+    conversation: Final = _conversation({'operator': 'en', 'client': 'de'})
+    message: Final = _message(recognized_text='Helo', translated_text='Helo')
+    conversation.add_translations(message, {'de': 'Helo'})
+
+    # the edit saves the fixed text and replaces the translations of every listener language
+    message.fixed_text = 'Hello'
+    message.translated_text = 'Hallo'
+    conversation.add_translations(message, {'de': 'Hallo'})
+
+    assert conversation.get_translation(message, 'de') == 'Hallo'
+    assert conversation.get_translation(message, 'en') == 'Hello'
+
+#####################################################################################################
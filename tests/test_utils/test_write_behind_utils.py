@@ -0,0 +1,133 @@
+#####################################################################################################
+
+from asyncio import sleep
+from collections.abc import Sequence
+from logging import getLogger
+from typing import Any, Final
+
+from l7x.db.prepared_statements import PreparedStatement
+from l7x.utils.write_behind_utils import WriteBehindBuffer
+
+#####################################################################################################
+
+_LOGGER: Final = getLogger(__name__)
+
+_LANGS_STATEMENT: Final = PreparedStatement(name='langs', sql='')
+_OTHER_STATEMENT: Final = PreparedStatement(name='other', sql='')
+
+#####################################################################################################
+
+class _RecordingBuffer(WriteBehindBuffer):
+    """The executed batches are recorded, the first failures_left batches fail."""
+
+    #####################################################################################################
+
+    def __init__(self, *, max_rows: int = 100, flush_interval_sec: float = 3600.0, failures_left: int = 0) -> None:
+        super().__init__(_LOGGER, max_rows=max_rows, flush_interval_sec=flush_interval_sec)
+        self.batches: Final[list[tuple[str, list[tuple[Any, ...]]]]] = []
+        self.failures_left = failures_left
+
+    #####################################################################################################
+
+    async def _execute(self, statement: PreparedStatement, rows: Sequence[tuple[Any, ...]]) -> None:
+        if self.failures_left > 0:
+            self.failures_left -= 1
+            raise ConnectionError('database is unavailable')
+        self.batches.append((statement.name, list(rows)))
+
+#####################################################################################################
+
+async def test_rows_are_executed_at_once_when_not_started() -> None:
+    buffer: Final = _RecordingBuffer()
+
+    await buffer.add(_LANGS_STATEMENT, ('conv', 'session', 'en'))
+
+    assert buffer.batches == [('langs', [('conv', 'session', 'en')])]
+    assert buffer.pending_count == 0
+
+#####################################################################################################
+
+async def test_rows_with_same_key_are_coalesced() -> None:
+    buffer: Final = _RecordingBuffer()
+    buffer.start()
+
+    await buffer.add(_LANGS_STATEMENT, ('conv', 'first', 'en'), key=('conv', 'first'))
+    await buffer.add(_LANGS_STATEMENT, ('conv', 'second', 'de'), key=('conv', 'second'))
+    await buffer.add(_LANGS_STATEMENT, ('conv', 'first', 'fr'), key=('conv', 'first'))
+    await buffer.add(_OTHER_STATEMENT, ('row',))
+    await buffer.add(_OTHER_STATEMENT, ('row',))
+    assert buffer.pending_count == 4
+
+    await buffer.stop()
+
+    assert buffer.batches == [
+        ('langs', [('conv', 'second', 'de'), ('conv', 'first', 'fr')]),
+        ('other', [('row',), ('row',)]),
+    ]
+    assert buffer.pending_count == 0
+
+#####################################################################################################
+
+async def test_failed_batch_is_requeued_before_newer_rows() -> None:
+    buffer: Final = _RecordingBuffer(failures_left=1)
+    buffer.start()
+
+    await buffer.add(_LANGS_STATEMENT, ('conv', 'first', 'en'), key=('conv', 'first'))
+    await buffer.add(_LANGS_STATEMENT, ('conv', 'second', 'de'), key=('conv', 'second'))
+    await buffer.flush()
+    assert not buffer.batches
+    assert buffer.pending_count == 2
+
+    await buffer.add(_LANGS_STATEMENT, ('conv', 'first', 'fr'), key=('conv', 'first'))
+    await buffer.flush()
+    await buffer.stop()
+
+    assert buffer.batches == [('langs', [('conv', 'second', 'de'), ('conv', 'first', 'fr')])]
+
+#####################################################################################################
+
+async def test_batch_is_dropped_after_max_attempts() -> None:
+    buffer: Final = _RecordingBuffer(failures_left=3)
+    buffer.start()
+
+    await buffer.add(_LANGS_STATEMENT, ('conv', 'session', 'en'))
+    for _ in range(3):
+        await buffer.flush()
+
+    assert buffer.pending_count == 0
+    await buffer.stop()
+    assert not buffer.batches
+
+#####################################################################################################
+
+async def test_final_flush_does_not_requeue_failed_batch() -> None:
+    buffer: Final = _RecordingBuffer(failures_left=1)
+    buffer.start()
+
+    await buffer.add(_LANGS_STATEMENT, ('conv', 'session', 'en'))
+    await buffer.stop()
+
+    # the final flush does not retry the failed batch
+    assert not buffer.batches
+    assert buffer.pending_count == 0
+
+    await buffer.add(_LANGS_STATEMENT, ('conv', 'session', 'de'))
+    assert buffer.batches == [('langs', [('conv', 'session', 'de')])]
+
+#####################################################################################################
+
+async def test_max_rows_triggers_flush() -> None:
+    buffer: Final = _RecordingBuffer(max_rows=2)
+    buffer.start()
+
+    await buffer.add(_LANGS_STATEMENT, ('conv', 'first', 'en'))
+    await buffer.add(_LANGS_STATEMENT, ('conv', 'second', 'de'))
+    for _ in range(10):
+        if buffer.batches:
+            break
+        await sleep(0)
+
+    assert buffer.batches == [('langs', [('conv', 'first', 'en'), ('conv', 'second', 'de')])]
+    await buffer.stop()
+
+#####################################################################################################